@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for blog_manager.py against synthetic Jekyll blogs
+Generates corpora of any size, times the core and GUI paths, and compares
+result files between versions.
+Usage:
+    python benchmark.py generate /tmp/blog-5k --posts 5000
+    python benchmark.py run /tmp/blog-5k -o before.json
+    python benchmark.py run /tmp/blog-5k -o after.json --module path/to/blog_manager.py
+    python benchmark.py compare before.json after.json
+GUI paths need a display; run under `xvfb-run` on headless machines.
+"""
+
+import time
+import os
+import sys
+import json
+import random
+import shutil
+import platform
+import tempfile
+import statistics
+import subprocess
+import argparse
+import importlib.util
+from datetime import datetime, timedelta
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+MANIFEST = ".benchmark_corpus.json"
+RESULTS_FORMAT = 1
+
+WORDS = ("jekyll markdown python static site build layout theme post draft editor preview "
+         "render cache index search query commit branch push remote deploy image asset "
+         "performance latency memory thread queue worker parse token template filter "
+         "the a of and to in is it for on with as at by from this that be are was").split()
+
+CODE_LINES = [
+    "def render(post):",
+    "    html = markdown(post.body)",
+    "    return layout.render(content=html)",
+    "for path in sorted(posts):",
+    "    print(path.name, path.stat().st_size)",
+    "cache = {key: value for key, value in items}",
+]
+
+
+def load_module(path):
+    """Import a blog_manager.py by path, so any version can be benchmarked"""
+    # Its sibling modules (front_matter.py) must come from the same checkout
+    sys.path.insert(0, str(Path(path).resolve().parent))
+    sys.modules.pop("front_matter", None)
+    spec = importlib.util.spec_from_file_location("blog_manager", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["blog_manager"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def sentence(rng, words):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def paragraph(rng, words):
+    parts = []
+    while words > 0:
+        length = min(words, rng.randint(8, 18))
+        parts.append(sentence(rng, length))
+        words -= length
+    return " ".join(parts)
+
+
+def post_body(rng, words, code_density, images, image_pool):
+    """Markdown body of roughly `words` words with headings, code, lists and images"""
+    blocks = []
+    remaining = words
+    section = 0
+    while remaining > 0:
+        if section and section % 4 == 0:
+            blocks.append(f"## {sentence(rng, 4)[:-1]}")
+        if rng.random() < code_density:
+            lines = [rng.choice(CODE_LINES) for _ in range(rng.randint(3, 12))]
+            blocks.append("```python\n" + "\n".join(lines) + "\n```")
+        elif rng.random() < 0.15:
+            blocks.append("\n".join(f"- {sentence(rng, rng.randint(4, 9))}" for _ in range(rng.randint(2, 5))))
+        length = min(remaining, rng.randint(40, 90))
+        blocks.append(paragraph(rng, length))
+        remaining -= length
+        section += 1
+    
+    for _ in range(images):
+        image = rng.randrange(image_pool)
+        blocks.insert(rng.randint(1, len(blocks)), f"![Figure {image}](/assets/img/bench-{image}.jpg)")
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_corpus(root, posts=1000, body_words=600, tags=200, tags_per_post=3, categories=8,
+                    code_density=0.3, images=1, image_pool=500, seed=1, site_from=HERE):
+    """Write a synthetic Jekyll blog to root and return its manifest"""
+    root = Path(root)
+    posts_dir = root / "_posts"
+    if posts_dir.exists():
+        shutil.rmtree(posts_dir)
+    posts_dir.mkdir(parents=True)
+    (root / "assets" / "img").mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    
+    # Layouts, includes and config come from a real site so previews do real work
+    for name in ("_layouts", "_includes"):
+        if (Path(site_from) / name).is_dir() and not (root / name).exists():
+            shutil.copytree(Path(site_from) / name, root / name)
+    for name in ("_config.yml", "index.md", "about.md", "posts.md", "categories.md", "tags.md"):
+        if (Path(site_from) / name).is_file() and not (root / name).exists():
+            shutil.copy2(Path(site_from) / name, root / name)
+    
+    # Zipf-like weights give a few popular tags and a long tail
+    tag_names = [f"tag{i}" for i in range(tags)]
+    tag_weights = [1 / (i + 1) for i in range(tags)]
+    category_names = [f"category{i}" for i in range(categories)]
+    start = datetime(2010, 1, 1)
+    step = max(1, int(15 * 365 * 24 * 3600 / max(posts, 1)))
+    
+    for i in range(posts):
+        moment = start + timedelta(seconds=i * step)
+        title = f"{sentence(rng, rng.randint(3, 7))[:-1]} {i}"
+        post_tags = set(rng.choices(tag_names, tag_weights, k=tags_per_post)) if tags else set()
+        header = (f'---\nlayout: post\ntitle: "{title}"\n'
+                  f'date: {moment:%Y-%m-%d %H:%M:%S}\n'
+                  f'categories: {rng.choice(category_names)}\n')
+        if post_tags:
+            header += f'tags: [{", ".join(sorted(post_tags))}]\n'
+        if rng.random() < 0.5:
+            header += f'description: "{sentence(rng, 12)}"\n'
+        header += "---\n\n"
+        
+        body_length = max(20, int(rng.gauss(body_words, body_words / 4)))
+        path = posts_dir / f"{moment:%Y-%m-%d}-post-{i}.md"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(header + post_body(rng, body_length, code_density, images, image_pool))
+    
+    manifest = {
+        'posts': posts, 'body_words': body_words, 'tags': tags, 'tags_per_post': tags_per_post,
+        'categories': categories, 'code_density': code_density, 'images': images,
+        'image_pool': image_pool, 'seed': seed,
+    }
+    with open(root / MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def summarize(runs):
+    return {
+        'runs': [round(r, 6) for r in runs],
+        'min': min(runs),
+        'median': statistics.median(runs),
+        'mean': statistics.fmean(runs),
+        'max': max(runs),
+    }
+
+
+def measure(fn, repeat, setup=None):
+    """Time fn() `repeat` times, running setup() untimed before each call"""
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return summarize(runs)
+
+
+class Restore:
+    """Put files back as they were after a benchmark that edits them"""
+    
+    def __init__(self, *paths):
+        self.saved = {Path(p): Path(p).read_bytes() for p in paths}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        for path, data in self.saved.items():
+            path.write_bytes(data)
+
+
+def git(root, *args):
+    return subprocess.run(["git", *args], cwd=root, check=True, capture_output=True, text=True).stdout
+
+
+def core_benchmarks(bm, root, repeat, results):
+    """Time the GUI-independent paths through BlogCore"""
+    index_path = root / ".blog_manager_index.json"
+    
+    def cold_setup():
+        if index_path.exists():
+            index_path.unlink()
+    
+    def cold_scan():
+        core = bm.BlogCore(root)
+        core.list_posts()
+        core.index.save()
+    
+    results['scan_cold'] = measure(cold_scan, repeat, cold_setup)
+    results['scan_warm'] = measure(lambda: bm.BlogCore(root).list_posts(), repeat)
+    
+    core = bm.BlogCore(root)
+    records = core.list_posts()
+    if not records:
+        raise ValueError(f"No posts in {root / '_posts'}; run `benchmark.py generate` first")
+    
+    # Replaces the old load_existing_categories_tags scan
+    if hasattr(core, 'taxonomy'):
+        def taxonomy_setup():
+            core.taxonomies = None
+        results['taxonomy_build'] = measure(lambda: core.taxonomy('tags'), repeat, taxonomy_setup)
+    
+    search_index = bm.SearchIndex()
+    
+    def build_search_index():
+        search_index.__init__()
+        for path, meta in records:
+            search_index.add(str(path), meta, bm.read_post_body(path))
+    
+    results['search_index_build'] = measure(build_search_index, repeat)
+    queries = ["python", "rend", "tag:tag1", "category:category0 after:2015-01-01", "memory thread"]
+    doc_ids = [str(path) for path, meta in records]
+    results['search_query'] = measure(lambda: [search_index.search(q, doc_ids) for q in queries], repeat)
+    
+    largest = max(records, key=lambda r: r[0].stat().st_size)
+    front_matter, body = core.read(largest[0])
+    renderer = bm.IncrementalRenderer()
+    
+    def cold_render():
+        renderer.__init__()
+        renderer.render(body)
+    
+    results['render_cold'] = measure(cold_render, repeat)
+    edits = iter(range(10 ** 9))
+    results['render_incremental'] = measure(lambda: renderer.render(body + f"\n\nEdit {next(edits)}."), repeat)
+    
+    # Paths added in later versions are skipped when benchmarking older ones
+    if hasattr(bm, 'SitePreview'):
+        site_preview = bm.SitePreview(core, renderer)
+        results['site_preview'] = measure(
+            lambda: site_preview.render(front_matter, body, largest[0], True), repeat)
+    
+    if hasattr(core, 'update_archives'):
+        core.update_archives()
+        results['archives_rebuild'] = measure(core.update_archives, repeat)
+    
+    path = records[len(records) // 2][0]
+    front_matter, body = core.read(path)
+    with Restore(path):
+        saves = iter(range(10 ** 9))
+        results['save'] = measure(lambda: core.save(
+            front_matter.title, body + f"\n\nSaved {next(saves)}.", filepath=path, date=front_matter.date,
+            categories=front_matter.categories, tags=front_matter.tags,
+            description=front_matter.description), repeat)
+    
+    if shutil.which("git"):
+        results['publish'] = publish_benchmark(bm, root, records, repeat)
+    else:
+        print("⚠ git not found; skipping publish")
+
+
+def publish_benchmark(bm, root, records, repeat, changed=10):
+    """Commit and push `changed` edited posts to a throwaway local bare repository"""
+    if not (root / ".git").exists():
+        git(root, "init", "-q")
+        git(root, "config", "user.name", "Benchmark")
+        git(root, "config", "user.email", "benchmark@example.com")
+        git(root, "add", "-A")
+        git(root, "commit", "-q", "-m", "Synthetic corpus")
+    
+    with tempfile.TemporaryDirectory() as origin:
+        git(origin, "init", "-q", "--bare")
+        if "origin" in git(root, "remote").split():
+            git(root, "remote", "set-url", "origin", origin)
+        else:
+            git(root, "remote", "add", "origin", origin)
+        git(root, "push", "-q", "origin", "HEAD")
+        
+        core = bm.BlogCore(root)
+        core.open_repo()
+        paths = [path for path, meta in records[:changed]]
+        edits = iter(range(10 ** 9))
+        
+        def edit_posts():
+            run = next(edits)
+            for path in paths:
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(f"\nBenchmark edit {run}.\n")
+                core.track(path)
+        
+        with Restore(*paths):
+            result = measure(lambda: core.publish("Benchmark edit"), repeat, edit_posts)
+        
+        # Leave the corpus as generated for the next run
+        core.track(*paths)
+        core.publish("Restore benchmark posts", push=False)
+        git(root, "remote", "remove", "origin")
+    return result
+
+
+def gui_benchmarks(bm, root, repeat, results, timeout=600):
+    """Drive the Tk editor; needs a display (use xvfb-run when headless)"""
+    tk = bm.tk
+    try:
+        window = tk.Tk()
+    except tk.TclError as e:
+        print(f"⚠ No display for GUI benchmarks ({e}); try xvfb-run")
+        return
+    window.withdraw()
+    
+    def pump(until):
+        deadline = time.monotonic() + timeout
+        while not until():
+            if time.monotonic() > deadline:
+                raise RuntimeError("Timed out waiting for the editor")
+            window.update()
+            time.sleep(0.001)
+    
+    # Dialogs would block the run
+    show_info = bm.messagebox.showinfo
+    bm.messagebox.showinfo = lambda *args, **kwargs: None
+    try:
+        start = time.perf_counter()
+        app = bm.BlogManager(window)
+        pump(lambda: not app.streaming_posts)
+        results['gui_startup'] = summarize([time.perf_counter() - start])
+        pump(lambda: not app.index_queue)
+        
+        def load_list():
+            app.load_content_list()
+            window.update_idletasks()
+        
+        results['load_content_list'] = measure(load_list, repeat)
+        
+        def filter_all():
+            for query in ["python", "rend", "tag:tag1", ""]:
+                app.search_var.set(query)
+                app.filter_content()
+                window.update_idletasks()
+        
+        results['filter_content'] = measure(filter_all, repeat)
+        
+        positions = iter(range(10 ** 9))
+        
+        def select_next():
+            app.unsaved_changes = False
+            app.content_list.select_index(next(positions) % len(app.content_list))
+            window.update_idletasks()
+        
+        results['load_selected_content'] = measure(select_next, repeat)
+        
+        def switch_back():
+            for index in (0, 1):
+                app.content_list.select_index(index)
+                window.update_idletasks()
+        
+        results['switch_tab'] = measure(switch_back, repeat)
+        
+        def wait_preview():
+            app.refresh_preview()
+            pump(lambda: app._preview_poll_id is None)
+        
+        results['refresh_preview'] = measure(wait_preview, repeat)
+        
+        app.content_list.select_index(0)
+        with Restore(app.current_file):
+            saves = iter(range(10 ** 9))
+            
+            def save():
+                app.editor.insert(tk.END, f"\nSaved {next(saves)}.")
+                app.save_post()
+                window.update_idletasks()
+            
+            results['save_post'] = measure(save, repeat)
+        
+        app.unsaved_changes = False
+        app.quit_app()
+    finally:
+        bm.messagebox.showinfo = show_info
+
+
+def run_benchmarks(root, module=HERE / "blog_manager.py", repeat=5, gui="auto", label=None):
+    """Run every benchmark against the corpus at root and return the results document"""
+    root = Path(root).resolve()
+    try:
+        with open(root / MANIFEST, 'r', encoding='utf-8') as f:
+            corpus = json.load(f)
+    except (OSError, ValueError):
+        corpus = {}
+    
+    module = Path(module).resolve()
+    bm = load_module(module)
+    try:
+        commit = git(module.parent, "rev-parse", "--short", "HEAD").strip()
+        if git(module.parent, "status", "--porcelain", "--", module.name).strip():
+            commit += "-dirty"
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    
+    results = {}
+    cwd = os.getcwd()
+    os.chdir(root)  # The editor works relative to the site root
+    try:
+        core_benchmarks(bm, root, repeat, results)
+        if gui != "no" and bm.tk is not None:
+            gui_benchmarks(bm, root, repeat, results)
+        elif gui == "yes":
+            raise RuntimeError("tkinter is not available")
+    finally:
+        os.chdir(cwd)
+    
+    return {
+        'format': RESULTS_FORMAT,
+        'label': label or commit or module.name,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'module': str(module),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': corpus,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def print_results(document):
+    print(f"{document['label']} on {document['corpus'].get('posts', '?')} posts, {document['repeat']} runs")
+    for name, result in document['results'].items():
+        print(f"  {name:<24} median {result['median'] * 1000:10.1f} ms   min {result['min'] * 1000:10.1f} ms")
+
+
+def compare_results(old, new, threshold=0.10):
+    """Print median changes between two result documents; returns the regressed names"""
+    regressions = []
+    print(f"{old['label']} -> {new['label']}")
+    for name in new['results']:
+        if name not in old['results']:
+            print(f"  {name:<24} {'':>12}   {new['results'][name]['median'] * 1000:10.1f} ms   (new)")
+            continue
+        before = old['results'][name]['median']
+        after = new['results'][name]['median']
+        change = (after - before) / before if before else 0.0
+        marker = ""
+        if change > threshold:
+            marker = "⚠ slower"
+            regressions.append(name)
+        elif change < -threshold:
+            marker = "✓ faster"
+        print(f"  {name:<24} {before * 1000:10.1f} ms -> {after * 1000:10.1f} ms  {change:+7.1%}  {marker}")
+    if old['corpus'] != new['corpus']:
+        print("⚠ The results were measured on different corpora")
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark blog_manager.py on synthetic blogs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    generate_parser = commands.add_parser("generate", help="Write a synthetic Jekyll blog")
+    generate_parser.add_argument("root", help="Directory for the blog (its _posts/ is replaced)")
+    generate_parser.add_argument("--posts", type=int, default=1000)
+    generate_parser.add_argument("--body-words", type=int, default=600, help="Mean words per post")
+    generate_parser.add_argument("--tags", type=int, default=200, help="Number of distinct tags")
+    generate_parser.add_argument("--tags-per-post", type=int, default=3)
+    generate_parser.add_argument("--categories", type=int, default=8)
+    generate_parser.add_argument("--code-density", type=float, default=0.3,
+                                 help="Chance of a code block before each paragraph")
+    generate_parser.add_argument("--images", type=int, default=1, help="Image references per post")
+    generate_parser.add_argument("--seed", type=int, default=1)
+    
+    run_parser = commands.add_parser("run", help="Time the editor against a generated blog")
+    run_parser.add_argument("root")
+    run_parser.add_argument("--module", default=str(HERE / "blog_manager.py"),
+                            help="blog_manager.py to benchmark (default: the one next to this script)")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--gui", choices=["auto", "yes", "no"], default="auto",
+                            help="Also drive the Tk editor (auto: when a display is available)")
+    run_parser.add_argument("--label", help="Name for this run (default: the git commit)")
+    run_parser.add_argument("-o", "--output", help="Write the results as JSON")
+    
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Median change that counts as a regression (default: 0.10)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    
+    if args.command == "generate":
+        start = time.perf_counter()
+        generate_corpus(args.root, posts=args.posts, body_words=args.body_words, tags=args.tags,
+                        tags_per_post=args.tags_per_post, categories=args.categories,
+                        code_density=args.code_density, images=args.images, seed=args.seed)
+        print(f"✓ Generated {args.posts} posts in {args.root} ({time.perf_counter() - start:.1f}s)")
+    
+    elif args.command == "run":
+        document = run_benchmarks(args.root, args.module, args.repeat, args.gui, args.label)
+        print_results(document)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2)
+            print(f"✓ Results written to {args.output}")
+    
+    elif args.command == "compare":
+        documents = []
+        for path in (args.old, args.new):
+            with open(path, 'r', encoding='utf-8') as f:
+                documents.append(json.load(f))
+        if compare_results(*documents, threshold=args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,37 +2,4078 @@
 """
 Jekyll Blog Manager - Complete standalone solution for blog post management
 Features: Create, edit, preview, and publish Jekyll posts with full Git integration
-Requirements: Run `pip install markdown pillow gitpython` before first use
+Requirements: Run `pip install markdown pyyaml pillow gitpython` before first use
 Usage: python blog_manager.py
 """
 
+import time
+
+# Measured from interpreter start-up of this module for time-to-first-interaction
+STARTUP_TIME = time.perf_counter()
+
 import os
+import stat
 import sys
 import json
+import hashlib
+import math
+import bisect
+import heapq
+import difflib
+import importlib
+import functools
+import contextlib
+import queue
+import threading
 import shutil
+import socket
+import mimetypes
+import http.server
 import subprocess
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
+import argparse
 from datetime import datetime
 from pathlib import Path
 import webbrowser
 import tempfile
 import re
 import urllib.parse
+from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from html import escape, unescape
+
+import front_matter
+from front_matter import (FrontMatter, FRONT_MATTER_RE, front_matter_loader, parse_front_matter,
+                          split_front_matter, read_front_matter, read_post_body)
+
+# The GUI needs Tk; the command line works on headless installs without it
+try:
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
+    from tkinter import font as tkfont
+except ImportError:
+    tk = None
+
+# Heavy third-party modules are imported on first use, not at startup
+_require_lock = threading.Lock()
+
+
+def require(module_name, package_name=None):
+    """Import a required module on first use, installing its package if missing"""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        pass
+    
+    with _require_lock:
+        try:
+            return importlib.import_module(module_name)
+        except ImportError:
+            package = package_name or module_name
+            print(f"Installing {package}...")
+            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+            importlib.invalidate_caches()
+            return importlib.import_module(module_name)
+
+
+# Front matter parsing lives in front_matter.py; PyYAML is installed on first use like the rest
+front_matter.import_yaml = functools.partial(require, 'yaml', 'pyyaml')
+
+
+class TraceSpan:
+    """Context manager timing one operation for a Tracer"""
+    
+    __slots__ = ('tracer', 'name', 'args', 'start')
+    
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter() - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """Spans with durations for the editor's main operations
+    
+    While disabled, span() hands back a shared no-op context and traced
+    functions call straight through, so instrumentation costs one
+    attribute check. When enabled, each span name keeps a count, total
+    and a rolling window of recent durations for p50/p95, and raw events
+    are kept for export as Chrome trace-event JSON (chrome://tracing or
+    https://ui.perfetto.dev).
+    """
+    
+    WINDOW = 500
+    MAX_EVENTS = 200000
+    
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+            self.events = deque(maxlen=self.MAX_EVENTS)
+            self.origin = time.perf_counter()
+    
+    def span(self, name, **args):
+        if not self.enabled:
+            return NO_SPAN
+        return TraceSpan(self, name, args)
+    
+    def record(self, name, start, duration, args=None):
+        """Add a finished span; `start` is a time.perf_counter() value"""
+        thread = threading.current_thread()
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = {'count': 0, 'total': 0.0, 'max': 0.0,
+                                            'recent': deque(maxlen=self.WINDOW)}
+            stats['count'] += 1
+            stats['total'] += duration
+            stats['max'] = max(stats['max'], duration)
+            stats['recent'].append(duration)
+            self.events.append((name, start, duration, thread.ident, thread.name, args))
+    
+    @staticmethod
+    def percentile(ordered, fraction):
+        return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+    
+    def summary(self):
+        """Return {name: {count, total, max, p50, p95}} in seconds, percentiles over recent spans"""
+        with self.lock:
+            stats = {name: dict(s, recent=sorted(s['recent'])) for name, s in self.stats.items()}
+        return {
+            name: {'count': s['count'], 'total': s['total'], 'max': s['max'],
+                   'p50': self.percentile(s['recent'], 0.5), 'p95': self.percentile(s['recent'], 0.95)}
+            for name, s in stats.items()
+        }
+    
+    def chrome_trace(self):
+        """Recorded spans as a Chrome trace-event document"""
+        with self.lock:
+            events = list(self.events)
+            origin = self.origin
+        pid = os.getpid()
+        
+        trace = []
+        threads = {}
+        for name, start, duration, tid, thread_name, args in events:
+            threads[tid] = thread_name
+            trace.append({'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+                          'ts': round((start - origin) * 1e6, 1), 'dur': round(duration * 1e6, 1),
+                          'args': args or {}})
+        for tid, thread_name in threads.items():
+            trace.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}})
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+    
+    def export(self, path):
+        atomic_write(path, json.dumps(self.chrome_trace()))
+    
+    def format_summary(self):
+        lines = [f"{'span':<24}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'total s':>10}"]
+        for name, s in sorted(self.summary().items(), key=lambda item: -item[1]['total']):
+            lines.append(f"{name:<24}{s['count']:>8}{s['p50'] * 1000:>10.1f}{s['p95'] * 1000:>10.1f}"
+                         f"{s['max'] * 1000:>10.1f}{s['total']:>10.2f}")
+        return "\n".join(lines)
+
+
+NO_SPAN = contextlib.nullcontext()
+
+# Set BLOG_MANAGER_TRACE=1, pass --trace FILE or use Help > Diagnostics to record
+TRACER = Tracer(enabled=bool(os.environ.get('BLOG_MANAGER_TRACE')))
+
+
+def traced(name):
+    """Decorator recording each call of a function as a span"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with TraceSpan(TRACER, name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# New files get the mode open() would give them; mkstemp's is always 0600
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path, text):
+    """Write text to path via a temporary file and rename, so readers never see a partial file
+    
+    The file keeps its permissions; a new one gets the default for the umask.
+    """
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Front matter keys the editor always writes as quoted strings
+QUOTED_KEYS = ('title', 'description')
+
+YAML_NUMBER_RE = re.compile(r'[-+]?(?:\d[\d_]*(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?|0x[0-9a-fA-F]+|0o[0-7]+')
+
+
+def format_yaml_scalar(value, quote=False):
+    """Format a front matter value the way the editor writes it
+    
+    Booleans, null and numbers are written bare so they read back with
+    their type. Strings are quoted when YAML would read them as something
+    else, or always with `quote`.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return f"[{', '.join(format_yaml_scalar(v, quote) for v in value)}]"
+    
+    value = str(value)
+    plain = re.fullmatch(r'[\w./@+-][\w ./@+-]*', value) and value.lower() not in (
+        'true', 'false', 'yes', 'no', 'on', 'off', 'null', '~') and not YAML_NUMBER_RE.fullmatch(value)
+    if quote or not plain or value != value.strip():
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def parse_yaml_value(text):
+    """Read a command line value as YAML would, so `false`, `3` and `null` keep their type
+    
+    Dates stay text, as they do in front matter; anything that isn't a
+    scalar or a list is taken literally.
+    """
+    yaml = require('yaml', 'pyyaml')
+    try:
+        value = yaml.load(text, Loader=front_matter_loader())
+    except yaml.YAMLError:
+        return text
+    return value if value is None or isinstance(value, (bool, int, float, str, list)) else text
+
+
+def apply_taxonomy_operations(values, field_name, operations):
+    """Apply rename/split/delete operations for one list field (tags or categories)
+    
+    Values come back untouched unless an operation matched one of them, so
+    a file whose header the operations don't concern is never rewritten.
+    """
+    result = list(values)
+    matched = False
+    for operation in operations:
+        kind = operation[0]
+        if kind not in ('rename', 'split', 'delete') or operation[1] != field_name:
+            continue
+        old = operation[2]
+        if old not in result:
+            continue
+        matched = True
+        if kind == 'rename':
+            result = [operation[3] if v == old else v for v in result]
+        elif kind == 'split':
+            result = [new for v in result for new in (operation[3] if v == old else [v])]
+        else:
+            result = [v for v in result if v != old]
+    if not matched:
+        return list(values)
+    
+    # Merging can produce duplicates; keep the first occurrence
+    seen = set()
+    return [v for v in result if v and not (v in seen or seen.add(v))]
+
+
+def replace_header_key(lines, keys, new_line):
+    """Replace (or remove, if new_line is None) a top-level key and its continuation lines"""
+    pattern = re.compile(r'^(?:%s)[ \t]*:' % "|".join(re.escape(k) for k in keys))
+    result = []
+    replaced = False
+    i = 0
+    while i < len(lines):
+        if pattern.match(lines[i]):
+            i += 1
+            while i < len(lines) and (lines[i][:1] in (" ", "\t") or lines[i].startswith("- ")):
+                i += 1
+            if new_line is not None and not replaced:
+                result.append(new_line)
+                replaced = True
+            continue
+        result.append(lines[i])
+        i += 1
+    
+    if new_line is not None and not replaced:
+        if result and not result[-1].endswith("\n"):
+            result[-1] += "\n"
+        result.append(new_line)
+    return result
+
+
+def rewrite_front_matter_file(path, operations, dry_run=False):
+    """Apply bulk operations to one file's header
+    
+    Operations are tuples: ('rename', field, old, new), ('split', field,
+    old, [new, ...]), ('delete', field, value) for field 'tags' or
+    'categories', plus ('set', key, value) and ('unset', key). Only the
+    affected header lines are rewritten. Returns (path, diff, error); diff
+    is empty when nothing changed.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return path, "", str(e)
+    
+    match = FRONT_MATTER_RE.match(content) if content.startswith("---") else None
+    if not match:
+        return path, "", ""
+    
+    lines = match.group(1).splitlines(keepends=True)
+    newline = "\r\n" if lines and lines[0].endswith("\r\n") else "\n"
+    front_matter = parse_front_matter(match.group(1))
+    new_lines = lines
+    
+    tags = apply_taxonomy_operations(front_matter.tags, 'tags', operations)
+    if tags != front_matter.tags:
+        tags_line = f"tags: [{', '.join(format_yaml_scalar(t) for t in tags)}]{newline}" if tags else None
+        new_lines = replace_header_key(new_lines, ('tags',), tags_line)
+    
+    categories = front_matter.categories.split()
+    new_categories = apply_taxonomy_operations(categories, 'categories', operations)
+    if new_categories != categories:
+        categories_line = f"categories: {' '.join(new_categories)}{newline}" if new_categories else None
+        new_lines = replace_header_key(new_lines, ('categories', 'category'), categories_line)
+    
+    for operation in operations:
+        if operation[0] == 'set':
+            key, value = operation[1], operation[2]
+            line = f"{key}: {format_yaml_scalar(value, quote=key in QUOTED_KEYS)}{newline}"
+            new_lines = replace_header_key(new_lines, (key,), line)
+        elif operation[0] == 'unset':
+            new_lines = replace_header_key(new_lines, (operation[1],), None)
+    
+    if new_lines == lines:
+        return path, "", ""
+    
+    diff = "".join(difflib.unified_diff(lines, new_lines, fromfile=str(path), tofile=str(path)))
+    if not dry_run:
+        try:
+            atomic_write(path, content[:match.start(1)] + "".join(new_lines) + content[match.end(1):])
+        except OSError as e:
+            return path, diff, str(e)
+    return path, diff, ""
+
+
+# Responsive image settings
+IMAGE_WIDTHS = (480, 960, 1600)
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+JPEG_QUALITY = 85
+IMAGE_SIZES = "(max-width: 800px) 100vw, 800px"
+
+
+def process_image(source, dest_dir, stem, widths=IMAGE_WIDTHS):
+    """Encode an image into resized WebP/AVIF variants plus a fallback, without EXIF
+    
+    Runs in a worker process. Returns {'sources': {format: [(name, width)]},
+    'fallback': (name, width, height)}; animated or unreadable images are
+    copied unchanged and have no sources.
+    """
+    Image = require('PIL.Image', 'pillow')
+    ImageOps = require('PIL.ImageOps', 'pillow')
+    features = require('PIL.features', 'pillow')
+    dest_dir = Path(dest_dir)
+    source = Path(source)
+    
+    try:
+        image = Image.open(source)
+    except (OSError, ValueError):
+        image = None
+    
+    if image is None or getattr(image, 'is_animated', False):
+        name = f"{stem}{source.suffix.lower()}"
+        shutil.copy2(source, dest_dir / name)
+        size = image.size if image else (0, 0)
+        return {'sources': {}, 'fallback': (name,) + tuple(size)}
+    
+    with image:
+        # Apply the camera orientation before dropping EXIF
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    
+    formats = ['webp']
+    try:
+        if features.check('avif'):
+            formats.append('avif')
+    except ValueError:
+        pass
+    
+    targets = sorted({w for w in widths if w < image.width} | {min(image.width, max(widths))})
+    sources = {fmt: [] for fmt in formats}
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            name = f"{stem}-{width}.{fmt}"
+            quality = WEBP_QUALITY if fmt == 'webp' else AVIF_QUALITY
+            resized.save(dest_dir / name, fmt.upper(), quality=quality)
+            sources[fmt].append((name, width))
+    
+    # Largest variant in a universally supported format for <img src>
+    width = targets[-1]
+    height = max(1, round(image.height * width / image.width))
+    fallback = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+    if has_alpha:
+        name = f"{stem}-{width}.png"
+        fallback.save(dest_dir / name, 'PNG', optimize=True)
+    else:
+        name = f"{stem}-{width}.jpg"
+        fallback.save(dest_dir / name, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return {'sources': sources, 'fallback': (name, width, height)}
+
+
+def image_markup(result, alt, url_prefix="/assets/img/"):
+    """Markdown for a processed image: <picture> with srcset, or plain ![alt]() for copies"""
+    name, width, height = result['fallback']
+    if not result['sources']:
+        return f"![{alt}]({url_prefix}{name})\n"
+    
+    alt = escape(alt, quote=True)
+    lines = ["<picture>"]
+    # AVIF first so browsers that support it prefer it over WebP
+    for fmt in sorted(result['sources'], key=lambda f: f != 'avif'):
+        srcset = ", ".join(f"{url_prefix}{n} {w}w" for n, w in result['sources'][fmt])
+        lines.append(f'  <source type="image/{fmt}" srcset="{srcset}" sizes="{IMAGE_SIZES}">')
+    lines.append(f'  <img src="{url_prefix}{name}" alt="{alt}" width="{width}" height="{height}" loading="lazy">')
+    lines.append("</picture>")
+    return "\n" + "\n".join(lines) + "\n\n"
+
+
+def image_files(result):
+    """Every file name a process_image result wrote"""
+    names = {result['fallback'][0]}
+    for variants in result['sources'].values():
+        names.update(name for name, _ in variants)
+    return names
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetStore:
+    """Content-addressed index of assets/img keyed on the SHA-256 of the source image
+    
+    Identical bytes map to the files already stored for them, and new names
+    are reserved from an in-memory set instead of probing the filesystem.
+    """
+    
+    VERSION = 1
+    TEXT_SUFFIXES = {'.md', '.markdown', '.html', '.htm', '.yml', '.yaml', '.css', '.scss', '.js', '.json', '.xml', '.txt'}
+    SKIP_DIRS = {'_site', 'node_modules', 'vendor'}
+    REFERENCE_RE = re.compile(r'assets/img/([^\s"\'()<>?#,\]\[]+)')
+    
+    def __init__(self, cache_path, assets_dir):
+        self.cache_path = Path(cache_path)
+        self.assets_dir = Path(assets_dir)
+        self.entries = {}
+        self.names = None
+        self.counters = {}
+        self.lock = threading.RLock()
+        self.load()
+    
+    def load(self):
+        """Load the digest index, discarding incompatible files"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def save(self):
+        with self.lock:
+            try:
+                atomic_write(self.cache_path, json.dumps({'version': self.VERSION, 'entries': self.entries}))
+            except OSError as e:
+                print(f"⚠ Could not write asset index: {e}")
+    
+    def reserved(self):
+        """Stems in use, built from one directory listing on first use"""
+        if self.names is None:
+            self.names = set()
+            try:
+                with os.scandir(self.assets_dir) as it:
+                    for entry in it:
+                        self.reserve(Path(entry.name).stem)
+            except FileNotFoundError:
+                pass
+            for entry in self.entries.values():
+                self.names.add(entry['stem'])
+        return self.names
+    
+    def reserve(self, stem):
+        self.names.add(stem)
+        # photo-960.webp also blocks the stem "photo" its variants came from
+        match = re.match(r'(.+)-\d+$', stem)
+        if match:
+            self.names.add(match.group(1))
+    
+    def lookup(self, digest):
+        """Stored result for these bytes, if its fallback file still exists"""
+        with self.lock:
+            entry = self.entries.get(digest)
+        if entry and (self.assets_dir / entry['result']['fallback'][0]).exists():
+            return entry['result']
+        return None
+    
+    def claim_stem(self, source):
+        """Reserve a web-safe base name for a new image's variants"""
+        base = BlogCore.create_slug(Path(source).stem) or "image"
+        with self.lock:
+            names = self.reserved()
+            stem = base
+            counter = self.counters.get(base, 1)
+            while stem in names:
+                stem = f"{base}_{counter}"
+                counter += 1
+            self.counters[base] = counter
+            self.reserve(stem)
+        return stem
+    
+    def record(self, digest, stem, result):
+        with self.lock:
+            self.entries[digest] = {'stem': stem, 'result': result}
+            self.reserved()
+            for name in image_files(result):
+                self.reserve(Path(name).stem)
+        self.save()
+    
+    def references(self, root_dir):
+        """Names under assets/img referenced from any text file in the site"""
+        found = set()
+        for dirpath, dirnames, filenames in os.walk(root_dir):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in self.SKIP_DIRS]
+            for filename in filenames:
+                if filename.startswith('.') or os.path.splitext(filename)[1].lower() not in self.TEXT_SUFFIXES:
+                    continue
+                try:
+                    with open(os.path.join(dirpath, filename), 'r', encoding='utf-8', errors='ignore') as f:
+                        text = f.read()
+                except OSError:
+                    continue
+                found.update(urllib.parse.unquote(m) for m in self.REFERENCE_RE.findall(text))
+        return found
+    
+    def orphans(self, root_dir):
+        """Files in assets/img that nothing references
+        
+        Variants written for one image are kept together while any of them
+        is still referenced.
+        """
+        try:
+            on_disk = {entry.name for entry in os.scandir(self.assets_dir) if entry.is_file()}
+        except FileNotFoundError:
+            return []
+        referenced = self.references(root_dir)
+        
+        unused = on_disk - referenced
+        with self.lock:
+            for entry in self.entries.values():
+                group = image_files(entry['result'])
+                if group & referenced:
+                    unused -= group
+        return sorted(unused)
+    
+    def remove(self, names):
+        """Delete asset files and drop index entries that no longer have any"""
+        for name in names:
+            try:
+                (self.assets_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+        
+        with self.lock:
+            removed = set(names)
+            for digest in [d for d, e in self.entries.items() if image_files(e['result']) <= removed]:
+                del self.entries[digest]
+            self.names = None
+        self.save()
+
+
+def jekyll_slugify(text):
+    """Jekyll's default slugify: lowercase, runs of non-alphanumerics become one hyphen"""
+    return re.sub(r'[\W_]+', '-', str(text).lower()).strip('-')
+
+
+def jekyll_titleize(slug):
+    """Title Jekyll derives for a post without one, so my-first-post becomes My First Post"""
+    return " ".join(word.capitalize() for word in slug.split("-"))
+
+
+def markdown_to_text(text):
+    """Rough plain text of Markdown for excerpts, without rendering it"""
+    text = re.sub(r'^(`{3,}|~{3,}).*?^\1\s*$', ' ', text, flags=re.DOTALL | re.MULTILINE)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = re.sub(r'!\[[^\]]*\]\([^)]*\)', ' ', text)
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'\{[%{].*?[%}]\}', ' ', text)
+    text = re.sub(r'^\s{0,3}(#{1,6}|>|[*+-]|\d+[.)])\s+', '', text, flags=re.MULTILINE)
+    return unescape(re.sub(r'[*_`~]+', '', text))
+
+
+class MetadataIndex:
+    """Persistent JSON sidecar caching post metadata keyed on path, mtime and size
+    
+    All methods are safe to call from the background loader thread.
+    """
+    
+    VERSION = 3
+    
+    def __init__(self, cache_path):
+        self.cache_path = Path(cache_path)
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.RLock()
+        self.load()
+    
+    def load(self):
+        """Load cached entries from disk, discarding incompatible caches"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def save(self):
+        """Write the cache atomically if anything changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            
+            try:
+                atomic_write(self.cache_path, json.dumps({'version': self.VERSION, 'entries': self.entries}))
+                self.dirty = False
+            except OSError as e:
+                print(f"⚠ Could not write metadata index: {e}")
+    
+    def lookup(self, path, stat_result=None):
+        """Return metadata for path, reparsing only when mtime or size changed"""
+        key = str(path)
+        st = stat_result or os.stat(path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry['mtime'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                return FrontMatter.from_index(entry['meta'])
+        
+        try:
+            meta = read_front_matter(path)
+        except (OSError, UnicodeDecodeError):
+            meta = FrontMatter()
+        
+        with self.lock:
+            self.entries[key] = {'mtime': st.st_mtime_ns, 'size': st.st_size, 'meta': meta.to_index()}
+            self.dirty = True
+        return meta
+    
+    def excerpt(self, path, words=20, current=False):
+        """Plain-text opening of a post's body, cached alongside its metadata
+        
+        Pass current=True right after a lookup of path to skip re-checking it.
+        """
+        key = str(path)
+        if not current:
+            self.lookup(path)
+        with self.lock:
+            entry = self.entries.get(key, {})
+            if 'excerpt' in entry:
+                return entry['excerpt']
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            # Skip the header without parsing it again
+            match = FRONT_MATTER_RE.match(content) if content.startswith("---") else None
+            text = markdown_to_text(content[match.end():] if match else content)
+        except (OSError, UnicodeDecodeError):
+            text = ""
+        tokens = text.split()
+        excerpt = " ".join(tokens[:words]) + ("..." if len(tokens) > words else "")
+        
+        with self.lock:
+            if key in self.entries:
+                self.entries[key]['excerpt'] = excerpt
+                self.dirty = True
+        return excerpt
+    
+    def forget(self, path):
+        """Drop the cached entry for path"""
+        with self.lock:
+            if self.entries.pop(str(path), None) is not None:
+                self.dirty = True
+    
+    def prune(self, directory, seen):
+        """Drop entries for files directly in directory that are not in seen"""
+        prefix = str(directory) + os.sep
+        with self.lock:
+            stale = [k for k in self.entries if k.startswith(prefix) and k not in seen
+                     and os.sep not in k[len(prefix):]]
+            for key in stale:
+                del self.entries[key]
+                self.dirty = True
+    
+    @traced('index.scan')
+    def scan(self, directory, suffix=".md"):
+        """Return (path, metadata) for every matching file in directory, one stat per file"""
+        directory = Path(directory)
+        results = []
+        seen = set()
+        
+        if directory.exists():
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(suffix) or not entry.is_file():
+                        continue
+                    path = directory / entry.name
+                    seen.add(str(path))
+                    results.append((path, self.lookup(path, entry.stat())))
+        
+        self.prune(directory, seen)
+        self.save()
+        return results
+
+
+class SearchIndex:
+    """Incremental inverted index over titles, front matter and body text
+    
+    Free terms are matched by prefix and ranked by field-weighted tf-idf;
+    every term must match. Supported operators are `tag:name`,
+    `category:name`, `after:YYYY-MM-DD`, `before:YYYY-MM-DD` and
+    `date:FROM..TO` (any date prefix, e.g. `date:2024-01..2024-06`).
+    """
+    
+    TITLE_WEIGHT = 3.0
+    META_WEIGHT = 2.0
+    BODY_WEIGHT = 1.0
+    MAX_PREFIX_EXPANSION = 200
+    MIN_PREFIX_LENGTH = 2
+    TOKEN_RE = re.compile(r'\w+')
+    DATE_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})')
+    
+    def __init__(self):
+        self.postings = {}
+        self.vocabulary = []
+        self.doc_terms = {}
+        self.docs = {}
+    
+    @classmethod
+    def tokenize(cls, text):
+        return cls.TOKEN_RE.findall(text.lower())
+    
+    def __contains__(self, doc_id):
+        return doc_id in self.docs
+    
+    def add(self, doc_id, meta, body=""):
+        """Index (or re-index) a document from its metadata and body"""
+        self.remove(doc_id)
+        
+        front_matter = " ".join([
+            Path(doc_id).stem,
+            meta.categories,
+            " ".join(meta.tags),
+            meta.description
+        ])
+        weights = {}
+        for text, weight in ((meta.title, self.TITLE_WEIGHT),
+                             (front_matter, self.META_WEIGHT),
+                             (body, self.BODY_WEIGHT)):
+            for token in self.tokenize(text):
+                weights[token] = weights.get(token, 0.0) + weight
+        
+        for token, weight in weights.items():
+            doc_weights = self.postings.get(token)
+            if doc_weights is None:
+                doc_weights = self.postings[token] = {}
+                bisect.insort(self.vocabulary, token)
+            doc_weights[doc_id] = weight
+        
+        date_match = self.DATE_RE.match(meta.date) or self.DATE_RE.match(Path(doc_id).name)
+        self.doc_terms[doc_id] = list(weights)
+        self.docs[doc_id] = {
+            'date': date_match.group(1) if date_match else "",
+            'tags': {t.strip().lower() for t in meta.tags},
+            'categories': {c.lower() for c in re.split(r'[\s,]+', meta.categories) if c}
+        }
+    
+    def remove(self, doc_id):
+        """Drop a document from the index"""
+        for token in self.doc_terms.pop(doc_id, ()):
+            doc_weights = self.postings[token]
+            del doc_weights[doc_id]
+            if not doc_weights:
+                del self.postings[token]
+                index = bisect.bisect_left(self.vocabulary, token)
+                del self.vocabulary[index]
+        self.docs.pop(doc_id, None)
+    
+    def parse_query(self, query):
+        """Split a query into free-text terms and operator filters"""
+        terms, filters = [], []
+        for part in query.split():
+            key, sep, value = part.partition(":")
+            key = key.lower()
+            value = value.strip().lower()
+            if sep and value and key in ('tag', 'tags'):
+                filters.append(lambda doc, v=value: v in doc['tags'])
+            elif sep and value and key in ('category', 'categories', 'cat'):
+                filters.append(lambda doc, v=value: v in doc['categories'])
+            elif sep and value and key == 'after':
+                filters.append(lambda doc, v=value: doc['date'] and doc['date'] >= v)
+            elif sep and value and key == 'before':
+                filters.append(lambda doc, v=value: doc['date'] and doc['date'] < v)
+            elif sep and value and key == 'date':
+                start, _, end = value.partition("..")
+                end = end or start
+                filters.append(lambda doc, a=start, b=end: (
+                    doc['date'] and doc['date'][:len(a)] >= a and doc['date'][:len(b)] <= b))
+            else:
+                terms.extend(self.tokenize(part))
+        return terms, filters
+    
+    def expand(self, prefix):
+        """Return indexed tokens starting with prefix"""
+        if len(prefix) < self.MIN_PREFIX_LENGTH:
+            return [prefix] if prefix in self.postings else []
+        index = bisect.bisect_left(self.vocabulary, prefix)
+        tokens = []
+        while (index < len(self.vocabulary) and len(tokens) < self.MAX_PREFIX_EXPANSION
+               and self.vocabulary[index].startswith(prefix)):
+            tokens.append(self.vocabulary[index])
+            index += 1
+        return tokens
+    
+    def search(self, query, candidates):
+        """Return matching doc ids from candidates
+        
+        Results are ranked by relevance when the query has free-text terms,
+        otherwise they keep the order of candidates.
+        """
+        terms, filters = self.parse_query(query)
+        total = max(len(self.docs), 1)
+        
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for token in self.expand(term):
+                doc_weights = self.postings[token]
+                idf = math.log(1 + total / len(doc_weights))
+                factor = 1.0 if token == term else 0.5
+                for doc_id, weight in doc_weights.items():
+                    score = weight * idf * factor
+                    if score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: scores[d] + term_scores[d] for d in scores if d in term_scores}
+            if not scores:
+                return []
+        
+        results = []
+        for order, doc_id in enumerate(candidates):
+            doc = self.docs.get(doc_id)
+            if doc is None or (scores is not None and doc_id not in scores):
+                continue
+            if all(f(doc) for f in filters):
+                results.append((-(scores or {}).get(doc_id, 0.0), order, doc_id))
+        
+        if scores is not None:
+            results.sort()
+        return [doc_id for _, _, doc_id in results]
+
+
+class ContentWatcher:
+    """Poll-based watcher reporting per-file adds, edits, deletes and renames
+    
+    Directories are only relisted when their mtime changes (adds, deletes,
+    renames and atomic replaces such as `git pull`); a full stat sweep for
+    in-place edits runs every `full_scan_every` polls.
+    
+    `snapshot` maps a directory to (mtime_ns, {path: stat_result}) from a
+    listing the caller already made, so it isn't scanned a second time.
+    The mtime must be read before that listing, so changes made during it
+    still show up on the first poll.
+    """
+    
+    def __init__(self, directories=(), files=(), suffix=".md", full_scan_every=5, snapshot=None):
+        self.directories = [Path(d) for d in directories]
+        self.files = [Path(f) for f in files]
+        self.suffix = suffix
+        self.full_scan_every = full_scan_every
+        self._ticks = 0
+        self._dir_mtimes = {}
+        self._state = {}
+        snapshot = snapshot or {}
+        for directory in self.directories:
+            if str(directory) in snapshot:
+                dir_mtime, stats = snapshot[str(directory)]
+                self._dir_mtimes[str(directory)] = dir_mtime
+                self._state[str(directory)] = {str(p): self._signature(st) for p, st in stats.items()}
+            else:
+                self._state[str(directory)] = self._scan_directory(directory)
+        self._state[''] = self._scan_files()
+    
+    @staticmethod
+    def _signature(st):
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def _scan_directory(self, directory):
+        """Stat every matching file in directory"""
+        files = {}
+        try:
+            self._dir_mtimes[str(directory)] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith(self.suffix) and entry.is_file():
+                        files[str(directory / entry.name)] = self._signature(entry.stat())
+        except OSError:
+            self._dir_mtimes.pop(str(directory), None)
+        return files
+    
+    def _scan_files(self):
+        """Stat the individually watched files"""
+        files = {}
+        for path in self.files:
+            try:
+                files[str(path)] = self._signature(os.stat(path))
+            except OSError:
+                continue
+        return files
+    
+    def _bucket_for(self, path):
+        parent = str(Path(path).parent)
+        return parent if parent in self._state and parent != '.' else ''
+    
+    def acknowledge(self, path):
+        """Record the current state of path so the app's own writes don't re-fire"""
+        bucket = self._state[self._bucket_for(path)]
+        try:
+            bucket[str(path)] = self._signature(os.stat(path))
+        except OSError:
+            bucket.pop(str(path), None)
+    
+    def poll(self):
+        """Return a list of change events since the previous poll
+        
+        Events are ('added', path), ('modified', path), ('deleted', path)
+        and ('renamed', old_path, new_path).
+        """
+        self._ticks += 1
+        full_scan = self._ticks % self.full_scan_every == 0
+        
+        old_files, new_files = {}, {}
+        for directory in self.directories:
+            key = str(directory)
+            try:
+                dir_mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                dir_mtime = None
+            if full_scan or dir_mtime != self._dir_mtimes.get(key):
+                old_files.update(self._state[key])
+                self._state[key] = self._scan_directory(directory)
+                new_files.update(self._state[key])
+        
+        old_files.update(self._state[''])
+        self._state[''] = self._scan_files()
+        new_files.update(self._state[''])
+        
+        return self._diff(old_files, new_files)
+    
+    @staticmethod
+    def _diff(old_files, new_files):
+        """Compare two snapshots, pairing deletes and adds of the same inode as renames"""
+        events = []
+        deleted = {p: sig for p, sig in old_files.items() if p not in new_files}
+        added = {p: sig for p, sig in new_files.items() if p not in old_files}
+        
+        by_identity = {(sig[0], sig[2]): p for p, sig in deleted.items()}
+        for path, sig in added.items():
+            old_path = by_identity.pop((sig[0], sig[2]), None)
+            if old_path is not None:
+                del deleted[old_path]
+                events.append(('renamed', Path(old_path), Path(path)))
+            else:
+                events.append(('added', Path(path)))
+        
+        for path in deleted:
+            events.append(('deleted', Path(path)))
+        
+        for path, sig in new_files.items():
+            if path in old_files and old_files[path] != sig:
+                events.append(('modified', Path(path)))
+        
+        return events
+
+
+# Publish queue defaults; policy is 'manual', 'interval' or 'idle'
+PUBLISH_DEFAULTS = {
+    'publish_policy': 'manual',
+    'publish_interval_minutes': 10,
+    'publish_idle_seconds': 120,
+}
+
+
+def taxonomy_key(name):
+    """Normalized form shared by spelling variants of a tag or category"""
+    return " ".join(str(name).split()).casefold()
+
+
+def unique_taxonomy_names(names):
+    """Drop empty names and later spellings of one already seen, keeping order"""
+    seen = set()
+    return [name for name in names
+            if taxonomy_key(name) and not (taxonomy_key(name) in seen or seen.add(taxonomy_key(name)))]
+
+
+class TaxonomyIndex:
+    """Tag or category names ranked by usage and searchable by prefix
+    
+    Names are grouped by taxonomy_key, so "python" and "Python " count as
+    one name shown under its most used spelling. Keys live in a sorted
+    list: a prefix lookup is two bisects plus ranking the matching range,
+    and updating a post only touches the names it gained or lost.
+    """
+    
+    def __init__(self):
+        self.keys = []
+        self.counts = {}
+        self.spellings = {}
+        self.by_path = {}
+        self.lock = threading.Lock()
+    
+    def adjust(self, spelling, delta):
+        key = taxonomy_key(spelling)
+        spellings = self.spellings.setdefault(key, {})
+        spellings[spelling] = spellings.get(spelling, 0) + delta
+        if spellings[spelling] <= 0:
+            del spellings[spelling]
+        
+        count = self.counts.get(key, 0) + delta
+        if count > 0:
+            if key not in self.counts:
+                bisect.insort(self.keys, key)
+            self.counts[key] = count
+        elif key in self.counts:
+            del self.counts[key]
+            del self.spellings[key]
+            del self.keys[bisect.bisect_left(self.keys, key)]
+    
+    def update(self, path, names):
+        """Replace the names recorded for a post; no names forgets it"""
+        unique = {}
+        for name in names:
+            spelling = " ".join(str(name).split())
+            if spelling:
+                unique.setdefault(spelling.casefold(), spelling)
+        new = tuple(unique.values())
+        
+        with self.lock:
+            old = self.by_path.pop(str(path), ())
+            if new:
+                self.by_path[str(path)] = new
+            for spelling in old:
+                self.adjust(spelling, -1)
+            for spelling in new:
+                self.adjust(spelling, 1)
+    
+    def display(self, key):
+        spellings = self.spellings[key]
+        return max(spellings, key=spellings.get)
+    
+    def canonical(self, name):
+        """The established spelling of a name, or the name tidied up if it is new"""
+        spelling = " ".join(str(name).split())
+        with self.lock:
+            key = spelling.casefold()
+            return self.display(key) if key in self.counts else spelling
+    
+    def suggest(self, prefix, limit=10, exclude=()):
+        """Return up to `limit` (name, count) pairs starting with prefix, most used first"""
+        prefix = taxonomy_key(prefix)
+        exclude = {taxonomy_key(name) for name in exclude}
+        with self.lock:
+            lo = bisect.bisect_left(self.keys, prefix)
+            hi = bisect.bisect_left(self.keys, prefix + chr(0x10FFFF), lo)
+            # Stable, so equally used names stay in alphabetical order
+            keys = heapq.nlargest(limit, (k for k in self.keys[lo:hi] if k not in exclude),
+                                  key=self.counts.__getitem__)
+            return [(self.display(k), self.counts[k]) for k in keys]
+
+
+class ArchiveData:
+    """Tag, category and year archives precomputed into _data/ for the archive pages
+    
+    Records come from the metadata index, so nothing is re-read on a full
+    build. Only posts Jekyll would list in site.posts are included. Tags and
+    categories are grouped by taxonomy_key and shown under their most used
+    spelling. Each group is serialized separately and only groups touched
+    by an update are re-encoded; a file is rewritten only when its text
+    changes.
+    
+    The archive pages trust the data while archive_stats.json's post count
+    matches site.posts.size, a check that costs Jekyll no pass over the
+    posts; the app rebuilds the data at startup to catch edits made
+    elsewhere.
+    """
+    
+    FILES = {
+        'tags': 'tag_archive.json',
+        'categories': 'category_archive.json',
+        'years': 'year_archive.json',
+    }
+    STATS_FILE = 'archive_stats.json'
+    
+    def __init__(self, core):
+        self.core = core
+        self.data_dir = core.root_dir / "_data"
+        self.records = None
+        self.fragments = {kind: {} for kind in self.FILES}
+        self.dirty = {kind: set() for kind in self.FILES}
+        self.lock = threading.RLock()
+    
+    def record(self, path, meta):
+        match = re.match(r'(\d{4})-(\d{2})-(\d{2})-', path.name)
+        date = meta.date or ("-".join(match.groups()) if match else "")
+        return {
+            'title': meta.title or path.stem,
+            'url': self.core.post_url(path, meta),
+            'date': date,
+            'description': meta.description,
+            # Callers pass metadata they just looked up, so the index entry is current
+            'excerpt': "" if meta.description else self.core.index.excerpt(path, current=True),
+            'categories': meta.categories.split(),
+            'tags': meta.tags,
+            # Sort and group keys; not written out
+            '_name': path.name,
+            '_year': match.group(1) if match else date[:4],
+        }
+    
+    def output_names(self):
+        return list(self.FILES.values()) + [self.STATS_FILE]
+    
+    def groups_of(self, record):
+        """{kind: {group key: spelling}} for the groups a record belongs to"""
+        groups = {'years': {record['_year']: record['_year']}}
+        for kind in ('tags', 'categories'):
+            groups[kind] = {}
+            for name in record[kind]:
+                if taxonomy_key(name):
+                    groups[kind].setdefault(taxonomy_key(name), name)
+        return groups
+    
+    def load(self, posts=None):
+        """Build records for every post from the metadata index, or from (path, meta) pairs already looked up"""
+        with self.lock:
+            posts = self.core.list_posts() if posts is None else posts
+            self.records = {str(path): self.record(path, meta) for path, meta in posts
+                            if self.core.is_published(path, meta)}
+            self.fragments = {kind: {} for kind in self.FILES}
+            self.dirty = {kind: set() for kind in self.FILES}
+            self.core.index.save()
+    
+    def update(self, paths):
+        """Refresh records for changed or deleted posts, marking affected groups"""
+        with self.lock:
+            if self.records is None:
+                self.load()
+                return
+            for path in paths:
+                path = Path(path)
+                old = self.records.pop(str(path), None)
+                if old:
+                    for kind, keys in self.groups_of(old).items():
+                        self.dirty[kind].update(keys)
+                meta = self.core.index.lookup(path) if path.exists() and self.core.is_post(path) else None
+                if meta and self.core.is_published(path, meta):
+                    record = self.record(path, meta)
+                    self.records[str(path)] = record
+                    for kind, keys in self.groups_of(record).items():
+                        self.dirty[kind].update(keys)
+            self.core.index.save()
+    
+    def public(self, record):
+        return {k: v for k, v in record.items() if not k.startswith('_')}
+
+    
+    def write(self):
+        """Write archive files whose content changed and return their paths"""
+        with self.lock:
+            if self.records is None:
+                self.load()
+            
+            groups = {kind: {} for kind in self.FILES}
+            spellings = {kind: {} for kind in self.FILES}
+            for record in sorted(self.records.values(), key=lambda r: r['_name'], reverse=True):
+                for kind, keys in self.groups_of(record).items():
+                    for key, spelling in keys.items():
+                        groups[kind].setdefault(key, []).append(record)
+                        counts = spellings[kind].setdefault(key, {})
+                        counts[spelling] = counts.get(spelling, 0) + 1
+            
+            written = []
+            for kind, file_name in self.FILES.items():
+                fragments = self.fragments[kind]
+                order = sorted(groups[kind], reverse=kind == 'years')
+                for key in list(fragments):
+                    if key not in groups[kind] or key in self.dirty[kind]:
+                        del fragments[key]
+                for key in order:
+                    if key not in fragments:
+                        posts = groups[kind][key]
+                        # Most used spelling; ties go to the newest post's
+                        name = max(spellings[kind][key], key=spellings[kind][key].get)
+                        entry = {'name': name, 'slug': jekyll_slugify(name), 'count': len(posts),
+                                 'posts': [self.public(r) for r in posts]}
+                        fragments[key] = json.dumps(entry, ensure_ascii=False)
+                self.dirty[kind].clear()
+                
+                text = "[\n" + ",\n".join(fragments[key] for key in order) + "\n]\n" if order else "[]\n"
+                if self.write_if_changed(self.data_dir / file_name, text):
+                    written.append(self.data_dir / file_name)
+            
+            stats = {'posts': len(self.records), 'tags': len(groups['tags']),
+                     'categories': len(groups['categories']), 'years': len(groups['years'])}
+            stats_path = self.data_dir / self.STATS_FILE
+            if self.write_if_changed(stats_path, json.dumps(stats, indent=2) + "\n"):
+                written.append(stats_path)
+            return written
+    
+    @staticmethod
+    def write_if_changed(path, text):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == text:
+                    return False
+        except OSError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, text)
+        return True
+
+
+class BlogCore:
+    """GUI-independent content model: post/page CRUD, front matter and publishing
+    
+    Everything the editor does to files and the repository goes through
+    this class, so it can be scripted from the command line or CI.
+    """
+    
+    PAGE_FILES = ['index.md', 'about.md', 'posts.md', 'categories.md', 'tags.md']
+    PROTECTED_PAGES = ['index.md', 'about.md']
+    PARALLEL_REWRITE_THRESHOLD = 200
+    PERMALINK_STYLES = {
+        'date': '/:categories/:year/:month/:day/:title:output_ext',
+        'pretty': '/:categories/:year/:month/:day/:title/',
+        'ordinal': '/:categories/:year/:y_day/:title:output_ext',
+        'none': '/:categories/:title:output_ext',
+    }
+    
+    def __init__(self, root_dir="."):
+        self.root_dir = Path(root_dir)
+        self.posts_dir = self.root_dir / "_posts"
+        self.assets_dir = self.root_dir / "assets" / "img"
+        self.index = MetadataIndex(self.root_dir / ".blog_manager_index.json")
+        self.assets = AssetStore(self.root_dir / ".blog_manager_assets.json", self.assets_dir)
+        self.repo = None
+        self.changes = {}
+        self.change_seq = 0
+        self.last_change = 0.0
+        self.changes_lock = threading.Lock()
+        self.settings_path = self.root_dir / ".blog_manager_settings.json"
+        self.config_cache = (None, {})
+        self.archives = ArchiveData(self)
+        self.taxonomies = None
+    
+    @staticmethod
+    def create_slug(title):
+        """Create URL slug from title"""
+        slug = title.lower()
+        slug = re.sub(r'[^\w\s-]', '', slug)
+        slug = re.sub(r'[\s_-]+', '-', slug)
+        return slug.strip('-')
+    
+    def site_config(self):
+        """Parsed _config.yml, reloaded when it changes"""
+        path = self.root_dir / "_config.yml"
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return {}
+        if self.config_cache[0] != mtime:
+            yaml = require('yaml', 'pyyaml')
+            with open(path, 'r', encoding='utf-8') as f:
+                self.config_cache = (mtime, yaml.load(f, Loader=front_matter_loader()) or {})
+        return self.config_cache[1]
+    
+    def post_date(self, path, meta):
+        """A post's date: front matter first, then its filename"""
+        match = re.match(r'(\d{4})-(\d{2})-(\d{2})-', Path(path).name)
+        return liquid_date(meta.date) or (datetime(*map(int, match.groups())) if match else datetime.now())
+    
+    def is_published(self, path, meta):
+        """Whether Jekyll lists a post in site.posts: not unpublished, and not future-dated unless `future: true`"""
+        if not meta.published:
+            return False
+        if self.site_config().get('future') is True:
+            return True
+        moment = self.post_date(path, meta)
+        return moment <= datetime.now(moment.tzinfo)
+    
+    def post_url(self, path, meta):
+        """URL Jekyll would give a post under the configured permalink"""
+        path = Path(path)
+        match = re.match(r'(\d{4})-(\d{2})-(\d{2})-(.+)$', path.stem)
+        moment = self.post_date(path, meta)
+        slug = match.group(4) if match else path.stem
+        
+        pattern = str(self.site_config().get('permalink', 'date'))
+        pattern = self.PERMALINK_STYLES.get(pattern, pattern)
+        categories = "/".join(c.lower().replace(' ', '-') for c in meta.categories.split() if c)
+        url = (pattern.replace(':categories', categories)
+                      .replace(':year', f"{moment.year:04d}").replace(':month', f"{moment.month:02d}")
+                      .replace(':day', f"{moment.day:02d}").replace(':i_month', str(moment.month))
+                      .replace(':i_day', str(moment.day)).replace(':y_day', moment.strftime('%j'))
+                      .replace(':title', slug).replace(':slug', slug).replace(':output_ext', '.html'))
+        return re.sub(r'/{2,}', '/', url)
+    
+    def is_post(self, path):
+        return Path(path).resolve().parent == self.posts_dir.resolve()
+    
+    def new_post_path(self, title, date=None):
+        """Path for a new post; the filename date defaults to today"""
+        date_str = (date or datetime.now()).strftime("%Y-%m-%d")
+        return self.posts_dir / f"{date_str}-{self.create_slug(title)}.md"
+    
+    def new_page_path(self, title):
+        return self.root_dir / f"{self.create_slug(title)}.md"
+    
+    def build_front_matter(self, title, filepath, is_post, date="", categories="", tags="", description=""):
+        """Build the YAML header written by save"""
+        content = "---\n"
+        
+        if is_post:
+            content += 'layout: post\n'
+            content += f'title: "{title}"\n'
+            content += f'date: {date}\n'
+            content += f'categories: {categories}\n'
+            
+            description = description.strip()
+            if description:
+                content += f'description: "{description}"\n'
+            
+            if isinstance(tags, str):
+                tags = tags.split(",")
+            tags_list = [t.strip() for t in tags if t.strip()]
+            if tags_list:
+                content += f'tags: [{", ".join(tags_list)}]\n'
+        else:
+            # Page layout
+            if 'index' in str(filepath):
+                content += 'layout: home\n'
+            else:
+                content += 'layout: page\n'
+            content += f'title: "{title}"\n'
+            
+            # Add permalink for pages
+            if 'about' in str(filepath):
+                content += 'permalink: /about/\n'
+            elif 'posts' in str(filepath):
+                content += 'permalink: /posts/\n'
+            elif 'categories' in str(filepath):
+                content += 'permalink: /categories/\n'
+            elif 'tags' in str(filepath):
+                content += 'permalink: /tags/\n'
+        
+        content += "---\n\n"
+        return content
+    
+    @traced('core.save')
+    def save(self, title, body, is_post=True, filepath=None, date="", categories="", tags="", description=""):
+        """Write a post or page and return its path
+        
+        New files get a path derived from the title; existing ones keep theirs.
+        """
+        title = title.strip()
+        if not title:
+            raise ValueError("Title is required!")
+        
+        if filepath is None:
+            filepath = self.new_post_path(title) if is_post else self.new_page_path(title)
+        filepath = Path(filepath)
+        
+        if is_post:
+            # Reuse established spellings so "Python " doesn't split the "python" tag
+            if isinstance(tags, str):
+                tags = tags.split(",")
+            tags = unique_taxonomy_names(self.taxonomy('tags').canonical(t) for t in tags)
+            categories = " ".join(unique_taxonomy_names(
+                self.taxonomy('categories').canonical(c) for c in categories.split()))
+        
+        content = self.build_front_matter(title, filepath, is_post, date, categories, tags, description)
+        content += body.strip()
+        
+        atomic_write(filepath, content)
+        self.track(filepath)
+        if self.is_post(filepath):
+            self.posts_changed([filepath])
+        return filepath
+    
+    def read(self, path):
+        """Return (FrontMatter or None, body) for a file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return split_front_matter(f.read())
+    
+    def delete(self, path):
+        """Delete a post or page, refusing to remove protected pages"""
+        path = Path(path)
+        if path.name in self.PROTECTED_PAGES and not self.is_post(path):
+            raise ValueError(f"Cannot delete {path.name} - it's an important page!")
+        path.unlink()
+        self.track(path)
+        self.index.forget(path)
+        self.index.save()
+        if self.is_post(path):
+            self.posts_changed([path])
+    
+    def list_posts(self):
+        """Return (path, FrontMatter) for every post, newest first"""
+        records = self.index.scan(self.posts_dir)
+        return sorted(records, key=lambda r: r[0].name, reverse=True)
+    
+    def list_pages(self):
+        """Return (path, FrontMatter) for the site's root pages"""
+        records = []
+        for page_name in self.PAGE_FILES:
+            page_path = self.root_dir / page_name
+            if page_path.exists():
+                records.append((page_path, self.index.lookup(page_path)))
+        self.index.save()
+        return records
+    
+    @staticmethod
+    def taxonomy_names(kind, meta):
+        return meta.tags if kind == 'tags' else meta.categories.split()
+    
+    def build_taxonomies(self, posts):
+        """Count tags and categories from (path, FrontMatter) pairs"""
+        taxonomies = {'tags': TaxonomyIndex(), 'categories': TaxonomyIndex()}
+        for path, meta in posts:
+            for name, taxonomy in taxonomies.items():
+                taxonomy.update(path, self.taxonomy_names(name, meta))
+        self.taxonomies = taxonomies
+    
+    def taxonomy(self, kind):
+        """TaxonomyIndex for 'tags' or 'categories' across all posts, built on first use"""
+        if self.taxonomies is None:
+            self.build_taxonomies(self.list_posts())
+        return self.taxonomies[kind]
+    
+    @traced('taxonomy.update')
+    def update_taxonomies(self, paths):
+        """Re-count tags and categories for changed or deleted posts"""
+        if self.taxonomies is None:
+            return
+        for path in map(Path, paths):
+            meta = self.index.lookup(path) if path.exists() and self.is_post(path) else None
+            for name, taxonomy in self.taxonomies.items():
+                taxonomy.update(path, self.taxonomy_names(name, meta) if meta else ())
+    
+    def posts_changed(self, paths):
+        """Bring derived post data up to date after posts were written or removed"""
+        self.update_taxonomies(paths)
+        return self.update_archives(paths)
+    
+    @traced('archives.update')
+    def update_archives(self, paths=None, posts=None):
+        """Refresh the _data/ archives for changed posts, or rebuild them all
+        
+        A rebuild uses `posts`, (path, meta) pairs, when the caller already
+        scanned them.
+        """
+        if paths is None:
+            self.archives.load(posts)
+        else:
+            self.archives.update(paths)
+        written = self.archives.write()
+        self.track(*written)
+        return written
+    
+    def prepare_image(self, source, pending=()):
+        """Return (digest, stem, result); result is set when these bytes are already stored
+        
+        Digests in `pending` are already being encoded, so they get no stem
+        (None) rather than claiming one their job would never use.
+        """
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        digest = file_digest(source)
+        result = self.assets.lookup(digest)
+        if result:
+            return digest, self.assets.entries[digest]['stem'], result
+        if digest in pending:
+            return digest, None, None
+        return digest, self.assets.claim_stem(source), None
+    
+    def record_image(self, digest, stem, result):
+        """Store a processed image in the asset index and mark its files for publishing"""
+        self.assets.record(digest, stem, result)
+        self.track(self.assets.cache_path, *(self.assets_dir / name for name in image_files(result)))
+    
+    def find_orphaned_assets(self):
+        return self.assets.orphans(self.root_dir)
+    
+    def remove_assets(self, names):
+        self.assets.remove(names)
+        self.track(self.assets.cache_path, *(self.assets_dir / name for name in names))
+    
+    @traced('core.bulk_rewrite')
+    def bulk_rewrite(self, operations, dry_run=False, workers=None):
+        """Apply front matter operations to every post
+        
+        Files are processed in a worker pool for large blogs and written
+        atomically; see rewrite_front_matter_file for the operation format.
+        Returns (changes, errors) as lists of (path, diff) and (path, message).
+        """
+        with os.scandir(self.posts_dir) as it:
+            paths = sorted(self.posts_dir / e.name for e in it if e.name.endswith(".md") and e.is_file())
+        
+        if workers == 1 or len(paths) < self.PARALLEL_REWRITE_THRESHOLD:
+            results = [rewrite_front_matter_file(p, operations, dry_run) for p in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+                results = list(pool.map(rewrite_front_matter_file, paths,
+                                        [operations] * len(paths), [dry_run] * len(paths),
+                                        chunksize=chunksize))
+        
+        changes = [(path, diff) for path, diff, error in results if diff and not error]
+        errors = [(path, error) for path, diff, error in results if error]
+        
+        if not dry_run and changes:
+            for path, diff in changes:
+                self.index.lookup(path)
+            self.index.save()
+            self.track(*(path for path, diff in changes))
+            self.posts_changed([path for path, diff in changes])
+        return changes, errors
+    
+    def open_repo(self):
+        """Detect the Git repository, returning None if there isn't one"""
+        git = require('git', 'gitpython')
+        try:
+            self.repo = git.Repo(self.root_dir)
+            print("✓ Git repository detected")
+            self.track(*self.content_status())
+        except git.InvalidGitRepositoryError:
+            print("⚠ Not a Git repository")
+        except Exception as e:
+            print(f"❌ Git error: {e}")
+        return self.repo
+    
+    def repo_path(self, path):
+        """Path relative to the site root, in git's forward-slash form"""
+        return Path(os.path.relpath(os.path.abspath(path), os.path.abspath(self.root_dir))).as_posix()
+    
+    def track(self, *paths):
+        """Record paths the app changed so publishing stages only those"""
+        with self.changes_lock:
+            for path in paths:
+                self.change_seq += 1
+                self.changes[self.repo_path(path)] = self.change_seq
+            self.last_change = time.monotonic()
+    
+    @traced('git.status')
+    def content_status(self):
+        """Changed files under the app's content paths, for changes made before it started"""
+        scopes = ['_posts', self.repo_path(self.assets_dir), self.assets.cache_path.name] + self.PAGE_FILES
+        scopes += [self.repo_path(self.archives.data_dir / name) for name in self.archives.output_names()]
+        output = self.repo.git.status('--porcelain', '-z', '--untracked-files=all', '--', *scopes)
+        
+        paths = []
+        entries = iter(output.split('\0'))
+        for entry in entries:
+            if len(entry) < 4:
+                continue
+            paths.append(entry[3:])
+            # Renames and copies are followed by their source path
+            if entry[0] in 'RC':
+                paths.append(next(entries, ''))
+        return [self.root_dir / p for p in paths if p]
+    
+    def pending_changes(self):
+        """Tracked paths waiting to be published"""
+        with self.changes_lock:
+            return sorted(self.changes)
+    
+    @traced('git.stage')
+    def stage_changes(self, paths, batch_size=500):
+        """Stage additions, edits and deletions for paths only, never the whole tree
+        
+        Returns those of paths with staged changes; anything else already in
+        the index is the user's and is left out.
+        """
+        existing = [p for p in paths if (self.root_dir / p).exists()]
+        missing = [p for p in paths if not (self.root_dir / p).exists()]
+        
+        for i in range(0, len(existing), batch_size):
+            self.repo.git.add('-A', '--', *existing[i:i + batch_size])
+        for i in range(0, len(missing), batch_size):
+            self.repo.git.rm('--cached', '-r', '-q', '--ignore-unmatch', '--', *missing[i:i + batch_size])
+        
+        staged = []
+        for i in range(0, len(paths), batch_size):
+            staged += self.repo.git.diff('--cached', '--name-only', '--no-renames', '--',
+                                         *paths[i:i + batch_size]).splitlines()
+        return staged
+    
+    def describe_changes(self, paths, max_subject=72):
+        """Commit message listing the posts and pages among paths by title"""
+        names = []
+        details = []
+        for path in paths:
+            full_path = self.root_dir / path
+            if not path.endswith(".md"):
+                continue
+            if full_path.exists():
+                title = self.index.lookup(full_path).title or full_path.stem
+                action = "Update"
+            else:
+                title = full_path.stem
+                action = "Delete"
+            names.append(title)
+            details.append(f"- {action}: {title} ({path})")
+        
+        assets = len(paths) - len(names)
+        if assets:
+            details.append(f"- {assets} asset file(s)")
+        
+        if len(names) == 1:
+            subject = f"Update {names[0]}" if details[0].startswith("- Update") else f"Delete {names[0]}"
+        elif names:
+            subject = f"Update {len(names)} posts: " + ", ".join(names)
+        else:
+            subject = f"Update {assets} asset file(s)"
+        if len(subject) > max_subject:
+            subject = subject[:max_subject - 3].rstrip(", ") + "..."
+        return subject + "\n\n" + "\n".join(details)
+    
+    @traced('git.commit')
+    def commit(self, message, paths):
+        """Commit the staged state of paths only
+        
+        The commit's tree is HEAD's with just these entries taken from the
+        index, so changes the user staged by hand stay staged, uncommitted.
+        """
+        git = require('git', 'gitpython')
+        head = self.repo.head.commit if self.repo.head.is_valid() else None
+        index = git.IndexFile.from_tree(self.repo, head) if head else git.IndexFile.new(self.repo)
+        staged = self.repo.index.entries
+        for path in paths:
+            if (path, 0) in staged:
+                index.entries[(path, 0)] = staged[(path, 0)]
+            else:
+                index.entries.pop((path, 0), None)
+        return git.Commit.create_from_tree(self.repo, index.write_tree(), message,
+                                           parent_commits=[head] if head else [], head=True)
+    
+    def unpushed_commits(self):
+        """Number of local commits not on origin, e.g. after a failed push
+        
+        A branch that was never pushed has all of its commits unpushed.
+        """
+        git = require('git', 'gitpython')
+        try:
+            upstream = f'refs/remotes/origin/{self.repo.active_branch.name}'
+            try:
+                self.repo.git.rev_parse('--verify', '--quiet', upstream)
+            except git.GitCommandError:
+                return int(self.repo.git.rev_list('--count', 'HEAD'))
+            return int(self.repo.git.rev_list('--count', f'{upstream}..HEAD'))
+        except Exception:
+            return 0
+    
+    @traced('git.push')
+    def push(self, progress=None, on_process=None):
+        """Push HEAD to origin, streaming progress and exposing the git process for cancellation"""
+        git = require('git', 'gitpython')
+        progress = progress or git.RemoteProgress()
+        process = self.repo.git.push('--progress', '--porcelain', 'origin', 'HEAD',
+                                     as_process=True, universal_newlines=True)
+        if on_process:
+            on_process(process)
+        
+        output = []
+        git.cmd.handle_process_output(process, output.append, progress.new_message_handler(),
+                                      finalizer=None, decode_streams=False)
+        process.wait(stderr="\n".join(progress.error_lines))
+        return output
+    
+    def forget_changes(self, snapshot):
+        """Drop published paths unless they changed again since snapshot was taken"""
+        with self.changes_lock:
+            for path, seq in snapshot.items():
+                if self.changes.get(path) == seq:
+                    del self.changes[path]
+    
+    @traced('publish')
+    def publish(self, message=None, push=True, progress=None, cancelled=None, on_process=None):
+        """Stage tracked changes, commit and optionally push
+        
+        Returns (committed paths, pushed). Local commits left behind by a
+        failed push are pushed even when nothing new is staged. The message
+        defaults to describe_changes. Raises PublishCancelled if cancelled()
+        turns true between steps.
+        """
+        if self.repo is None and self.open_repo() is None:
+            raise RuntimeError("No Git repository found!")
+        cancelled = cancelled or (lambda: False)
+        
+        with self.changes_lock:
+            snapshot = dict(self.changes)
+        
+        staged = self.stage_changes(sorted(snapshot)) if snapshot else []
+        if staged:
+            if cancelled():
+                raise PublishCancelled("Publish cancelled before commit")
+            self.commit(message or self.describe_changes(staged), staged)
+        self.forget_changes(snapshot)
+        
+        if not push or not (staged or self.unpushed_commits()):
+            return staged, False
+        if cancelled():
+            raise PublishCancelled("Publish cancelled before push; the commit is kept locally")
+        self.push(progress, on_process)
+        return staged, True
+    
+    def load_settings(self):
+        """Per-user editor settings, merged over PUBLISH_DEFAULTS"""
+        settings = dict(PUBLISH_DEFAULTS)
+        try:
+            with open(self.settings_path, 'r', encoding='utf-8') as f:
+                settings.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return settings
+    
+    def save_settings(self, settings):
+        try:
+            atomic_write(self.settings_path, json.dumps(settings, indent=2))
+        except OSError as e:
+            print(f"⚠ Could not write settings: {e}")
+
+
+class PublishCancelled(Exception):
+    """Raised when the user cancels a publish job"""
+
+
+class PublishJob:
+    """Background commit-and-push with progress reporting and cancellation
+    
+    Events are put on `events` for the Tk thread as ('progress', text, fraction),
+    ('done', paths, pushed), ('cancelled', message) or ('error', message).
+    A message of None lets BlogCore describe the changes.
+    """
+    
+    def __init__(self, core, message=None, push=True):
+        self.core = core
+        self.message = message
+        self.push = push
+        self.events = queue.Queue()
+        self.process = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="publish", daemon=True)
+    
+    def start(self):
+        self._thread.start()
+        return self
+    
+    def running(self):
+        return self._thread.is_alive()
+    
+    def cancel(self):
+        """Stop the job; a running push is terminated"""
+        self._cancelled.set()
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.terminate()
+    
+    def _on_process(self, process):
+        self.process = process
+        if self._cancelled.is_set():
+            process.terminate()
+    
+    def progress(self):
+        """GitPython RemoteProgress forwarding push stages to the event queue"""
+        git = require('git', 'gitpython')
+        events = self.events
+        
+        class Progress(git.RemoteProgress):
+            def update(self, op_code, cur_count, max_count=None, message=''):
+                stage = self._cur_line.split(':')[0].strip() if self._cur_line else "Pushing"
+                fraction = cur_count / max_count if max_count else None
+                events.put(('progress', stage, fraction))
+        
+        return Progress()
+    
+    def _run(self):
+        try:
+            self.events.put(('progress', "Staging changes", None))
+            paths, pushed = self.core.publish(self.message, self.push, progress=self.progress(),
+                                              cancelled=self._cancelled.is_set, on_process=self._on_process)
+            self.events.put(('done', paths, pushed))
+        except PublishCancelled as e:
+            self.events.put(('cancelled', str(e)))
+        except Exception as e:
+            if self._cancelled.is_set():
+                self.events.put(('cancelled', "Push cancelled; the commit is kept locally"))
+            else:
+                self.events.put(('error', str(e)))
+
+
+class PublishQueue:
+    """Decides when tracked changes are published as one batched commit
+    
+    'manual' only publishes on request, 'interval' publishes pending changes
+    every N minutes, and 'idle' publishes once nothing has been saved for
+    a while. Under the automatic policies a failed publish is retried with
+    exponential backoff; a manual one waits for the next request.
+    """
+    
+    RETRY_BASE_SECONDS = 30
+    RETRY_MAX_SECONDS = 1800
+    
+    def __init__(self, core, policy='manual', interval_minutes=10, idle_seconds=120):
+        self.core = core
+        self.policy = policy
+        self.interval_minutes = interval_minutes
+        self.idle_seconds = idle_seconds
+        self.last_publish = time.monotonic()
+        self.failures = 0
+        self.retry_at = None
+    
+    def configure(self, policy=None, interval_minutes=None, idle_seconds=None):
+        if policy is not None:
+            self.policy = policy
+        if interval_minutes is not None:
+            self.interval_minutes = interval_minutes
+        if idle_seconds is not None:
+            self.idle_seconds = idle_seconds
+    
+    def due(self, now=None):
+        """Whether an automatic publish should start now"""
+        now = time.monotonic() if now is None else now
+        if self.policy == 'manual':
+            return False
+        if self.retry_at is not None:
+            return now >= self.retry_at
+        if not self.core.pending_changes():
+            return False
+        if self.policy == 'interval':
+            return now - self.last_publish >= self.interval_minutes * 60
+        if self.policy == 'idle':
+            return now - self.core.last_change >= self.idle_seconds
+        return False
+    
+    def succeeded(self):
+        self.last_publish = time.monotonic()
+        self.failures = 0
+        self.retry_at = None
+    
+    def failed(self):
+        """Schedule a retry and return the delay in seconds, or None under the manual policy"""
+        if self.policy == 'manual':
+            return None
+        delay = min(self.RETRY_BASE_SECONDS * 2 ** self.failures, self.RETRY_MAX_SECONDS)
+        self.failures += 1
+        self.retry_at = time.monotonic() + delay
+        return delay
+
+
+class JekyllServer:
+    """Supervised `jekyll serve` whose output is drained by a reader thread
+    
+    Events are put on `events` as ('log', line), ('ready', url),
+    ('regenerating', line), ('build', seconds) and finally ('exited', code).
+    Readiness comes from the "Server address" line or, failing that, from
+    the port accepting connections once Jekyll has reported a build. A port
+    something else already holds is refused up front, since connecting to
+    it would say nothing about this server.
+    """
+    
+    SERVER_ADDRESS_RE = re.compile(r'Server address:\s*(\S+)')
+    BUILD_TIME_RE = re.compile(r'done in ([\d.]+) seconds')
+    PROBE_INTERVAL = 0.25
+    PROBE_TIMEOUT = 180
+    
+    def __init__(self, root_dir=".", host="127.0.0.1", port=4000, incremental=True, livereload=True):
+        self.root_dir = Path(root_dir)
+        self.host = host
+        self.port = port
+        self.incremental = incremental
+        self.livereload = livereload
+        self.url = f"http://{host}:{port}/"
+        self.events = queue.Queue()
+        self.process = None
+        self.ready = False
+        self.built = False
+        self._ready_lock = threading.Lock()
+    
+    def command(self):
+        args = ["bundle", "exec", "jekyll", "serve", "--host", self.host, "--port", str(self.port)]
+        if self.incremental:
+            args.append("--incremental")
+        if self.livereload:
+            args.append("--livereload")
+        return args
+    
+    def port_in_use(self):
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.PROBE_INTERVAL):
+                return True
+        except OSError:
+            return False
+    
+    def start(self):
+        if self.port_in_use():
+            raise RuntimeError(f"Port {self.port} is already in use - is another server running?")
+        self.ready = self.built = False
+        self.started = time.perf_counter()
+        self.process = subprocess.Popen(
+            self.command(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            cwd=self.root_dir
+        )
+        threading.Thread(target=self._read_output, name="jekyll-output", daemon=True).start()
+        threading.Thread(target=self._probe_port, name="jekyll-probe", daemon=True).start()
+        return self
+    
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+    
+    def stop(self, timeout=5):
+        if not self.running():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+    
+    def _mark_ready(self, url):
+        with self._ready_lock:
+            if self.ready:
+                return
+            self.ready = True
+        if TRACER.enabled:
+            TRACER.record('server.ready', self.started, time.perf_counter() - self.started)
+        self.url = url
+        self.events.put(('ready', url))
+    
+    def _read_output(self):
+        process = self.process
+        for line in process.stdout:
+            line = line.rstrip()
+            self.events.put(('log', line))
+            
+            match = self.SERVER_ADDRESS_RE.search(line)
+            if match:
+                self._mark_ready(match.group(1))
+            elif 'Regenerating:' in line:
+                self.events.put(('regenerating', line.strip()))
+            else:
+                match = self.BUILD_TIME_RE.search(line)
+                if match:
+                    self.built = True
+                    self.events.put(('build', float(match.group(1))))
+        
+        self.events.put(('exited', process.wait()))
+    
+    def _probe_port(self):
+        """Fallback readiness check for Jekyll versions that word the address line differently"""
+        process = self.process
+        deadline = time.monotonic() + self.PROBE_TIMEOUT
+        while not self.ready and process.poll() is None and time.monotonic() < deadline:
+            if not self.built:
+                time.sleep(self.PROBE_INTERVAL)
+                continue
+            try:
+                with socket.create_connection((self.host, self.port), timeout=self.PROBE_INTERVAL):
+                    self._mark_ready(self.url)
+                    return
+            except OSError:
+                time.sleep(self.PROBE_INTERVAL)
+
+
+class RenderCancelled(Exception):
+    """Raised when a newer preview request supersedes the one being rendered"""
+
+
+class IncrementalRenderer:
+    """Markdown renderer that caches HTML per top-level block
+    
+    Documents are split at blank lines (keeping fenced code, indented
+    continuations, lists, blockquotes and raw HTML blocks together) and
+    only blocks whose text changed are re-rendered. Heading ids and the [TOC] marker depend on the whole
+    document, so they are applied in a cheap pass over the joined HTML.
+    """
+    
+    EXTENSIONS = ['fenced_code', 'codehilite', 'tables']
+    CACHE_SIZE = 4096
+    FENCE_RE = re.compile(r'^(`{3,}|~{3,})')
+    LIST_RE = re.compile(r'^ {0,3}(?:[*+-]|\d+[.)])\s')
+    QUOTE_RE = re.compile(r'^ {0,3}>')
+    HTML_START_RE = re.compile(r'^ {0,3}<(!--|[a-zA-Z][\w-]*)')
+    # Block-level tags without a closing tag, which can't hold a blank line
+    VOID_TAGS = {'hr'}
+    REFERENCE_RE = re.compile(r'^ {0,3}\[[^\]]+\]:.*$', re.MULTILINE)
+    HEADING_RE = re.compile(r'<h([1-6])>(.*?)</h\1>', re.DOTALL)
+    TOC_MARKER = '<p>[TOC]</p>'
+    
+    def __init__(self):
+        self.md = None
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+    
+    def markdown(self):
+        if self.md is None:
+            self.md = require('markdown').Markdown(extensions=self.EXTENSIONS)
+        return self.md
+    
+    @staticmethod
+    def html_depth(tag, depth, text):
+        """Nesting depth of an open raw HTML block after text; 0 once it is closed"""
+        if tag == '!--':
+            return 0 if '-->' in text else 1
+        depth += len(re.findall(rf'<{tag}\b(?![^>]*/>)', text, re.IGNORECASE))
+        depth -= len(re.findall(rf'</{tag}\s*>', text, re.IGNORECASE))
+        return max(depth, 0)
+    
+    def split_blocks(self, text):
+        """Split markdown into independently renderable top-level blocks"""
+        blocks, current = [], []
+        html_tags = {'!--'} | set(self.markdown().block_level_elements) - self.VOID_TAGS
+        fence = None
+        # (tag, depth) of a raw HTML block or comment still open; Markdown
+        # passes it through whole, blank lines included
+        html = None
+        pending_blank = False
+        
+        for line in text.split('\n'):
+            if fence:
+                current.append(line)
+                stripped = line.strip()
+                if len(stripped) >= len(fence) and stripped == fence[0] * len(stripped):
+                    fence = None
+                continue
+            
+            if html:
+                current.append(line)
+                depth = self.html_depth(html[0], html[1], line)
+                html = (html[0], depth) if depth else None
+                continue
+            
+            if not line.strip():
+                pending_blank = bool(current)
+                continue
+            
+            fence_match = self.FENCE_RE.match(line)
+            if fence_match:
+                if current:
+                    blocks.append('\n'.join(current))
+                current = [line]
+                fence = fence_match.group(1)
+                pending_blank = False
+                continue
+            
+            if pending_blank:
+                in_list = bool(self.LIST_RE.match(current[0]))
+                continues = line.startswith(('    ', '\t')) or (
+                    in_list and (self.LIST_RE.match(line) or line.startswith('  '))) or (
+                    self.QUOTE_RE.match(current[0]) and self.QUOTE_RE.match(line))
+                if continues:
+                    current.extend(['', line])
+                else:
+                    blocks.append('\n'.join(current))
+                    current = [line]
+                pending_blank = False
+            else:
+                current.append(line)
+            
+            html_match = self.HTML_START_RE.match(line)
+            if html_match and html_match.group(1).lower() in html_tags:
+                tag = html_match.group(1).lower()
+                rest = line[html_match.end():] if tag == '!--' else line
+                depth = self.html_depth(tag, 0, rest)
+                html = (tag, depth) if depth else None
+        
+        if current:
+            blocks.append('\n'.join(current))
+        return blocks
+    
+    def render_block(self, source):
+        """Render one block, reusing cached HTML when its text is unchanged"""
+        html = self.cache.get(source)
+        if html is not None:
+            self.hits += 1
+            self.cache.move_to_end(source)
+            return html
+        
+        self.misses += 1
+        # Fenced code goes through Pygments, which dominates render time when present
+        with TRACER.span('preview.highlight' if source.lstrip().startswith(('```', '~~~')) else 'preview.markdown'):
+            html = self.markdown().reset().convert(source)
+        self.cache[source] = html
+        if len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return html
+    
+    @traced('preview.render')
+    def render(self, text, cancelled=None):
+        """Render a full document to HTML
+        
+        `cancelled` is polled between blocks; when it returns True the
+        render stops early with RenderCancelled.
+        """
+        # Reference-style link definitions apply document-wide
+        references = self.REFERENCE_RE.findall(text)
+        suffix = '\n\n' + '\n'.join(references) if references else ''
+        
+        parts = []
+        with self.lock:
+            for block in self.split_blocks(text):
+                if cancelled and cancelled():
+                    raise RenderCancelled()
+                parts.append(self.render_block(block + suffix))
+        return self.add_heading_ids('\n'.join(p for p in parts if p))
+    
+    def add_heading_ids(self, html):
+        """Give headings unique ids and expand a [TOC] marker, like the toc extension"""
+        from markdown.extensions.toc import slugify, unique
+        
+        used_ids = set()
+        headings = []
+        
+        def add_id(match):
+            level, inner = match.group(1), match.group(2)
+            text = unescape(re.sub(r'<[^>]+>', '', inner))
+            anchor = unique(slugify(text, '-'), used_ids)
+            headings.append((int(level), anchor, text))
+            return f'<h{level} id="{anchor}">{inner}</h{level}>'
+        
+        html = self.HEADING_RE.sub(add_id, html)
+        if self.TOC_MARKER in html:
+            html = html.replace(self.TOC_MARKER, self.build_toc(headings))
+        return html
+    
+    @staticmethod
+    def build_toc(headings):
+        """Build a nested table of contents from (level, anchor, text) tuples"""
+        lines = ['<div class="toc">']
+        levels = []
+        for level, anchor, text in headings:
+            if levels and level <= levels[-1]:
+                lines.append('</li>')
+            while levels and level < levels[-1]:
+                lines.append('</ul>\n</li>')
+                levels.pop()
+            if not levels or level > levels[-1]:
+                lines.append('<ul>')
+                levels.append(level)
+            lines.append(f'<li><a href="#{anchor}">{escape(text)}</a>')
+        while levels:
+            lines.append('</li>\n</ul>')
+            levels.pop()
+        lines.append('</div>')
+        return '\n'.join(lines)
+
+
+class LiquidError(Exception):
+    """Raised for template syntax the preview engine cannot parse"""
+
+
+def liquid_truthy(value):
+    """Liquid truthiness: only nil and false are falsy"""
+    return value is not None and value is not False
+
+
+def liquid_date(value):
+    """Coerce a Liquid date input (datetime, 'now' or a Jekyll date string) to datetime"""
+    if isinstance(value, datetime):
+        return value
+    text = str(value or "").strip()
+    if text in ("now", "today"):
+        return datetime.now()
+    for fmt in ("%Y-%m-%d %H:%M:%S %z", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M %z", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def ruby_strftime(moment, fmt):
+    """strftime accepting Ruby's %-d style no-padding flags on every platform"""
+    def expand(match):
+        flag, code = match.groups()
+        value = moment.strftime('%' + code)
+        return value.lstrip('0') or '0' if flag else value
+    return re.sub(r'%(-?)([a-zA-Z%])', expand, fmt)
+
+
+class LiquidTemplate:
+    """Parsed Liquid template supporting the subset Jekyll layouts use
+    
+    Covers output with filters, whitespace control, if/elsif/else/unless,
+    case/when, for (limit, offset, reversed, forloop), assign, capture,
+    include, raw and comment. Unknown tags render nothing and unknown
+    filters pass their input through, so theme plugins degrade quietly.
+    """
+    
+    TOKEN_RE = re.compile(r'(\{\{.*?\}\}|\{%.*?%\})', re.DOTALL)
+    BLOCK_ENDS = {'if': 'endif', 'unless': 'endunless', 'for': 'endfor', 'case': 'endcase', 'capture': 'endcapture'}
+    
+    def __init__(self, source, name="template"):
+        self.name = name
+        self.nodes = self.parse(source)
+    
+    # Parsing
+    
+    def tokenize(self, source):
+        """Split source into ('text', s) / ('output', expr) / ('tag', name, args) with trimming applied"""
+        tokens = []
+        trim_next = False
+        for piece in self.TOKEN_RE.split(source):
+            if not piece:
+                continue
+            if piece.startswith(('{{', '{%')) and piece.endswith(('}}', '%}')):
+                inner = piece[2:-2]
+                if inner.startswith('-'):
+                    inner = inner[1:]
+                    if tokens and tokens[-1][0] == 'text':
+                        tokens[-1] = ('text', tokens[-1][1].rstrip())
+                trim_next = inner.endswith('-')
+                if trim_next:
+                    inner = inner[:-1]
+                inner = inner.strip()
+                if piece.startswith('{{'):
+                    tokens.append(('output', inner))
+                else:
+                    name, _, args = inner.partition(' ')
+                    tokens.append(('tag', name, args.strip()))
+            else:
+                tokens.append(('text', piece.lstrip() if trim_next else piece))
+                trim_next = False
+        return tokens
+    
+    def parse(self, source):
+        tokens = self.tokenize(source)
+        # raw and comment swallow everything up to their end tag
+        merged = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token[0] == 'tag' and token[1] in ('raw', 'comment'):
+                end = 'end' + token[1]
+                body = []
+                i += 1
+                while i < len(tokens) and not (tokens[i][0] == 'tag' and tokens[i][1] == end):
+                    body.append(tokens[i])
+                    i += 1
+                if token[1] == 'raw':
+                    merged.append(('text', source_of(body)))
+            else:
+                merged.append(token)
+            i += 1
+        
+        nodes, _, position = self.parse_nodes(merged, 0, ())
+        if position < len(merged):
+            raise LiquidError(f"{self.name}: unexpected {{% {merged[position][1]} %}}")
+        return nodes
+    
+    def parse_nodes(self, tokens, position, stop):
+        """Parse until a tag in stop; return (nodes, stop tag token, position)"""
+        nodes = []
+        while position < len(tokens):
+            token = tokens[position]
+            position += 1
+            if token[0] == 'text':
+                nodes.append(('text', token[1]))
+                continue
+            if token[0] == 'output':
+                nodes.append(('output', self.parse_filtered(token[1])))
+                continue
+            
+            _, name, args = token
+            if name in stop:
+                return nodes, token, position
+            
+            if name in ('if', 'unless'):
+                branches = []
+                condition = args
+                while True:
+                    body, end, position = self.parse_nodes(tokens, position, ('elsif', 'else', 'endif', 'endunless'))
+                    branches.append((condition, body))
+                    if end is None or end[1] in ('endif', 'endunless'):
+                        break
+                    condition = end[2] if end[1] == 'elsif' else None
+                nodes.append((name, branches))
+            elif name == 'case':
+                subject = self.parse_expression(args)
+                whens = []
+                default = []
+                body, end, position = self.parse_nodes(tokens, position, ('when', 'else', 'endcase'))
+                while end is not None and end[1] != 'endcase':
+                    if end[1] == 'when':
+                        values = [self.parse_expression(v) for v in re.split(r'\s*(?:,|\bor\b)\s*', end[2])]
+                        body, next_end, position = self.parse_nodes(tokens, position, ('when', 'else', 'endcase'))
+                        whens.append((values, body))
+                    else:
+                        default, next_end, position = self.parse_nodes(tokens, position, ('endcase',))
+                    end = next_end
+                nodes.append(('case', subject, whens, default))
+            elif name == 'for':
+                match = re.match(r'(\w+)\s+in\s+(\(.*?\)|\S+)\s*(.*)', args)
+                if not match:
+                    raise LiquidError(f"{self.name}: bad for loop '{args}'")
+                variable, collection, options = match.groups()
+                params = dict(re.findall(r'(limit|offset)\s*:\s*(\S+)', options))
+                body, end, position = self.parse_nodes(tokens, position, ('else', 'endfor'))
+                empty = []
+                if end is not None and end[1] == 'else':
+                    empty, end, position = self.parse_nodes(tokens, position, ('endfor',))
+                nodes.append(('for', variable, self.parse_expression(collection),
+                              {k: self.parse_expression(v) for k, v in params.items()},
+                              'reversed' in options.split(), body, empty))
+            elif name == 'assign':
+                variable, _, expression = args.partition('=')
+                nodes.append(('assign', variable.strip(), self.parse_filtered(expression.strip())))
+            elif name == 'capture':
+                body, end, position = self.parse_nodes(tokens, position, ('endcapture',))
+                nodes.append(('capture', args.strip(), body))
+            elif name in ('include', 'include_relative'):
+                match = re.match(r'(\{\{.*?\}\}|\S+)\s*(.*)', args, re.DOTALL)
+                file_name = match.group(1)
+                params = {k: self.parse_expression(v) for k, v in
+                          re.findall(r'(\w+)\s*=\s*("[^"]*"|\'[^\']*\'|\S+)', match.group(2))}
+                nodes.append(('include', file_name, params))
+            elif name in self.BLOCK_ENDS.values() or name in ('else', 'elsif', 'when'):
+                raise LiquidError(f"{self.name}: unexpected {{% {name} %}}")
+            # Anything else (seo, feed_meta, plugin tags) renders as nothing
+        return nodes, None, position
+    
+    def parse_filtered(self, text):
+        """Parse 'expr | filter: a, b | filter' into (expr, [(name, [args])])"""
+        parts = self.split_unquoted(text, '|')
+        expression = self.parse_expression(parts[0])
+        filters = []
+        for part in parts[1:]:
+            name, _, arguments = part.partition(':')
+            args = [self.parse_expression(a) for a in self.split_unquoted(arguments, ',') if a.strip()]
+            filters.append((name.strip(), args))
+        return expression, filters
+    
+    @staticmethod
+    def split_unquoted(text, separator):
+        parts = []
+        current = []
+        quote = None
+        for char in text:
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == separator:
+                parts.append(''.join(current).strip())
+                current = []
+                continue
+            current.append(char)
+        parts.append(''.join(current).strip())
+        return parts
+    
+    def parse_expression(self, text):
+        text = text.strip()
+        if not text:
+            return ('literal', None)
+        if text[0] in '"\'' and text[-1] == text[0] and len(text) > 1:
+            return ('literal', text[1:-1])
+        if re.fullmatch(r'-?\d+', text):
+            return ('literal', int(text))
+        if re.fullmatch(r'-?\d+\.\d+', text):
+            return ('literal', float(text))
+        match = re.fullmatch(r'\(\s*(\S+?)\s*\.\.\s*(\S+?)\s*\)', text)
+        if match:
+            return ('range', self.parse_expression(match.group(1)), self.parse_expression(match.group(2)))
+        literals = {'true': True, 'false': False, 'nil': None, 'null': None, 'empty': '', 'blank': ''}
+        if text in literals:
+            return ('literal', literals[text])
+        
+        path = []
+        for name, index in re.findall(r'([^.\[\]]+)|\[([^\]]+)\]', text):
+            path.append(('name', name) if name else self.parse_expression(index))
+        return ('lookup', path)
+    
+    # Rendering
+    
+    def render(self, context, environment=None):
+        output = []
+        self.render_nodes(self.nodes, context, environment, output)
+        return ''.join(output)
+    
+    def render_nodes(self, nodes, context, environment, output):
+        for node in nodes:
+            kind = node[0]
+            if kind == 'text':
+                output.append(node[1])
+            elif kind == 'output':
+                value = self.evaluate_filtered(node[1], context, environment)
+                output.append(self.to_text(value))
+            elif kind in ('if', 'unless'):
+                for index, (condition, body) in enumerate(node[1]):
+                    if condition is None:
+                        matched = True
+                    else:
+                        matched = self.evaluate_condition(condition, context)
+                        if kind == 'unless' and index == 0:
+                            matched = not matched
+                    if matched:
+                        self.render_nodes(body, context, environment, output)
+                        break
+            elif kind == 'case':
+                _, subject, whens, default = node
+                value = self.evaluate(subject, context)
+                for values, body in whens:
+                    if any(self.evaluate(v, context) == value for v in values):
+                        self.render_nodes(body, context, environment, output)
+                        break
+                else:
+                    self.render_nodes(default, context, environment, output)
+            elif kind == 'for':
+                self.render_for(node, context, environment, output)
+            elif kind == 'assign':
+                context[node[1]] = self.evaluate_filtered(node[2], context, environment)
+            elif kind == 'capture':
+                captured = []
+                self.render_nodes(node[2], context, environment, captured)
+                context[node[1]] = ''.join(captured)
+            elif kind == 'include' and environment is not None:
+                file_name = node[1]
+                if file_name.startswith('{{'):
+                    file_name = self.to_text(self.evaluate_filtered(self.parse_filtered(file_name[2:-2]), context, environment))
+                params = {k: self.evaluate(v, context) for k, v in node[2].items()}
+                output.append(environment.render_include(file_name, context, params))
+    
+    def render_for(self, node, context, environment, output):
+        _, variable, collection, params, reverse, body, empty = node
+        items = self.evaluate(collection, context)
+        if isinstance(items, dict):
+            items = [[k, v] for k, v in items.items()]
+        elif items is None or isinstance(items, (str, int, float)):
+            items = [] if items in (None, "") else [items]
+        items = list(items)
+        
+        offset = self.evaluate(params['offset'], context) if 'offset' in params else 0
+        items = items[int(offset or 0):]
+        if 'limit' in params:
+            items = items[:int(self.evaluate(params['limit'], context) or 0)]
+        if reverse:
+            items.reverse()
+        
+        if not items:
+            self.render_nodes(empty, context, environment, output)
+            return
+        
+        saved = {name: context.get(name) for name in (variable, 'forloop')}
+        length = len(items)
+        for index, item in enumerate(items):
+            context[variable] = item
+            context['forloop'] = {
+                'index': index + 1, 'index0': index, 'rindex': length - index, 'rindex0': length - index - 1,
+                'first': index == 0, 'last': index == length - 1, 'length': length
+            }
+            self.render_nodes(body, context, environment, output)
+        context.update(saved)
+    
+    def evaluate_condition(self, text, context):
+        """Evaluate and/or chains right to left, as Liquid does"""
+        parts = re.split(r'\s+(and|or)\s+', text.strip())
+        result = self.evaluate_comparison(parts[-1], context)
+        for index in range(len(parts) - 3, -1, -2):
+            left = self.evaluate_comparison(parts[index], context)
+            result = (left and result) if parts[index + 1] == 'and' else (left or result)
+        return result
+    
+    def evaluate_comparison(self, text, context):
+        match = re.match(r'(.+?)\s*(==|!=|<>|>=|<=|>|<|\bcontains\b)\s*(.+)$', text.strip())
+        if not match:
+            return liquid_truthy(self.evaluate(self.parse_expression(text), context))
+        
+        left = self.evaluate(self.parse_expression(match.group(1)), context)
+        operator = match.group(2)
+        right = self.evaluate(self.parse_expression(match.group(3)), context)
+        if right == '' and match.group(3).strip() in ('empty', 'blank'):
+            empty = left in (None, '') or (hasattr(left, '__len__') and len(left) == 0)
+            return empty if operator == '==' else not empty
+        try:
+            if operator == '==':
+                return left == right
+            if operator in ('!=', '<>'):
+                return left != right
+            if operator == 'contains':
+                return left is not None and right in left
+            return {'>': left > right, '<': left < right, '>=': left >= right, '<=': left <= right}[operator]
+        except TypeError:
+            return False
+    
+    def evaluate(self, expression, context):
+        kind = expression[0]
+        if kind == 'literal':
+            return expression[1]
+        if kind == 'range':
+            start = int(self.evaluate(expression[1], context) or 0)
+            end = int(self.evaluate(expression[2], context) or 0)
+            return list(range(start, end + 1))
+        
+        value = context
+        for index, step in enumerate(expression[1]):
+            key = step[1] if step[0] == 'name' else self.evaluate(step, context)
+            value = self.lookup(value, key, index == 0)
+            if value is None:
+                return None
+        return value
+    
+    @staticmethod
+    def lookup(value, key, first=False):
+        if isinstance(value, dict):
+            try:
+                return value[key]
+            except (KeyError, TypeError):
+                pass
+        if isinstance(value, (list, tuple)) and isinstance(key, int):
+            return value[key] if -len(value) <= key < len(value) else None
+        if not first and key == 'size' and hasattr(value, '__len__'):
+            return len(value)
+        if not first and key in ('first', 'last') and isinstance(value, (list, tuple)):
+            return (value[0] if key == 'first' else value[-1]) if value else None
+        return None
+    
+    def evaluate_filtered(self, filtered, context, environment):
+        expression, filters = filtered
+        value = self.evaluate(expression, context)
+        for name, args in filters:
+            function = LIQUID_FILTERS.get(name)
+            if function is None:
+                continue
+            values = [self.evaluate(a, context) for a in args]
+            try:
+                value = function(value, *values, environment=environment) if name in ENVIRONMENT_FILTERS else function(value, *values)
+            except (TypeError, ValueError, AttributeError):
+                pass
+        return value
+    
+    @staticmethod
+    def to_text(value):
+        if value is None:
+            return ""
+        if value is True or value is False:
+            return "true" if value else "false"
+        if isinstance(value, (list, tuple)):
+            return "".join(LiquidTemplate.to_text(v) for v in value)
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S %z").strip()
+        return str(value)
+
+
+def source_of(tokens):
+    """Reassemble raw tokens back into template text"""
+    pieces = []
+    for token in tokens:
+        if token[0] == 'text':
+            pieces.append(token[1])
+        elif token[0] == 'output':
+            pieces.append('{{ ' + token[1] + ' }}')
+        else:
+            pieces.append('{% ' + (token[1] + ' ' + token[2]).strip() + ' %}')
+    return ''.join(pieces)
+
+
+def liquid_join_url(base, path):
+    path = str(path or "")
+    if re.match(r'^[a-z][a-z0-9+.-]*://', path) or path.startswith('//'):
+        return path
+    if not path.startswith('/'):
+        path = '/' + path
+    return (base or "").rstrip('/') + path
+
+
+def liquid_truncate(value, length=50, ellipsis="..."):
+    text = LiquidTemplate.to_text(value)
+    length = int(length)
+    return text if len(text) <= length else text[:max(0, length - len(ellipsis))] + ellipsis
+
+
+def liquid_truncatewords(value, count=15, ellipsis="..."):
+    words = LiquidTemplate.to_text(value).split()
+    count = int(count)
+    return " ".join(words) if len(words) <= count else " ".join(words[:count]) + ellipsis
+
+
+def liquid_sort(value, key=None):
+    items = list(value or [])
+    if key is None:
+        return sorted(items, key=lambda v: (v is None, str(v)))
+    return sorted(items, key=lambda v: (LiquidTemplate.lookup(v, key) is None, str(LiquidTemplate.lookup(v, key))))
+
+
+def liquid_where(value, key, target=None):
+    items = list(value or [])
+    if target is None:
+        return [v for v in items if liquid_truthy(LiquidTemplate.lookup(v, key))]
+    return [v for v in items if LiquidTemplate.lookup(v, key) == target or
+            (isinstance(LiquidTemplate.lookup(v, key), list) and target in LiquidTemplate.lookup(v, key))]
+
+
+def liquid_date_filter(value, fmt="%Y-%m-%d"):
+    moment = liquid_date(value)
+    return ruby_strftime(moment, fmt) if moment else value
+
+
+# Liquid and Jekyll filters used by common layouts; a few need the site
+LIQUID_FILTERS = {
+    'default': lambda v, d="", *a: d if v in (None, False, "") or v == [] else v,
+    'escape': lambda v: escape(LiquidTemplate.to_text(v)),
+    'xml_escape': lambda v: escape(LiquidTemplate.to_text(v)),
+    'escape_once': lambda v: escape(unescape(LiquidTemplate.to_text(v))),
+    'strip_html': lambda v: re.sub(r'<[^>]*>', '', LiquidTemplate.to_text(v)),
+    'strip_newlines': lambda v: LiquidTemplate.to_text(v).replace('\n', ''),
+    'newline_to_br': lambda v: LiquidTemplate.to_text(v).replace('\n', '<br />\n'),
+    'normalize_whitespace': lambda v: re.sub(r'\s+', ' ', LiquidTemplate.to_text(v)),
+    'strip': lambda v: LiquidTemplate.to_text(v).strip(),
+    'lstrip': lambda v: LiquidTemplate.to_text(v).lstrip(),
+    'rstrip': lambda v: LiquidTemplate.to_text(v).rstrip(),
+    'upcase': lambda v: LiquidTemplate.to_text(v).upper(),
+    'downcase': lambda v: LiquidTemplate.to_text(v).lower(),
+    'capitalize': lambda v: LiquidTemplate.to_text(v).capitalize(),
+    'append': lambda v, s="": LiquidTemplate.to_text(v) + LiquidTemplate.to_text(s),
+    'prepend': lambda v, s="": LiquidTemplate.to_text(s) + LiquidTemplate.to_text(v),
+    'remove': lambda v, s="": LiquidTemplate.to_text(v).replace(LiquidTemplate.to_text(s), ''),
+    'replace': lambda v, a="", b="": LiquidTemplate.to_text(v).replace(LiquidTemplate.to_text(a), LiquidTemplate.to_text(b)),
+    'replace_first': lambda v, a="", b="": LiquidTemplate.to_text(v).replace(LiquidTemplate.to_text(a), LiquidTemplate.to_text(b), 1),
+    'split': lambda v, s=" ": LiquidTemplate.to_text(v).split(s) if s else list(LiquidTemplate.to_text(v)),
+    'join': lambda v, s=" ": LiquidTemplate.to_text(s).join(LiquidTemplate.to_text(i) for i in (v or [])),
+    'size': lambda v: len(v) if hasattr(v, '__len__') else 0,
+    'first': lambda v: v[0] if v else None,
+    'last': lambda v: v[-1] if v else None,
+    'reverse': lambda v: list(reversed(v or [])),
+    'uniq': lambda v: list(dict.fromkeys(v or [])),
+    'compact': lambda v: [i for i in (v or []) if i is not None],
+    'map': lambda v, key: [LiquidTemplate.lookup(i, key) for i in (v or [])],
+    'sort': liquid_sort,
+    'where': liquid_where,
+    'truncate': liquid_truncate,
+    'truncatewords': liquid_truncatewords,
+    'plus': lambda v, n: (v or 0) + n,
+    'minus': lambda v, n: (v or 0) - n,
+    'times': lambda v, n: (v or 0) * n,
+    'divided_by': lambda v, n: (v or 0) // n if isinstance(n, int) and isinstance(v, int) else (v or 0) / n,
+    'modulo': lambda v, n: (v or 0) % n,
+    'date': liquid_date_filter,
+    'date_to_xmlschema': lambda v: liquid_date(v).isoformat() if liquid_date(v) else v,
+    'date_to_string': lambda v: ruby_strftime(liquid_date(v), "%d %b %Y") if liquid_date(v) else v,
+    'date_to_long_string': lambda v: ruby_strftime(liquid_date(v), "%d %B %Y") if liquid_date(v) else v,
+    'jsonify': lambda v: json.dumps(v, default=str, ensure_ascii=False),
+    'url_encode': lambda v: urllib.parse.quote_plus(LiquidTemplate.to_text(v)),
+    'cgi_escape': lambda v: urllib.parse.quote_plus(LiquidTemplate.to_text(v)),
+    'uri_escape': lambda v: urllib.parse.quote(LiquidTemplate.to_text(v), safe="/:?#[]@!$&'()*+,;="),
+    'slugify': lambda v, *a: jekyll_slugify(LiquidTemplate.to_text(v)),
+    'number_of_words': lambda v: len(LiquidTemplate.to_text(v).split()),
+    'smartify': lambda v: v,
+    'relative_url': lambda v, environment=None: liquid_join_url(environment.baseurl if environment else "", v),
+    'absolute_url': lambda v, environment=None: liquid_join_url(environment.absolute_base if environment else "", v),
+    'markdownify': lambda v, environment=None: environment.markdown(LiquidTemplate.to_text(v)) if environment else v,
+}
+ENVIRONMENT_FILTERS = {'relative_url', 'absolute_url', 'markdownify'}
+
+
+class SitePreview:
+    """Render a single page through the site's own layouts and includes
+    
+    Layouts and includes are looked up in the site first and then in the
+    theme gem, if Bundler can locate it. Parsed templates are cached until
+    their files change, so a preview costs one Markdown render plus a
+    layout walk instead of a Jekyll build.
+    """
+    
+    # Stylesheets of common gem themes, used when the theme's head.html can't be found
+    THEME_STYLESHEETS = {'minima': '/assets/main.css'}
+    DEFAULT_STYLESHEET = '/assets/css/style.css'
+    
+    def __init__(self, core, renderer):
+        self.core = core
+        self.renderer = renderer
+        self.root_dir = core.root_dir
+        self.templates = {}
+        self.data_cache = {}
+        self.theme_dir = None
+        self.theme_checked = False
+        self.baseurl = ""
+        self.absolute_base = ""
+        self.lock = threading.RLock()
+    
+    def config(self):
+        return self.core.site_config()
+    
+    def theme_path(self):
+        """Directory of the theme gem via `bundle info --path`, looked up once"""
+        if not self.theme_checked:
+            self.theme_checked = True
+            theme = self.config().get('theme')
+            if theme:
+                try:
+                    result = subprocess.run(["bundle", "info", "--path", str(theme)], cwd=self.root_dir,
+                                            capture_output=True, text=True, timeout=20)
+                    path = Path(result.stdout.strip().splitlines()[-1]) if result.returncode == 0 and result.stdout.strip() else None
+                    self.theme_dir = path if path and path.is_dir() else None
+                except (OSError, subprocess.SubprocessError):
+                    self.theme_dir = None
+        return self.theme_dir
+    
+    def find(self, folder, name):
+        for base in (self.root_dir, self.theme_path()):
+            if base is not None and (base / folder / name).is_file():
+                return base / folder / name
+        return None
+    
+    def template(self, path):
+        """Return (front matter dict, LiquidTemplate) for a file, cached on mtime"""
+        mtime = path.stat().st_mtime_ns
+        with self.lock:
+            cached = self.templates.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1], cached[2]
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        meta = {}
+        match = FRONT_MATTER_RE.match(text)
+        if match:
+            front_matter = parse_front_matter(match.group(1))
+            meta = dict(front_matter.extra, layout=front_matter.layout)
+            text = text[match.end():]
+        parsed = LiquidTemplate(text, name=path.name)
+        with self.lock:
+            self.templates[path] = (mtime, meta, parsed)
+        return meta, parsed
+    
+    def data(self):
+        """site.data from _data/*.yml|yaml|json"""
+        data = {}
+        data_dir = self.root_dir / "_data"
+        if not data_dir.is_dir():
+            return data
+        yaml = require('yaml', 'pyyaml')
+        for path in sorted(data_dir.iterdir()):
+            if path.suffix not in ('.yml', '.yaml', '.json'):
+                continue
+            mtime = path.stat().st_mtime_ns
+            cached = self.data_cache.get(path)
+            if not cached or cached[0] != mtime:
+                with open(path, 'r', encoding='utf-8') as f:
+                    value = json.load(f) if path.suffix == '.json' else yaml.load(f, Loader=front_matter_loader())
+                cached = self.data_cache[path] = (mtime, value)
+            data[path.stem] = cached[1]
+        return data
+    
+    @staticmethod
+    def post_title(path, meta):
+        """A post's title, or the one Jekyll derives from its filename"""
+        match = re.match(r'\d{4}-\d{2}-\d{2}-(.+)$', Path(path).stem)
+        return meta.title or jekyll_titleize(match.group(1) if match else Path(path).stem)
+    
+    def post_record(self, path, meta):
+        # Missing keys are nil in Liquid, not empty strings
+        return dict(meta.extra, title=self.post_title(path, meta), date=liquid_date(meta.date) or meta.date,
+                    url=self.core.post_url(path, meta), description=meta.description or None,
+                    categories=meta.categories.split(), tags=meta.tags,
+                    layout=meta.layout or 'post', path=self.core.repo_path(path), excerpt="")
+    
+    def site_context(self):
+        """site.* variables; site.posts is only built when a template asks for it"""
+        preview = self
+        
+        class Site(dict):
+            def __missing__(self, key):
+                if key == 'posts':
+                    # Like Jekyll, leave out unpublished posts and future ones unless `future: true`
+                    value = [preview.post_record(p, m) for p, m in preview.core.list_posts()
+                             if preview.core.is_published(p, m)]
+                elif key == 'data':
+                    value = preview.data()
+                elif key in ('categories', 'tags'):
+                    value = {}
+                    for post in self['posts']:
+                        for name in post[key]:
+                            value.setdefault(name, []).append(post)
+                else:
+                    raise KeyError(key)
+                self[key] = value
+                return value
+        
+        config = self.config()
+        site = Site(config)
+        site.setdefault('time', datetime.now())
+        site.setdefault('pages', [])
+        return site
+    
+    def default_layout(self, is_post):
+        """Layout from _config.yml `defaults` for posts or pages, else Jekyll's convention"""
+        kind = 'posts' if is_post else 'pages'
+        for default in self.config().get('defaults') or []:
+            scope = default.get('scope') or {}
+            layout = (default.get('values') or {}).get('layout')
+            if layout and scope.get('type', kind) == kind:
+                return layout
+        return 'post' if is_post else 'page'
+    
+    def markdown(self, text):
+        return self.renderer.render(text)
+    
+    def render_include(self, name, context, params):
+        path = self.find("_includes", name)
+        if path is None:
+            return ""
+        _, parsed = self.template(path)
+        scope = dict(context)
+        scope['include'] = params
+        return parsed.render(scope, self)
+    
+    @traced('preview.site')
+    def render(self, meta, body, path=None, is_post=True, content_markers=None):
+        """Render front matter and Markdown body to a complete HTML page
+        
+        content_markers, a (start, end) pair of strings, is placed around
+        the page body so a live preview can swap just that part.
+        """
+        config = self.config()
+        self.baseurl = str(config.get('baseurl') or "")
+        self.absolute_base = str(config.get('url') or "") + self.baseurl
+        
+        title = self.post_title(path, meta) if is_post and path is not None else meta.title
+        page = dict(meta.extra, title=title or None, description=meta.description or None, layout=meta.layout,
+                    categories=meta.categories.split(), tags=meta.tags, content="")
+        page['date'] = liquid_date(meta.date) or meta.date or datetime.now()
+        if path is not None:
+            page['path'] = self.core.repo_path(path)
+            page['url'] = self.core.post_url(path, meta) if is_post else "/" + Path(path).stem + "/"
+        page['url'] = meta.extra.get('permalink', page.get('url', "/"))
+        
+        context = {'site': self.site_context(), 'page': page, 'layout': {}, 'paginator': None, 'jekyll': {'environment': 'development'}}
+        
+        # Jekyll renders Liquid in the body before converting Markdown
+        if '{{' in body or '{%' in body:
+            body = LiquidTemplate(body, name=str(path or 'post')).render(context, self)
+        content = self.markdown(body)
+        if content_markers:
+            content = content_markers[0] + content + content_markers[1]
+        
+        layout = meta.layout or self.default_layout(is_post)
+        seen = set()
+        while layout and layout not in ('null', 'none') and layout not in seen:
+            seen.add(layout)
+            layout_path = self.find("_layouts", f"{layout}.html")
+            if layout_path is None:
+                # A theme layout we can't see: fall back to the site's base layout
+                layout = 'default' if 'default' not in seen else None
+                continue
+            layout_meta, parsed = self.template(layout_path)
+            context['layout'] = layout_meta
+            context['content'] = content
+            page['content'] = content
+            content = parsed.render(context, self)
+            layout = layout_meta.get('layout')
+        return self.ensure_head(content, page)
+    
+    def ensure_head(self, html_page, page):
+        """Add a minimal <head> when the theme's head include isn't available locally"""
+        if re.search(r'<head[\s>]', html_page, re.IGNORECASE):
+            return html_page
+        
+        stylesheet = self.THEME_STYLESHEETS.get(str(self.config().get('theme')), self.DEFAULT_STYLESHEET)
+        head = (f'<head><meta charset="utf-8"><title>{escape(str(page.get("title") or "Preview"))}</title>'
+                f'<link rel="stylesheet" href="{liquid_join_url(self.baseurl, stylesheet)}"></head>')
+        if re.search(r'<html[^>]*>', html_page, re.IGNORECASE):
+            return re.sub(r'(<html[^>]*>)', lambda m: m.group(1) + head, html_page, count=1, flags=re.IGNORECASE)
+        return f'<!DOCTYPE html>\n<html>{head}<body>{html_page}</body></html>'
+
+
+class LivePreviewHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the preview page, its event stream and the site's static files"""
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        preview = self.server.preview
+        path = urllib.parse.urlsplit(self.path).path
+        if path in ('/', '/index.html'):
+            self.send_body(preview.page.encode('utf-8'), 'text/html; charset=utf-8', cache=False)
+        elif path == preview.EVENTS_PATH:
+            self.stream_events()
+        else:
+            self.send_static(urllib.parse.unquote(path))
+    
+    def send_body(self, data, content_type, cache=True):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        if not cache:
+            self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def send_static(self, path):
+        """Files from _site, then the source tree; anything else comes from the live site"""
+        preview = self.server.preview
+        relative = path.lstrip('/')
+        for base in (preview.root_dir / "_site", preview.root_dir):
+            candidate = (base / relative).resolve()
+            if candidate.is_dir():
+                candidate = candidate / "index.html"
+            inside = base.resolve() in candidate.parents
+            hidden = any(part.startswith(('.', '_')) for part in Path(relative).parts) and base == preview.root_dir
+            if inside and not hidden and candidate.is_file():
+                content_type = mimetypes.guess_type(candidate.name)[0] or 'application/octet-stream'
+                self.send_body(candidate.read_bytes(), content_type)
+                return
+        
+        site_url = str(preview.site_preview.config().get('url') or "")
+        if site_url:
+            self.send_response(302)
+            self.send_header('Location', site_url.rstrip('/') + path)
+            self.end_headers()
+        else:
+            self.send_error(404)
+    
+    def stream_events(self):
+        preview = self.server.preview
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        client = preview.connect(int(query.get('v', ['0'])[0] or 0))
+        try:
+            while True:
+                try:
+                    message = client.get(timeout=preview.KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    message = ": keepalive\n\n"
+                if message is None:
+                    return
+                self.wfile.write(message.encode('utf-8'))
+                self.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            preview.disconnect(client)
+
+
+class LivePreviewServer:
+    """In-process HTTP preview of the editor's page with Server-Sent Events live reload
+    
+    The browser stays on one URL. Each update is rendered on a background
+    thread; when only the post body changed, just that HTML is pushed and
+    swapped in place, otherwise the page is told to reload.
+    """
+    
+    EVENTS_PATH = '/__preview/events'
+    CONTENT_MARKERS = ('<!--preview-content-->', '<!--/preview-content-->')
+    KEEPALIVE_SECONDS = 15
+    CLIENT_SCRIPT = """<script>
+(function () {
+  var source = new EventSource("%(events)s?v=%(version)d");
+  function bodyRange() {
+    var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_COMMENT), start = null, node;
+    while ((node = walker.nextNode())) {
+      if (node.nodeValue === "%(start)s") { start = node; }
+      else if (node.nodeValue === "%(end)s" && start) {
+        var range = document.createRange();
+        range.setStartAfter(start);
+        range.setEndBefore(node);
+        return range;
+      }
+    }
+    return null;
+  }
+  source.addEventListener("content", function (event) {
+    var range = bodyRange();
+    if (!range) { location.reload(); return; }
+    range.deleteContents();
+    range.insertNode(range.createContextualFragment(JSON.parse(event.data).html));
+  });
+  source.addEventListener("page", function () { location.reload(); });
+})();
+</script>"""
+    
+    def __init__(self, site_preview, host="127.0.0.1", port=0):
+        self.site_preview = site_preview
+        self.root_dir = site_preview.root_dir
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.page = "<!DOCTYPE html><html><body>Nothing to preview yet</body></html>"
+        self.version = 0
+        self.layout_key = None
+        self.clients = set()
+        self._pending = None
+        self._stopped = False
+        self._condition = threading.Condition()
+    
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+    
+    def start(self):
+        self.httpd = http.server.ThreadingHTTPServer((self.host, self.port), LivePreviewHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.preview = self
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, name="preview-http", daemon=True).start()
+        threading.Thread(target=self._render_loop, name="preview-site-render", daemon=True).start()
+        return self
+    
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+            for client in list(self.clients):
+                client.put(None)
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+    
+    def connect(self, version):
+        client = queue.Queue()
+        with self._condition:
+            self.clients.add(client)
+            # The page changed between being served and subscribing
+            if version != self.version:
+                client.put(self.event('page', {'version': self.version}))
+        return client
+    
+    def disconnect(self, client):
+        with self._condition:
+            self.clients.discard(client)
+    
+    @staticmethod
+    def event(name, data):
+        return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+    
+    def update(self, meta, body, path=None, is_post=True):
+        """Queue a re-render; only the newest request is rendered"""
+        with self._condition:
+            self._pending = (meta, body, path, is_post)
+            self._condition.notify()
+    
+    def render_now(self, meta, body, path=None, is_post=True):
+        """Render synchronously, pushing the result to any open pages"""
+        page = self.site_preview.render(meta, body, path=path, is_post=is_post,
+                                        content_markers=self.CONTENT_MARKERS)
+        start, end = self.CONTENT_MARKERS
+        head, _, rest = page.partition(start)
+        content, _, tail = rest.partition(end)
+        
+        with self._condition:
+            self.version += 1
+            script = self.CLIENT_SCRIPT % {'events': self.EVENTS_PATH, 'version': self.version,
+                                           'start': start[4:-3], 'end': end[4:-3]}
+            if re.search(r'</body>', page, re.IGNORECASE):
+                self.page = re.sub(r'</body>', lambda m: script + m.group(0), page, count=1, flags=re.IGNORECASE)
+            else:
+                self.page = page + script
+            
+            layout_key = (head, tail)
+            name, data = ('content', {'version': self.version, 'html': content}) if layout_key == self.layout_key \
+                else ('page', {'version': self.version})
+            self.layout_key = layout_key
+            message = self.event(name, data)
+            for client in self.clients:
+                client.put(message)
+    
+    def _render_loop(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                request = self._pending
+                self._pending = None
+            
+            try:
+                self.render_now(*request)
+            except Exception as e:
+                print(f"⚠ Browser preview render failed: {e}")
+
+
+class PreviewWorker:
+    """Background thread that renders only the newest preview request
+    
+    `submit` replaces any request still waiting and cancels the one in
+    progress; finished renders are put on `results` as
+    (generation, html, error, seconds) for the Tk thread to pick up.
+    """
+    
+    def __init__(self, render):
+        self.render = render
+        self.results = queue.Queue()
+        self.generation = 0
+        self._pending = None
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="preview-render", daemon=True)
+        self._thread.start()
+    
+    def submit(self, text):
+        """Queue text for rendering and return its generation number"""
+        with self._condition:
+            self.generation += 1
+            self._pending = (self.generation, text)
+            self._condition.notify()
+            return self.generation
+    
+    def cancel(self):
+        """Drop the waiting request and discard the render in progress"""
+        with self._condition:
+            self.generation += 1
+            self._pending = None
+    
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, text = self._pending
+                self._pending = None
+            
+            started = time.perf_counter()
+            try:
+                html = self.render(text, cancelled=lambda: generation != self.generation)
+                error = None
+            except RenderCancelled:
+                continue
+            except Exception as e:
+                html, error = None, e
+            
+            if generation == self.generation:
+                self.results.put((generation, html, error, time.perf_counter() - started))
+
+
+class AdaptiveDebounce:
+    """Debounce interval that tracks recent render times
+    
+    The interval is `factor` times a moving average of render durations,
+    clamped between `floor_ms` and `ceiling_ms`.
+    """
+    
+    def __init__(self, factor=3.0, floor_ms=75, ceiling_ms=2500, smoothing=0.3):
+        self.factor = factor
+        self.floor_ms = floor_ms
+        self.ceiling_ms = ceiling_ms
+        self.smoothing = smoothing
+        self.average_ms = None
+    
+    def record(self, duration_ms):
+        """Fold a measured render time into the moving average"""
+        if self.average_ms is None:
+            self.average_ms = duration_ms
+        else:
+            self.average_ms += self.smoothing * (duration_ms - self.average_ms)
+    
+    @property
+    def interval_ms(self):
+        if self.average_ms is None:
+            return self.floor_ms
+        return int(min(self.ceiling_ms, max(self.floor_ms, self.factor * self.average_ms)))
+
+
+class VirtualListView:
+    """Scrollable list that only materializes the rows currently in view
+    
+    `items` is any sequence of records; `format_row` renders a record as a
+    row and `key` maps it to a stable id, so the selection survives
+    scrolling and refiltering without searching the underlying data.
+    """
+    
+    def __init__(self, parent, format_row, key, on_select=None, font=None):
+        self.format_row = format_row
+        self.key = key
+        self.on_select = on_select
+        self.items = []
+        self.top = 0
+        self.rows = 1
+        self.selected = None
+        self._selected_index = None
+        
+        self.frame = ttk.Frame(parent)
+        self.scrollbar = ttk.Scrollbar(self.frame, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.listbox = tk.Listbox(self.frame, font=font, exportselection=False, activestyle=tk.NONE)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        line_font = tkfont.Font(font=self.listbox.cget('font'))
+        self.row_height = line_font.metrics('linespace') + 2 * int(self.listbox.cget('selectborderwidth'))
+        self.inset = 2 * (int(self.listbox.cget('borderwidth')) + int(self.listbox.cget('highlightthickness')))
+        
+        self.listbox.bind('<Configure>', self.on_resize)
+        self.listbox.bind('<<ListboxSelect>>', self.on_listbox_select)
+        self.listbox.bind('<MouseWheel>', self.on_mousewheel)
+        self.listbox.bind('<Button-4>', lambda e: self.scroll_to(self.top - 3) or 'break')
+        self.listbox.bind('<Button-5>', lambda e: self.scroll_to(self.top + 3) or 'break')
+        self.listbox.bind('<Up>', lambda e: self.move_selection(-1))
+        self.listbox.bind('<Down>', lambda e: self.move_selection(1))
+        self.listbox.bind('<Prior>', lambda e: self.move_selection(-self.rows))
+        self.listbox.bind('<Next>', lambda e: self.move_selection(self.rows))
+        self.listbox.bind('<Home>', lambda e: self.move_selection(-len(self.items)))
+        self.listbox.bind('<End>', lambda e: self.move_selection(len(self.items)))
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def set_items(self, items):
+        """Replace the displayed records, keeping the scroll position where possible"""
+        self.items = items
+        self._selected_index = None
+        self.scroll_to(self.top, force=True)
+    
+    def refresh(self):
+        """Re-render the visible rows after the records changed in place"""
+        self._selected_index = None
+        self.scroll_to(self.top, force=True)
+    
+    def scroll_to(self, top, force=False):
+        """Scroll so that item `top` is the first visible row"""
+        top = max(0, min(top, len(self.items) - self.rows))
+        if top != self.top or force:
+            self.top = top
+            self.render()
+    
+    def render(self):
+        """Materialize only the rows inside the viewport"""
+        window = self.items[self.top:self.top + self.rows]
+        self.listbox.delete(0, tk.END)
+        if window:
+            self.listbox.insert(tk.END, *[self.format_row(item) for item in window])
+        
+        if self.selected is not None:
+            for row, item in enumerate(window):
+                if self.key(item) == self.selected:
+                    self.listbox.selection_set(row)
+                    self.listbox.activate(row)
+                    break
+        
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def yview(self, *args):
+        """Scrollbar protocol: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * len(self.items)))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.rows
+            self.scroll_to(self.top + amount)
+    
+    def on_resize(self, event):
+        rows = max(1, (event.height - self.inset) // self.row_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.scroll_to(self.top, force=True)
+    
+    def on_mousewheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        if abs(event.delta) >= 120:
+            step *= abs(event.delta) // 120 * 3
+        self.scroll_to(self.top + step)
+        return 'break'
+    
+    def on_listbox_select(self, event=None):
+        selection = self.listbox.curselection()
+        if not selection or self.top + selection[0] >= len(self.items):
+            return
+        self.select_index(self.top + selection[0])
+    
+    def selected_index(self):
+        """Return the position of the selected record in items, or None"""
+        index = self._selected_index
+        if index is not None and index < len(self.items) and self.key(self.items[index]) == self.selected:
+            return index
+        
+        self._selected_index = None
+        if self.selected is not None:
+            for i, item in enumerate(self.items):
+                if self.key(item) == self.selected:
+                    self._selected_index = i
+                    break
+        return self._selected_index
+    
+    def select_index(self, index):
+        """Select the record at index, scrolling it into view"""
+        self.selected = self.key(self.items[index])
+        self._selected_index = index
+        if index < self.top:
+            self.scroll_to(index, force=True)
+        elif index >= self.top + self.rows:
+            self.scroll_to(index - self.rows + 1, force=True)
+        else:
+            self.render()
+        
+        if self.on_select:
+            self.on_select()
+    
+    def move_selection(self, delta):
+        if self.items:
+            current = self.selected_index()
+            index = self.top if current is None else current + delta
+            self.select_index(max(0, min(index, len(self.items) - 1)))
+        return 'break'
+
+
+class Autocomplete:
+    """Suggestion popup for an Entry holding separated names
+    
+    `suggest(prefix, exclude)` returns (name, count) pairs for the name
+    under the cursor; names already in the entry are passed as `exclude`.
+    Up/Down move through the popup, Tab or Return accepts and Escape
+    closes it. `on_accept` runs after a suggestion is inserted.
+    """
+    
+    MAX_ROWS = 8
+    NAVIGATION_KEYS = {'Up', 'Down', 'Tab', 'Return', 'Escape', 'Shift_L', 'Shift_R',
+                       'Control_L', 'Control_R', 'Alt_L', 'Alt_R'}
+    
+    def __init__(self, entry, suggest, separator=",", on_accept=None):
+        self.entry = entry
+        self.suggest = suggest
+        self.separator = separator
+        self.on_accept = on_accept
+        self.matches = []
+        self.popup = None
+        self.listbox = None
+        
+        entry.bind('<KeyRelease>', self.on_key, add='+')
+        entry.bind('<Down>', lambda e: self.move(1))
+        entry.bind('<Up>', lambda e: self.move(-1))
+        entry.bind('<Tab>', self.on_accept_key)
+        entry.bind('<Return>', self.on_accept_key)
+        entry.bind('<Escape>', lambda e: self.close())
+        entry.bind('<FocusOut>', lambda e: entry.after(150, self.close))
+    
+    def token_bounds(self):
+        """(start, end) of the name under the cursor, excluding padding"""
+        text = self.entry.get()
+        cursor = self.entry.index(tk.INSERT)
+        start = text.rfind(self.separator, 0, cursor) + 1
+        end = text.find(self.separator, cursor)
+        end = len(text) if end < 0 else end
+        while start < cursor and text[start].isspace():
+            start += 1
+        return start, end
+    
+    def on_key(self, event):
+        if event.keysym in self.NAVIGATION_KEYS:
+            return
+        text = self.entry.get()
+        start, end = self.token_bounds()
+        prefix = text[start:self.entry.index(tk.INSERT)]
+        if not prefix.strip():
+            self.close()
+            return
+        
+        others = [t for t in (text[:start] + text[end:]).split(self.separator) if t.strip()]
+        self.matches = [m for m in self.suggest(prefix, others) if m[0] != text[start:end].strip()]
+        if self.matches:
+            self.show()
+        else:
+            self.close()
+    
+    def show(self):
+        if self.popup is None:
+            self.popup = tk.Toplevel(self.entry)
+            self.popup.overrideredirect(True)
+            self.listbox = tk.Listbox(self.popup, exportselection=False, activestyle=tk.NONE)
+            self.listbox.pack(fill=tk.BOTH, expand=True)
+            self.listbox.bind('<Button-1>', self.on_click)
+        
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *[f"{name}  ({count})" for name, count in self.matches])
+        self.listbox.config(height=min(len(self.matches), self.MAX_ROWS))
+        self.listbox.selection_set(0)
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        self.popup.geometry(f"+{x}+{y}")
+        self.popup.lift()
+    
+    def close(self):
+        if self.popup is not None:
+            self.popup.destroy()
+            self.popup = None
+            self.listbox = None
+        return 'break'
+    
+    def move(self, delta):
+        if self.popup is None:
+            return None
+        selection = self.listbox.curselection()
+        index = max(0, min((selection[0] if selection else -1) + delta, len(self.matches) - 1))
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return 'break'
+    
+    def on_click(self, event):
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(self.listbox.nearest(event.y))
+        self.accept()
+        return 'break'
+    
+    def on_accept_key(self, event):
+        if self.popup is None:
+            return None
+        self.accept()
+        return 'break'
+    
+    def accept(self):
+        """Replace the name under the cursor with the selected suggestion"""
+        selection = self.listbox.curselection() if self.listbox else ()
+        if not selection:
+            return
+        name = self.matches[selection[0]][0]
+        text = self.entry.get()
+        start, end = self.token_bounds()
+        
+        tail = text[end:]
+        if tail.strip():
+            replacement = name
+        else:
+            # Leave the cursor ready for the next name
+            replacement, tail = name + self.separator.strip() + " ", ""
+        self.entry.delete(start, tk.END)
+        self.entry.insert(start, replacement + tail)
+        self.entry.icursor(start + len(replacement))
+        self.close()
+        if self.on_accept:
+            self.on_accept()
+
+
+MD_FENCE_RE = re.compile(r' {0,3}(`{3,}|~{3,})')
+MD_HEADING_RE = re.compile(r' {0,3}#{1,6}(?:\s|$)')
+MD_RULE_RE = re.compile(r' {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+MD_QUOTE_RE = re.compile(r' {0,3}>')
+MD_LIST_RE = re.compile(r'\s*([-*+]|\d{1,9}[.)])(?=\s|$)')
+MD_INLINE_RE = re.compile(
+    r'(?P<code>(?P<ticks>`+).+?(?P=ticks))'
+    r'|(?P<link>!?\[[^\]\n]*\])(?P<url>\([^)\n]*\))'
+    r'|(?P<bold>(?P<strong>\*\*|__)(?=\S).+?(?<=\S)(?P=strong))'
+    r'|(?P<italic>(?<![\w*])\*(?![\s*]).*?(?<![\s*])\*(?![\w*])|(?<!\w)_(?![\s_]).*?(?<![\s_])_(?!\w))'
+    r'|(?P<html><!--.*?-->|</?[A-Za-z][^>\n]*>)'
+)
+
+
+def markdown_fence_after(line, fence=""):
+    """Code fence open after `line`, given the fence open before it ("" for none)"""
+    match = MD_FENCE_RE.match(line)
+    if fence:
+        if (match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence)
+                and not line[match.end():].strip()):
+            return ""
+        return fence
+    if match and not (match.group(1)[0] == '`' and '`' in line[match.end():]):
+        return match.group(1)
+    return ""
+
+
+def markdown_line_spans(line, fence=""):
+    """Highlight spans (tag, start, end) for one line of Markdown
+    
+    `fence` is the code fence open at the start of the line. Spans tagged
+    md_code_block or md_fence cover the whole line.
+    """
+    after = markdown_fence_after(line, fence)
+    if fence:
+        return [('md_code_block' if after else 'md_fence', 0, len(line))]
+    if after:
+        return [('md_fence', 0, len(line))]
+    if MD_HEADING_RE.match(line):
+        return [('md_heading', 0, len(line))]
+    if MD_RULE_RE.match(line):
+        return [('md_rule', 0, len(line))]
+    
+    spans = []
+    if MD_QUOTE_RE.match(line):
+        spans.append(('md_quote', 0, len(line)))
+    else:
+        match = MD_LIST_RE.match(line)
+        if match:
+            spans.append(('md_list', match.start(1), match.end(1)))
+    
+    for match in MD_INLINE_RE.finditer(line):
+        if match.group('link'):
+            spans.append(('md_link', *match.span('link')))
+            spans.append(('md_url', *match.span('url')))
+        else:
+            kind = next(k for k in ('code', 'bold', 'italic', 'html') if match.group(k))
+            spans.append((f'md_{kind}', *match.span()))
+    return spans
+
+
+class TextEditHook:
+    """Reports every insert and delete on a Text widget by line
+    
+    The widget's Tcl command is routed through dispatch, the way idlelib's
+    WidgetRedirector does it, so typing, undo and programmatic edits are
+    all seen. Subscribers get edited(line, removed, added): the edit
+    started on `line`, and the `removed` lines after it were replaced by
+    `added` new ones. reset(lines) means "re-read everything"; `lines` is
+    the new content when the caller already has it. call() runs a widget
+    command without notification, for bulk loads between suspend() and
+    resume().
+    """
+    
+    def __init__(self, text):
+        self.text = text
+        self.subscribers = []
+        self.suspended = False
+        self.orig = text._w + "_orig"
+        text.tk.call("rename", text._w, self.orig)
+        text.tk.createcommand(text._w, self.dispatch)
+    
+    def subscribe(self, subscriber):
+        self.subscribers.append(subscriber)
+    
+    def call(self, *args):
+        return self.text.tk.call((self.orig,) + args)
+    
+    def line_of(self, index):
+        return int(str(self.call('index', index)).split('.')[0])
+    
+    def line_count(self):
+        return self.line_of('end-1c')
+    
+    def dispatch(self, command, *args):
+        try:
+            if command not in ('insert', 'delete', 'replace') or self.suspended:
+                return self.call(command, *args)
+            
+            count = self.line_count()
+            line = min(self.line_of(args[0]), count)
+            if command == 'insert':
+                removed, added = 0, sum(str(chars).count('\n') for chars in args[1::2])
+            elif command == 'replace':
+                removed = min(self.line_of(args[1]), count) - line
+                added = sum(str(chars).count('\n') for chars in args[2::2])
+            elif len(args) <= 2:
+                removed, added = min(self.line_of(args[1] if len(args) > 1 else f"{args[0]}+1c"), count) - line, 0
+            else:
+                removed = added = None
+            
+            result = self.call(command, *args)
+            # Multi-range deletes, or edits a disabled widget ignored
+            if removed is None or removed < 0 or self.line_count() - count != added - removed:
+                self.reset()
+            else:
+                for subscriber in self.subscribers:
+                    subscriber.edited(line, removed, added)
+            return result
+        except tk.TclError:
+            return ""
+    
+    def reset(self, lines=None):
+        for subscriber in self.subscribers:
+            subscriber.reset(lines)
+    
+    def suspend(self):
+        self.suspended = True
+    
+    def resume(self, lines=None):
+        self.suspended = False
+        self.reset(lines)
+
+
+class EditorDocument:
+    """Python-side copy of a Text widget's lines, kept current from edit notifications
+    
+    Saving and previewing read from here instead of copying the whole
+    buffer out of Tk; each edit re-reads only the lines it touched.
+    `version` increases with every change.
+    """
+    
+    def __init__(self, hook):
+        self.hook = hook
+        self.lines = [""]
+        self.version = 0
+        hook.subscribe(self)
+        self.reset()
+    
+    def __len__(self):
+        return len(self.lines)
+    
+    def edited(self, line, removed, added):
+        new = str(self.hook.call('get', f"{line}.0", f"{line + added}.end")).split('\n')
+        self.lines[line - 1:line + removed] = new
+        self.version += 1
+    
+    def reset(self, lines=None):
+        if lines is None:
+            lines = str(self.hook.call('get', '1.0', 'end-1c')).split('\n')
+        self.lines = lines
+        self.version += 1
+    
+    def text(self, start=0, end=None):
+        """Lines [start:end] joined, without the trailing newline Tk keeps"""
+        return "\n".join(self.lines[start:end])
+
+
+class MarkdownHighlighter:
+    """Incremental Markdown highlighting for a Text widget
+    
+    Edits arrive line by line from a TextEditHook. Each line keeps the
+    code fence open at its start: an edit re-lexes its own lines and later lines only while
+    their fence state actually changes, so typing inside a long post
+    stays local. Tags are applied to dirty lines in or near the viewport,
+    at most MAX_LINES_PER_PASS per pass; other lines wait until they are
+    scrolled into view.
+    """
+    
+    MARGIN_LINES = 40
+    MAX_LINES_PER_PASS = 400
+    MAX_STATE_LINES = 20000
+    STATE_CHUNK = 500
+    TAGS = ('md_heading', 'md_bold', 'md_italic', 'md_code', 'md_code_block', 'md_fence',
+            'md_link', 'md_url', 'md_quote', 'md_list', 'md_rule', 'md_html')
+    FULL_LINE_TAGS = ('md_code_block', 'md_fence')
+    
+    def __init__(self, text, hook):
+        self.text = text
+        self.hook = hook
+        self.fences = []
+        self.dirty = set()
+        self.stale_from = None
+        self.stale_until = 0
+        self._pass_id = None
+        self.configure_tags()
+        hook.subscribe(self)
+        
+        scrollbar = getattr(text, 'vbar', None)
+        
+        def on_scroll(first, last):
+            if scrollbar is not None:
+                scrollbar.set(first, last)
+            self.schedule()
+        
+        text.configure(yscrollcommand=on_scroll)
+        text.bind('<Configure>', lambda e: self.schedule(), add='+')
+        self.reset()
+    
+    def configure_tags(self):
+        base = tkfont.Font(font=self.text.cget('font')).actual()
+        self.fonts = {
+            'bold': tkfont.Font(**dict(base, weight='bold')),
+            'italic': tkfont.Font(**dict(base, slant='italic')),
+        }
+        self.text.tag_configure('md_heading', foreground="#0b5394", font=self.fonts['bold'])
+        self.text.tag_configure('md_bold', font=self.fonts['bold'])
+        self.text.tag_configure('md_italic', font=self.fonts['italic'])
+        self.text.tag_configure('md_code', foreground="#c7254e", background="#f6f8fa")
+        self.text.tag_configure('md_code_block', background="#f6f8fa")
+        self.text.tag_configure('md_fence', foreground="#8a8a8a", background="#f6f8fa")
+        self.text.tag_configure('md_link', foreground="#1a73e8")
+        self.text.tag_configure('md_url', foreground="#8a8a8a")
+        self.text.tag_configure('md_quote', foreground="#6a737d", font=self.fonts['italic'])
+        self.text.tag_configure('md_list', foreground="#d73a49")
+        self.text.tag_configure('md_rule', foreground="#8a8a8a")
+        self.text.tag_configure('md_html', foreground="#22863a")
+        # Selection stays visible over highlighted backgrounds
+        self.text.tag_raise(tk.SEL)
+    
+    def call(self, *args):
+        return self.hook.call(*args)
+    
+    def line_of(self, index):
+        return self.hook.line_of(index)
+    
+    def line_count(self):
+        return self.hook.line_count()
+    
+    def edited(self, line, removed, added):
+        """Mark the edited lines dirty and shift state for the lines after them"""
+        self.fences[line + 1:line + 1 + removed] = [None] * added
+        delta = added - removed
+        if removed or added:
+            self.dirty = {n if n <= line else n + delta for n in self.dirty
+                          if n <= line or n > line + removed}
+            if self.stale_until > line + removed:
+                self.stale_until += delta
+        self.dirty.update(range(line, line + added + 1))
+        self.stale_from = line if self.stale_from is None else min(self.stale_from, line)
+        self.stale_until = max(self.stale_until, line + added)
+        self.schedule()
+    
+    def reset(self, lines=None):
+        """Forget all state and re-highlight from scratch"""
+        count = len(lines) if lines is not None else self.line_count()
+        self.fences = [None, ""] + [None] * count
+        self.dirty = set(range(1, count + 1))
+        self.stale_from = 1
+        self.stale_until = count
+        self.schedule()
+    
+    def schedule(self):
+        if self._pass_id is None:
+            self._pass_id = self.text.after_idle(self.highlight_pass)
+    
+    def update_fences(self, count):
+        """Recompute fence states from stale_from until they stop changing"""
+        budget = self.MAX_STATE_LINES
+        line = self.stale_from
+        while line <= count and budget > 0:
+            end = min(count, line + self.STATE_CHUNK - 1, line + budget - 1)
+            for text in str(self.call('get', f"{line}.0", f"{end}.end")).split('\n'):
+                after = markdown_fence_after(text, self.fences[line])
+                if self.fences[line + 1] == after and line >= self.stale_until:
+                    self.stale_from = None
+                    return
+                if self.fences[line + 1] != after:
+                    self.fences[line + 1] = after
+                    if line < count:
+                        self.dirty.add(line + 1)
+                line += 1
+                budget -= 1
+        self.stale_from = line if line <= count else None
+    
+    @traced('editor.highlight')
+    def highlight_pass(self):
+        """Update fence states, then tag dirty lines around the viewport"""
+        self._pass_id = None
+        if self.hook.suspended:
+            return
+        count = self.line_count()
+        if len(self.fences) != count + 2:
+            self.reset()
+            return
+        
+        if self.stale_from is not None:
+            self.update_fences(count)
+        
+        first = max(1, self.line_of('@0,0') - self.MARGIN_LINES)
+        last = min(count, self.line_of(f"@0,{self.text.winfo_height()}") + self.MARGIN_LINES)
+        if self.stale_from is not None:
+            last = min(last, self.stale_from - 1)
+        lines = [n for n in range(first, last + 1) if n in self.dirty][:self.MAX_LINES_PER_PASS]
+        if lines:
+            self.tag_lines(lines)
+        
+        if self.stale_from is not None or len(lines) == self.MAX_LINES_PER_PASS:
+            self._pass_id = self.text.after(1, self.highlight_pass)
+    
+    def tag_lines(self, lines):
+        """Re-tag the given lines (ascending) in contiguous runs"""
+        runs = []
+        for line in lines:
+            if runs and runs[-1][1] == line - 1:
+                runs[-1][1] = line
+            else:
+                runs.append([line, line])
+        
+        ranges = {tag: [] for tag in self.TAGS}
+        for start, end in runs:
+            for tag in self.TAGS:
+                self.call('tag', 'remove', tag, f"{start}.0", f"{end + 1}.0")
+            texts = str(self.call('get', f"{start}.0", f"{end}.end")).split('\n')
+            for line, text in zip(range(start, end + 1), texts):
+                for tag, a, b in markdown_line_spans(text, self.fences[line]):
+                    if tag in self.FULL_LINE_TAGS:
+                        ranges[tag] += [f"{line}.0", f"{line + 1}.0"]
+                    else:
+                        ranges[tag] += [f"{line}.{a}", f"{line}.{b}"]
+                self.dirty.discard(line)
+        
+        for tag, indices in ranges.items():
+            if indices:
+                self.call('tag', 'add', tag, *indices)
+
+
+class EditorTab:
+    """One open post or page and what it needs to come back without reloading
+    
+    `fields` is the text of the metadata entries and `front_matter` the
+    copy parsed from disk, for the keys the entries don't show. While the
+    tab is in the background, `lines` and `preview` (the rendered HTML)
+    are cached; TabBuffers may drop both, after which the text comes back
+    from `swap_path` or from the file itself.
+    """
+    
+    # Rough per-line cost of a list of str on top of the characters
+    LINE_OVERHEAD = 56
+    
+    def __init__(self, path, content_type, fields, front_matter=None, unsaved=False):
+        self.path = path
+        self.content_type = content_type
+        self.fields = fields
+        self.front_matter = front_matter
+        self.unsaved = unsaved
+        self.lines = None
+        self.preview = None
+        self.swap_path = None
+        self.cursor = "1.0"
+        self.size = 0
+        self.frame = None
+    
+    @property
+    def label(self):
+        name = Path(self.path).name if self.path else "Untitled"
+        return f"{name} *" if self.unsaved else name
+    
+    def measure(self):
+        """Approximate bytes held by the cached text and preview"""
+        self.size = len(self.preview) if self.preview else 0
+        if self.lines is not None:
+            self.size += sum(map(len, self.lines)) + self.LINE_OVERHEAD * len(self.lines)
+        return self.size
+
+
+class TabBuffers:
+    """Open tabs in least-recently-used order, within a memory budget
+    
+    Every tab except the active one counts against `budget` bytes. Over
+    budget, the least recently used tabs lose their cached preview and
+    text: clean text is dropped and re-read from the file when the tab
+    is shown again, unsaved text is written to a swap file first, so
+    eviction never loses an edit.
+    """
+    
+    def __init__(self, budget):
+        self.budget = budget
+        self.tabs = OrderedDict()
+        self.active = None
+        self.swap_dir = None
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self.tabs)
+    
+    def __iter__(self):
+        return iter(list(self.tabs.values()))
+    
+    def add(self, tab):
+        self.tabs[id(tab)] = tab
+    
+    def find(self, path):
+        """The tab editing path, or None"""
+        for tab in self.tabs.values():
+            if tab.path and Path(tab.path) == Path(path):
+                return tab
+        return None
+    
+    def most_recent(self):
+        return next(reversed(self.tabs.values()), None)
+    
+    def cached_text(self, tab):
+        """The tab's text from memory or its swap file, or None if it must be re-read from disk"""
+        if tab.lines is not None:
+            return "\n".join(tab.lines)
+        if tab.swap_path:
+            with open(tab.swap_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        return None
+    
+    def activate(self, tab):
+        """Make tab the active one, handing back its cached preview
+        
+        The editor owns the active tab's text, so the cache is released.
+        """
+        preview = tab.preview
+        self.discard_swap(tab)
+        tab.lines = tab.preview = None
+        tab.size = 0
+        self.tabs.move_to_end(id(tab))
+        self.active = tab
+        return preview
+    
+    def deactivate(self, lines, preview):
+        """Cache the active tab's text and preview as it goes to the background"""
+        tab = self.active
+        self.active = None
+        tab.lines = lines
+        tab.preview = preview
+        tab.measure()
+        self.trim()
+    
+    def trim(self):
+        """Evict least recently used caches until the background tabs fit the budget"""
+        total = sum(tab.size for tab in self.tabs.values())
+        for tab in list(self.tabs.values()):
+            if total <= self.budget:
+                break
+            if tab is not self.active and tab.size:
+                total -= tab.size
+                self.evict(tab)
+    
+    def evict(self, tab):
+        tab.preview = None
+        if tab.lines is not None and tab.unsaved:
+            try:
+                tab.swap_path = self.swap_out(tab.lines)
+            except OSError as e:
+                print(f"⚠ Could not swap out {tab.label}: {e}")
+                tab.measure()
+                return
+        tab.lines = None
+        tab.size = 0
+        self.evictions += 1
+    
+    def replace_text(self, tab, old, new):
+        """Replace the first `old` in a background tab's cached text; False if it isn't there"""
+        if id(tab) not in self.tabs:
+            return False
+        text = self.cached_text(tab)
+        if text is None or old not in text:
+            return False
+        self.discard_swap(tab)
+        tab.lines = text.replace(old, new, 1).split('\n')
+        tab.preview = None
+        tab.unsaved = True
+        tab.measure()
+        self.trim()
+        return True
+    
+    def invalidate(self, paths):
+        """Drop the caches of clean background tabs whose files changed on disk"""
+        paths = {Path(p) for p in paths}
+        for tab in self.tabs.values():
+            if tab is not self.active and not tab.unsaved and tab.path and Path(tab.path) in paths:
+                tab.lines = tab.preview = None
+                tab.size = 0
+    
+    def swap_out(self, lines):
+        if self.swap_dir is None:
+            self.swap_dir = tempfile.mkdtemp(prefix="blog_manager_swap_")
+        fd, path = tempfile.mkstemp(suffix=".md", dir=self.swap_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+        return path
+    
+    def discard_swap(self, tab):
+        if tab.swap_path:
+            try:
+                os.unlink(tab.swap_path)
+            except OSError:
+                pass
+            tab.swap_path = None
+    
+    def close(self, tab):
+        self.discard_swap(tab)
+        self.tabs.pop(id(tab), None)
+        if tab is self.active:
+            self.active = None
+    
+    def clear(self):
+        """Close every tab and remove the swap directory"""
+        self.tabs.clear()
+        self.active = None
+        if self.swap_dir:
+            shutil.rmtree(self.swap_dir, ignore_errors=True)
+            self.swap_dir = None
 
-# Try to import required modules
-try:
-    import markdown
-    from PIL import Image, ImageTk
-    import git
-except ImportError:
-    print("Installing required packages...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "markdown", "pillow", "gitpython"])
-    import markdown
-    from PIL import Image, ImageTk
-    import git
 
 class BlogManager:
+    PAGE_FILES = BlogCore.PAGE_FILES
+    WATCH_INTERVAL_MS = 2000
+    SEARCH_DELAY_MS = 150
+    PREVIEW_POLL_MS = 30
+    INDEX_SLICE_MS = 20
+    LOAD_POLL_MS = 50
+    LOAD_BATCH_SIZE = 500
+    IMAGE_WORKERS = 2
+    IMAGE_POLL_MS = 100
+    PUBLISH_POLL_MS = 100
+    PUBLISH_QUEUE_TICK_MS = 5000
+    SERVER_POLL_MS = 100
+    SERVER_LOG_LINES = 5000
+    DIAGNOSTICS_REFRESH_MS = 1000
+    # Documents this large load in slices and preview only the part being edited
+    LARGE_FILE_CHARS = 1000000
+    LOAD_CHUNK_LINES = 5000
+    LARGE_PREVIEW_LINES = 400
+    # Text and previews cached for background tabs before the least recently used are evicted
+    TAB_CACHE_BYTES = 64 * 1024 * 1024
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Jekyll Blog Manager")
@@ -40,49 +4081,220 @@ class BlogManager:
         self.root.minsize(1200, 700)
         
         # Configuration
-        self.posts_dir = Path("_posts")
-        self.assets_dir = Path("assets/img")
+        self.core = BlogCore()
+        self.posts_dir = self.core.posts_dir
+        self.assets_dir = self.core.assets_dir
+        self.post_index = self.core.index
+        self.search_index = SearchIndex()
+        self.preview_renderer = IncrementalRenderer()
+        self.site_preview = SitePreview(self.core, self.preview_renderer)
+        self.preview_server = None
+        self.preview_worker = PreviewWorker(self.preview_renderer.render)
+        self.preview_debounce = AdaptiveDebounce()
+        self.preview_stale = False
+        self._preview_poll_id = None
+        self.last_preview_key = None
+        self.large_file = False
+        self.seen_version = None
+        self._text_generation = 0
+        self.pending_lines = None
+        self.shown_preview = None
+        self.index_queue = deque()
         self.current_file = None
+        self.current_content_type = 'post'
         self.unsaved_changes = False
+        self.buffers = TabBuffers(self.TAB_CACHE_BYTES)
+        self.tab_frames = {}
         self.repo = None
         self.auto_preview = tk.BooleanVar(value=True)
-        self.jekyll_process = None
-        
-        # Initialize git repository
-        self.init_git_repo()
+        self.jekyll_server = None
+        self.open_site_when_ready = False
+        self.last_build_seconds = None
+        self.server_log = deque(maxlen=self.SERVER_LOG_LINES)
+        self.server_log_window = None
+        self.server_log_text = None
+        self.diagnostics_window = None
+        self.diagnostics_tree = None
+        self._diagnostics_after_id = None
+        self.tracing = tk.BooleanVar(value=TRACER.enabled)
+        self.watcher = None
+        self.image_pool = None
+        self.image_jobs = []
+        self.image_poll = None
+        self.publish_job = None
+        self.publish_job_auto = False
+        self.settings = self.core.load_settings()
+        self.publish_queue = PublishQueue(
+            self.core,
+            policy=self.settings['publish_policy'],
+            interval_minutes=self.settings['publish_interval_minutes'],
+            idle_seconds=self.settings['publish_idle_seconds']
+        )
+        self.publish_policy = tk.StringVar(value=self.settings['publish_policy'])
         
         # Ensure directories exist
         self.posts_dir.mkdir(exist_ok=True)
         self.assets_dir.mkdir(parents=True, exist_ok=True)
         
-        # Categories and tags management
-        self.categories = set(['blog'])
-        self.tags = set()
-        self.load_existing_categories_tags()
+        # Content model, streamed in by the background loader
+        self.all_content = []
+        self.visible_content = []
+        self.content_by_id = {}
+        self.streaming_posts = True
         
         # Set up UI
         self.setup_ui()
-        self.load_posts_list()
         
         # Bind shortcuts
         self.setup_shortcuts()
         self.root.protocol("WM_DELETE_WINDOW", self.quit_app)
         
-    def init_git_repo(self):
-        """Initialize or detect Git repository"""
+        # Show the window first; scan posts and find the repo in the background
+        self.root.after_idle(self.report_first_interaction)
+        self.start_background_load()
+    
+    def report_first_interaction(self):
+        """Record the time from launch until the event loop is first idle"""
+        self.time_to_interactive = time.perf_counter() - STARTUP_TIME
+        print(f"✓ Window ready in {self.time_to_interactive * 1000:.0f} ms")
+    
+    def start_background_load(self):
+        """Stream the post scan and git discovery into the UI from a worker thread"""
+        self.load_queue = queue.Queue()
+        self.load_progress.config(value=0, maximum=1)
+        self.load_progress.pack(side=tk.RIGHT, padx=5)
+        self.status_bar.config(text="Loading posts...")
+        threading.Thread(target=self.background_load, name="startup-load", daemon=True).start()
+        self.root.after(self.LOAD_POLL_MS, self.poll_background_load)
+    
+    @traced('load.startup')
+    def background_load(self):
+        """Worker thread: scan posts, start watching, find the repo, warm imports
+        
+        Posts are statted once: the same listing feeds the UI, the watcher,
+        the archives and the tag and category counts. Only talks to the UI
+        through self.load_queue.
+        """
         try:
-            self.repo = git.Repo(".")
-            print("✓ Git repository detected")
-        except git.InvalidGitRepositoryError:
-            print("⚠ Not a Git repository")
+            dir_mtime = os.stat(self.posts_dir).st_mtime_ns
+            with os.scandir(self.posts_dir) as it:
+                entries = [e for e in it if e.name.endswith(".md") and e.is_file()]
+            entries.sort(key=lambda e: e.name, reverse=True)
+            self.load_queue.put(('total', len(entries)))
+            
+            records = []
+            stats = {}
+            batch = []
+            for entry in entries:
+                path = self.posts_dir / entry.name
+                try:
+                    stats[path] = entry.stat()
+                    batch.append((path, self.post_index.lookup(path, stats[path])))
+                except OSError:
+                    continue
+                if len(batch) >= self.LOAD_BATCH_SIZE:
+                    self.load_queue.put(('posts', batch))
+                    records.extend(batch)
+                    batch = []
+            self.load_queue.put(('posts', batch))
+            records.extend(batch)
+            
+            snapshot = {str(self.posts_dir): (dir_mtime, stats)}
+            self.load_queue.put(('watcher', ContentWatcher([self.posts_dir], self.PAGE_FILES, snapshot=snapshot)))
+            
+            self.post_index.prune(self.posts_dir, {str(self.posts_dir / e.name) for e in entries})
+            self.post_index.save()
+            
+            self.load_queue.put(('status', "Looking for Git repository..."))
+            self.init_git_repo()
+            
+            self.load_queue.put(('status', "Loading Markdown renderer..."))
+            require('markdown')
+            
+            self.load_queue.put(('status', "Preparing archives..."))
+            # Rebuilt every start, so posts edited elsewhere can't leave the archive pages stale
+            self.core.update_archives(posts=records)
+            self.core.build_taxonomies(records)
         except Exception as e:
-            print(f"❌ Git error: {e}")
+            self.load_queue.put(('error', e))
+        self.load_queue.put(('done', None))
+    
+    def poll_background_load(self):
+        """Apply messages from the background loader on the Tk thread"""
+        done = False
+        try:
+            while not done:
+                kind, payload = self.load_queue.get_nowait()
+                if kind == 'watcher':
+                    self.watcher = payload
+                elif kind == 'total':
+                    self.load_progress.config(maximum=max(payload, 1))
+                elif kind == 'posts':
+                    self.add_loaded_posts(payload)
+                elif kind == 'status':
+                    self.status_bar.config(text=payload)
+                elif kind == 'error':
+                    print(f"❌ Loading error: {payload}")
+                elif kind == 'done':
+                    done = True
+        except queue.Empty:
+            pass
+        
+        if done:
+            self.finish_background_load()
+        else:
+            self.root.after(self.LOAD_POLL_MS, self.poll_background_load)
+    
+    def add_loaded_posts(self, records):
+        """Merge a batch of scanned posts into the content model"""
+        for path, meta in records:
+            self.index_queue.append(path)
+        
+        self.load_progress.step(len(records))
+        if self.streaming_posts and self.content_type.get() == "Posts":
+            for path, meta in records:
+                item = {
+                    'filename': path.name,
+                    'title': meta.title or path.name,
+                    'path': path,
+                    'type': 'post'
+                }
+                self.all_content.append(item)
+                self.content_by_id[str(path)] = item
+            self.filter_content()
+        self.status_bar.config(text=f"Loading posts... {len(self.index_queue)} found")
+    
+    def finish_background_load(self):
+        """Start watching and indexing once the initial scan is complete"""
+        self.load_progress.pack_forget()
+        self.streaming_posts = False
+        
+        # Full-text index is built in idle-time slices
+        self.index_queue.extend(Path(p) for p in self.PAGE_FILES if Path(p).exists())
+        post_count = len(self.index_queue)
+        self.root.after_idle(self.index_next_slice)
+        
+        # Watch posts and pages for changes made outside the app
+        if self.watcher:
+            self.root.after(self.WATCH_INTERVAL_MS, self.poll_filesystem)
+        
+        if self.repo:
+            self.root.after(self.PUBLISH_QUEUE_TICK_MS, self.poll_publish_queue)
+        
+        elapsed = time.perf_counter() - STARTUP_TIME
+        print(f"✓ Loaded {post_count} files in {elapsed:.2f}s")
+        self.status_bar.config(text=f"Loaded {post_count} files in {elapsed:.2f}s")
+    
+    def init_git_repo(self):
+        """Initialize or detect Git repository"""
+        self.repo = self.core.open_repo()
     
     def setup_shortcuts(self):
         """Setup keyboard shortcuts"""
         self.root.bind('<Control-s>', lambda e: self.save_post())
         self.root.bind('<Control-n>', lambda e: self.new_post())
         self.root.bind('<Control-o>', lambda e: self.import_markdown())
+        self.root.bind('<Control-w>', lambda e: self.close_tab())
         self.root.bind('<Control-p>', lambda e: self.publish_to_github())
         self.root.bind('<F5>', lambda e: self.refresh_preview())
         self.root.bind('<Control-b>', lambda e: self.wrap_text("**"))
@@ -111,6 +4323,7 @@ class BlogManager:
         file_menu.add_command(label="Import Markdown (Ctrl+O)", command=self.import_markdown)
         file_menu.add_separator()
         file_menu.add_command(label="Save (Ctrl+S)", command=self.save_post)
+        file_menu.add_command(label="Close Tab (Ctrl+W)", command=self.close_tab)
         file_menu.add_separator()
         file_menu.add_command(label="Delete Post", command=self.delete_post)
         file_menu.add_separator()
@@ -124,16 +4337,40 @@ class BlogManager:
         edit_menu.add_command(label="Insert Link", command=self.insert_link)
         edit_menu.add_command(label="Insert Image", command=self.insert_image)
         edit_menu.add_command(label="Insert Code Block", command=self.insert_code_block)
+        edit_menu.add_command(label="Clean Up Unused Images...", command=self.clean_unused_images)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Rename Tag in All Posts...", command=lambda: self.rename_taxonomy('tags'))
+        edit_menu.add_command(label="Rename Category in All Posts...", command=lambda: self.rename_taxonomy('categories'))
         
         # Publish Menu
         publish_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Publish", menu=publish_menu)
         publish_menu.add_command(label="Serve Locally", command=self.serve_locally)
         publish_menu.add_command(label="Stop Local Server", command=self.stop_local_server)
+        publish_menu.add_command(label="Show Server Log", command=self.show_server_log)
         publish_menu.add_separator()
         publish_menu.add_command(label="Publish to GitHub (Ctrl+P)", command=self.publish_to_github)
+        publish_menu.add_command(label="Cancel Publish", command=self.cancel_publish)
+        
+        auto_menu = tk.Menu(publish_menu, tearoff=0)
+        publish_menu.add_cascade(label="Auto Publish", menu=auto_menu)
+        auto_menu.add_radiobutton(label="Manual Only", variable=self.publish_policy, value='manual',
+                                  command=self.set_publish_policy)
+        auto_menu.add_radiobutton(label="Every N Minutes", variable=self.publish_policy, value='interval',
+                                  command=self.set_publish_policy)
+        auto_menu.add_radiobutton(label="When Idle", variable=self.publish_policy, value='idle',
+                                  command=self.set_publish_policy)
+        auto_menu.add_separator()
+        auto_menu.add_command(label="Auto Publish Timing...", command=self.configure_publish_timing)
         publish_menu.add_command(label="Preview in Browser", command=self.preview_in_browser)
         publish_menu.add_command(label="Refresh Preview (F5)", command=self.refresh_preview)
+        
+        # Help Menu
+        help_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Help", menu=help_menu)
+        help_menu.add_checkbutton(label="Record Timings", variable=self.tracing, command=self.set_tracing)
+        help_menu.add_command(label="Diagnostics...", command=self.show_diagnostics)
+        help_menu.add_command(label="Export Chrome Trace...", command=self.export_trace)
     
     def setup_posts_panel(self, parent):
         """Setup posts list panel"""
@@ -147,7 +4384,7 @@ class BlogManager:
         search_frame.pack(fill=tk.X, pady=(0, 5))
         ttk.Label(search_frame, text="Search:").pack(anchor=tk.W)
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', self.filter_posts)
+        self.search_var.trace('w', self.schedule_filter)
         ttk.Entry(search_frame, textvariable=self.search_var).pack(fill=tk.X, pady=(2, 0))
         
         # Content type selector
@@ -160,17 +4397,15 @@ class BlogManager:
         ttk.Radiobutton(content_type_frame, text="Pages", variable=self.content_type, 
                        value="Pages", command=self.load_content_list).pack(side=tk.LEFT, padx=(10, 0))
         
-        # Content list
-        list_frame = ttk.Frame(left_frame)
-        list_frame.pack(fill=tk.BOTH, expand=True)
-        
-        scrollbar = ttk.Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.content_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, font=("Arial", 9))
-        self.content_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.content_listbox.yview)
-        self.content_listbox.bind('<<ListboxSelect>>', self.load_selected_content)
+        # Content list (only the visible rows are materialized)
+        self.content_list = VirtualListView(
+            left_frame,
+            format_row=lambda c: f"{c['filename']} - {c['title']}",
+            key=lambda c: str(c['path']),
+            on_select=self.load_selected_content,
+            font=("Arial", 9)
+        )
+        self.content_list.frame.pack(fill=tk.BOTH, expand=True)
         
         # Buttons
         buttons_frame = ttk.Frame(left_frame)
@@ -181,8 +4416,18 @@ class BlogManager:
     
     def setup_editor_panel(self, parent):
         """Setup editor and preview panel"""
-        right_paned = ttk.PanedWindow(parent, orient=tk.VERTICAL)
-        parent.add(right_paned, weight=1)
+        right_frame = ttk.Frame(parent)
+        parent.add(right_frame, weight=1)
+        
+        # One tab per open post or page; the panes below show the active one
+        self.tab_bar = ttk.Notebook(right_frame)
+        self.tab_bar.pack(fill=tk.X)
+        self.tab_bar.enable_traversal()
+        self.tab_bar.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.tab_bar.bind('<Button-2>', self.on_tab_middle_click)
+        
+        right_paned = ttk.PanedWindow(right_frame, orient=tk.VERTICAL)
+        right_paned.pack(fill=tk.BOTH, expand=True)
         
         # Metadata section
         metadata_frame = ttk.LabelFrame(right_paned, text="Post Metadata")
@@ -218,6 +4463,9 @@ class BlogManager:
         self.tags_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
         self.tags_entry.bind('<KeyRelease>', self.on_change)
         
+        Autocomplete(self.category_entry, self.suggest_categories, separator=" ", on_accept=self.on_change)
+        Autocomplete(self.tags_entry, self.suggest_tags, separator=",", on_accept=self.on_change)
+        
         # Description row
         row3 = ttk.Frame(metadata_frame)
         row3.pack(fill=tk.X, padx=10, pady=(0, 8))
@@ -254,6 +4502,9 @@ class BlogManager:
         )
         self.editor.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
         self.editor.bind('<KeyRelease>', self.on_editor_change)
+        self.editor_hook = TextEditHook(self.editor)
+        self.document = EditorDocument(self.editor_hook)
+        self.highlighter = MarkdownHighlighter(self.editor, self.editor_hook)
         
         # Preview section
         preview_frame = ttk.LabelFrame(right_paned, text="Live Preview")
@@ -272,6 +4523,11 @@ class BlogManager:
             state=tk.DISABLED
         )
         self.preview_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+        self.preview_text.bind('<Map>', self.on_preview_exposed)
+        self.preview_text.bind('<Configure>', self.on_preview_exposed)
+        self.root.bind('<FocusIn>', self.on_preview_exposed, add='+')
+        
+        self.buffers.activate(self.add_tab(EditorTab(None, 'post', {})))
     
     def setup_status_bar(self):
         """Setup status bar"""
@@ -284,36 +4540,27 @@ class BlogManager:
         button_frame = ttk.Frame(status_frame)
         button_frame.pack(side=tk.RIGHT, padx=5, pady=2)
         
+        self.preview_timing_label = ttk.Label(status_frame, text="Preview: -", relief=tk.SUNKEN, anchor=tk.W)
+        self.preview_timing_label.pack(side=tk.RIGHT, padx=(5, 0))
+        
+        # Shown only while the startup scan is running
+        self.load_progress = ttk.Progressbar(status_frame, length=150, mode='determinate')
+        
         ttk.Button(button_frame, text="Save", command=self.save_post).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Publish", command=self.publish_to_github).pack(side=tk.LEFT, padx=2)
     
-    def load_existing_categories_tags(self):
-        """Load existing categories and tags from posts"""
-        self.categories = set(['blog'])
-        self.tags = set()
-        
-        if self.posts_dir.exists():
-            for post_file in self.posts_dir.glob("*.md"):
-                try:
-                    with open(post_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    if content.startswith("---"):
-                        frontmatter_match = re.search(r'---\n(.*?)\n---', content, re.DOTALL)
-                        if frontmatter_match:
-                            frontmatter = frontmatter_match.group(1)
-                            
-                            cat_match = re.search(r'categories?:\s*(.+)', frontmatter)
-                            if cat_match:
-                                self.categories.add(cat_match.group(1).strip())
-                            
-                            tag_match = re.search(r'tags:\s*\[(.*?)\]', frontmatter)
-                            if tag_match:
-                                tags_str = tag_match.group(1)
-                                tags = [t.strip().strip('"\'') for t in tags_str.split(',') if t.strip()]
-                                self.tags.update(tags)
-                except:
-                    continue
+    def suggest(self, kind, prefix, exclude):
+        # Nothing to offer until background_load has counted the posts; scanning
+        # them here would block typing and race the background build
+        if self.core.taxonomies is None:
+            return []
+        return self.core.taxonomies[kind].suggest(prefix, Autocomplete.MAX_ROWS, exclude)
+    
+    def suggest_tags(self, prefix, exclude=()):
+        return self.suggest('tags', prefix, exclude)
+    
+    def suggest_categories(self, prefix, exclude=()):
+        return self.suggest('categories', prefix, exclude)
     
     def on_change(self, event=None):
         """Handle metadata changes"""
@@ -323,6 +4570,11 @@ class BlogManager:
     
     def on_editor_change(self, event=None):
         """Handle editor content changes"""
+        # Cursor keys and other keys that didn't edit the text
+        if self.document.version == self.seen_version:
+            return
+        self.seen_version = self.document.version
+        
         if not self.unsaved_changes:
             self.unsaved_changes = True
             self.update_title()
@@ -330,7 +4582,27 @@ class BlogManager:
         if self.auto_preview.get():
             if hasattr(self, '_preview_after_id'):
                 self.root.after_cancel(self._preview_after_id)
-            self._preview_after_id = self.root.after(1000, self.refresh_preview)
+            self._preview_after_id = self.root.after(self.preview_debounce.interval_ms, self.auto_refresh_preview)
+    
+    def preview_visible(self):
+        """Check whether the preview pane is shown and the window has focus"""
+        return (self.preview_text.winfo_ismapped() and
+                self.preview_text.winfo_height() > 1 and
+                self.root.focus_displayof() is not None)
+    
+    def auto_refresh_preview(self):
+        """Refresh the preview after typing, deferring while nobody can see it"""
+        if self.preview_visible():
+            if self.preview_key() != self.last_preview_key:
+                self.refresh_preview()
+        else:
+            self.preview_stale = True
+            self.push_browser_preview()
+    
+    def on_preview_exposed(self, event=None):
+        """Catch up on a deferred preview once the pane or window is visible again"""
+        if self.preview_stale and self.preview_visible():
+            self.refresh_preview()
     
     def update_title(self):
         """Update window title"""
@@ -340,10 +4612,229 @@ class BlogManager:
         if self.unsaved_changes:
             title += " *"
         self.root.title(title)
+        
+        tab = self.buffers.active
+        if tab:
+            tab.path = self.current_file
+            tab.unsaved = self.unsaved_changes
+            self.tab_bar.tab(tab.frame, text=tab.label)
+    
+    @traced('editor.load')
+    def set_editor_text(self, text, cursor="1.0", preview=None):
+        """Replace the editor's text and refresh the preview
+        
+        Large documents are inserted LOAD_CHUNK_LINES at a time from
+        `after` callbacks, with the editor read-only until they finish.
+        The editor's change tracking is told once at the end, from the
+        lines already in hand, instead of per chunk. A cached `preview`
+        is shown as is instead of rendering the text again.
+        """
+        self._text_generation += 1
+        self.shown_preview = None
+        self.editor.config(state=tk.NORMAL)
+        self.editor_hook.suspend()
+        self.editor_hook.call('delete', '1.0', 'end')
+        
+        lines = text.split('\n')
+        self.large_file = len(text) >= self.LARGE_FILE_CHARS
+        if not self.large_file:
+            self.editor_hook.call('insert', '1.0', text)
+            self.finish_editor_text(lines, cursor, preview)
+            return
+        
+        self.pending_lines = lines
+        self.editor.config(state=tk.DISABLED)
+        self.status_bar.config(text=f"Loading {len(lines)} lines...")
+        self.root.after(1, self.insert_text_chunk, lines, 0, self._text_generation, cursor, preview)
+    
+    def insert_text_chunk(self, lines, start, generation, cursor="1.0", preview=None):
+        """Insert the next slice of a large document, yielding to the event loop between slices"""
+        if generation != self._text_generation:
+            return
+        
+        end = min(len(lines), start + self.LOAD_CHUNK_LINES)
+        chunk = "\n".join(lines[start:end]) + ("\n" if end < len(lines) else "")
+        self.editor.config(state=tk.NORMAL)
+        self.editor_hook.call('insert', 'end-1c', chunk)
+        if end < len(lines):
+            self.editor.config(state=tk.DISABLED)
+            self.status_bar.config(text=f"Loading... {end * 100 // len(lines)}% of {len(lines)} lines")
+            self.root.after(1, self.insert_text_chunk, lines, end, generation, cursor, preview)
+            return
+        
+        self.finish_editor_text(lines, cursor, preview)
+        self.status_bar.config(text=f"Loaded {len(lines)} lines; the preview follows the cursor for large files")
+    
+    def finish_editor_text(self, lines, cursor="1.0", preview=None):
+        self.editor_hook.resume(lines)
+        self.pending_lines = None
+        self.editor.mark_set(tk.INSERT, cursor)
+        self.editor.see(cursor)
+        self.editor.edit_reset()
+        self.seen_version = self.document.version
+        if preview is None:
+            self.refresh_preview()
+        else:
+            self.preview_worker.cancel()
+            self.preview_stale = False
+            self.last_preview_key = self.preview_key()
+            self.shown_preview = (self.last_preview_key, preview)
+            self.show_preview(preview)
+    
+    def field_entries(self):
+        return {
+            'title': self.title_entry,
+            'date': self.date_entry,
+            'categories': self.category_entry,
+            'tags': self.tags_entry,
+            'description': self.description_entry
+        }
+    
+    def field_values(self):
+        return {name: entry.get() for name, entry in self.field_entries().items()}
+    
+    def set_fields(self, fields):
+        for name, entry in self.field_entries().items():
+            entry.delete(0, tk.END)
+            entry.insert(0, fields.get(name, ""))
+    
+    def front_matter_fields(self, front_matter):
+        """Entry text for parsed front matter"""
+        if not front_matter:
+            return {}
+        return {
+            'title': front_matter.title,
+            'date': front_matter.date,
+            'categories': front_matter.categories,
+            'tags': ", ".join(front_matter.tags),
+            'description': front_matter.description
+        }
+    
+    def add_tab(self, tab):
+        """Give tab a header in the tab bar and start tracking it"""
+        tab.frame = ttk.Frame(self.tab_bar, height=1)
+        self.tab_frames[str(tab.frame)] = tab
+        self.tab_bar.add(tab.frame, text=tab.label)
+        self.buffers.add(tab)
+        return tab
+    
+    def open_tab(self, tab, text):
+        """Show a newly opened document in its own tab
+        
+        An untouched untitled tab is replaced rather than left behind.
+        """
+        active = self.buffers.active
+        replace = active if active and self.current_file is None and not self.unsaved_changes else None
+        self.show_tab(self.add_tab(tab), text)
+        if replace:
+            self.discard_tab(replace)
+    
+    @traced('tabs.switch')
+    def show_tab(self, tab, text=None):
+        """Make tab the one being edited, from its cached text and preview when it still has them"""
+        if tab is self.buffers.active:
+            return
+        
+        if text is None:
+            text = self.buffers.cached_text(tab)
+        if text is None:
+            # Evicted or changed on disk: read it again
+            front_matter, text = self.core.read(tab.path)
+            tab.front_matter = front_matter
+            tab.fields = self.front_matter_fields(front_matter)
+        
+        self.stash_active_tab()
+        preview = self.buffers.activate(tab)
+        
+        self.current_file = tab.path
+        self.current_content_type = tab.content_type
+        self.unsaved_changes = tab.unsaved
+        self.set_fields(tab.fields)
+        self.tab_bar.select(tab.frame)
+        self.update_title()
+        self.set_editor_text(text, tab.cursor, preview)
+    
+    def stash_active_tab(self):
+        """Keep the active tab's fields, text and up-to-date preview as it goes to the background"""
+        tab = self.buffers.active
+        if tab is None:
+            return
+        
+        tab.content_type = self.current_content_type
+        tab.fields = self.field_values()
+        if self.editor_hook.suspended:
+            # Still loading: the document isn't current yet
+            lines, preview = self.pending_lines, None
+        else:
+            tab.cursor = self.editor.index(tk.INSERT)
+            lines, preview = self.document.lines, None
+            if self.shown_preview and self.shown_preview[0] == self.preview_key():
+                preview = self.shown_preview[1]
+        self.buffers.deactivate(lines, preview)
+    
+    def on_tab_changed(self, event=None):
+        tab = self.tab_frames.get(self.tab_bar.select())
+        # No active tab while one is being closed; discard_tab picks the next
+        if tab is None or self.buffers.active in (None, tab):
+            return
+        try:
+            self.show_tab(tab)
+        except Exception as e:
+            self.tab_bar.select(self.buffers.active.frame)
+            messagebox.showerror("Error", f"Failed to load content: {str(e)}")
+    
+    def on_tab_middle_click(self, event):
+        try:
+            index = self.tab_bar.index(f"@{event.x},{event.y}")
+        except tk.TclError:
+            return
+        self.close_tab(self.tab_frames.get(self.tab_bar.tabs()[index]))
+    
+    def close_tab(self, tab=None):
+        """Close a tab (the active one by default), offering to save unsaved changes"""
+        tab = tab or self.buffers.active
+        if tab is None:
+            return
+        
+        if tab.unsaved:
+            result = messagebox.askyesnocancel("Unsaved Changes", f"Save {tab.label.rstrip(' *')} before closing?")
+            if result is None:
+                return
+            elif result:
+                try:
+                    self.show_tab(tab)
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to load content: {str(e)}")
+                    return
+                self.save_post()
+                if self.unsaved_changes:
+                    return
+        self.discard_tab(tab)
+    
+    def discard_tab(self, tab):
+        """Close a tab without saving, showing the most recently used one in its place"""
+        was_active = tab is self.buffers.active
+        self.buffers.close(tab)
+        del self.tab_frames[str(tab.frame)]
+        self.tab_bar.forget(tab.frame)
+        tab.frame.destroy()
+        if not was_active:
+            return
+        
+        while len(self.buffers):
+            tab = self.buffers.most_recent()
+            try:
+                self.show_tab(tab)
+                return
+            except Exception as e:
+                print(f"⚠ Could not reopen {tab.label}: {e}")
+                self.discard_tab(tab)
+        self.new_content()
     
+    @traced('load.content_list')
     def load_content_list(self):
         """Load content list based on selected type"""
-        self.content_listbox.delete(0, tk.END)
+        self.streaming_posts = False
         self.all_content = []
         
         if self.content_type.get() == "Posts":
@@ -351,154 +4842,247 @@ class BlogManager:
         else:
             self.load_pages_content()
         
+        self.content_by_id = {str(c['path']): c for c in self.all_content}
         self.filter_content()
     
     def load_posts_content(self):
         """Load posts from _posts directory"""
-        if self.posts_dir.exists():
-            for post in sorted(self.posts_dir.glob("*.md"), reverse=True):
-                try:
-                    with open(post, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        title = post.name
-                        
-                        if content.startswith("---"):
-                            match = re.search(r'title:\s*["\']?([^"\'\n]+)["\']?', content)
-                            if match:
-                                title = match.group(1)
-                        
-                        self.all_content.append({
-                            'filename': post.name,
-                            'title': title,
-                            'path': post,
-                            'type': 'post'
-                        })
-                except:
-                    self.all_content.append({
-                        'filename': post.name,
-                        'title': post.name,
-                        'path': post,
-                        'type': 'post'
-                    })
+        records = self.post_index.scan(self.posts_dir)
+        for post, meta in sorted(records, key=lambda r: r[0].name, reverse=True):
+            self.all_content.append({
+                'filename': post.name,
+                'title': meta.title or post.name,
+                'path': post,
+                'type': 'post'
+            })
     
     def load_pages_content(self):
         """Load pages from root directory"""
-        page_files = ['index.md', 'about.md', 'posts.md', 'categories.md', 'tags.md']
-        
-        for page_name in page_files:
+        for page_name in self.PAGE_FILES:
             page_path = Path(page_name)
             if page_path.exists():
-                try:
-                    with open(page_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        title = page_name
-                        
-                        if content.startswith("---"):
-                            match = re.search(r'title:\s*["\']?([^"\'\n]+)["\']?', content)
-                            if match:
-                                title = match.group(1)
-                    
-                    self.all_content.append({
-                        'filename': page_name,
-                        'title': title,
-                        'path': page_path,
-                        'type': 'page'
-                    })
-                except:
-                    self.all_content.append({
-                        'filename': page_name,
-                        'title': page_name,
-                        'path': page_path,
-                        'type': 'page'
-                    })
+                self.all_content.append({
+                    'filename': page_name,
+                    'title': self.post_index.lookup(page_path).title or page_name,
+                    'path': page_path,
+                    'type': 'page'
+                })
+        self.post_index.save()
     
     def load_posts_list(self):
         """Load posts list - legacy method for compatibility"""
         self.load_content_list()
     
+    def schedule_filter(self, *args):
+        """Debounce search box keystrokes before querying the index"""
+        if hasattr(self, '_filter_after_id'):
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(self.SEARCH_DELAY_MS, self.filter_content)
+    
+    @traced('search.filter')
     def filter_content(self, *args):
-        """Filter content by search term"""
-        search_term = self.search_var.get().lower()
-        self.content_listbox.delete(0, tk.END)
+        """Filter content by search query"""
+        query = self.search_var.get().strip()
         
-        for content in self.all_content:
-            if (search_term in content['filename'].lower() or 
-                search_term in content['title'].lower()):
-                self.content_listbox.insert(tk.END, f"{content['filename']} - {content['title']}")
+        if query:
+            doc_ids = self.search_index.search(query, (str(c['path']) for c in self.all_content))
+            self.visible_content = [self.content_by_id[doc_id] for doc_id in doc_ids]
+            
+            # Items not indexed yet fall back to a plain substring match
+            if self.index_queue:
+                search_term = query.lower()
+                for content in self.all_content:
+                    if str(content['path']) not in self.search_index and (
+                            search_term in content['filename'].lower() or
+                            search_term in content['title'].lower()):
+                        self.visible_content.append(content)
+        else:
+            self.visible_content = list(self.all_content)
         
-        self.status_bar.config(text=f"Showing {self.content_listbox.size()} items")
+        self.content_list.set_items(self.visible_content)
+        self.status_bar.config(text=f"Showing {len(self.visible_content)} items")
     
-    def filter_posts(self, *args):
-        """Legacy filter method for compatibility"""
-        self.filter_content(*args)
+    @traced('search.index_slice')
+    def index_next_slice(self):
+        """Index queued files for a few milliseconds, then yield to the event loop"""
+        deadline = time.perf_counter() + self.INDEX_SLICE_MS / 1000
+        while self.index_queue and time.perf_counter() < deadline:
+            self.index_content_file(self.index_queue.popleft())
+        
+        if self.index_queue:
+            self.status_bar.config(text=f"Indexing... {len(self.index_queue)} files left")
+            self.root.after(1, self.index_next_slice)
+        else:
+            self.post_index.save()
+            if self.search_var.get().strip():
+                self.filter_content()
+            else:
+                self.status_bar.config(text=f"Showing {len(self.visible_content)} items")
     
-    def load_selected_content(self, event=None):
-        """Load selected content (post or page)"""
-        selection = self.content_listbox.curselection()
-        if not selection:
+    def index_content_file(self, path, meta=None):
+        """Add a single file to the search index"""
+        try:
+            meta = meta or self.post_index.lookup(path)
+            self.search_index.add(str(path), meta, read_post_body(path))
+        except (OSError, UnicodeDecodeError):
+            self.search_index.remove(str(path))
+    
+    def content_position(self, items, filename, content_type):
+        """Binary search for where filename belongs in a display-ordered list"""
+        lo, hi = 0, len(items)
+        if content_type == 'post':
+            # Posts are listed newest first, i.e. by descending filename
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if items[mid]['filename'] > filename:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        else:
+            order = {name: i for i, name in enumerate(self.PAGE_FILES)}
+            rank = order.get(filename, len(order))
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if order.get(items[mid]['filename'], len(order)) < rank:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        return lo
+    
+    def find_content(self, items, filename, content_type):
+        """Return the index of filename in a display-ordered list, or None"""
+        index = self.content_position(items, filename, content_type)
+        if index < len(items) and items[index]['filename'] == filename:
+            return index
+        return None
+    
+    def poll_filesystem(self):
+        """Apply changes made on disk since the last poll, then reschedule"""
+        try:
+            events = self.watcher.poll()
+            if events:
+                self.apply_content_events(events)
+        except Exception as e:
+            print(f"⚠ File watcher error: {e}")
+        self.root.after(self.WATCH_INTERVAL_MS, self.poll_filesystem)
+    
+    @traced('watch.apply')
+    def apply_content_events(self, events):
+        """Patch the content model and list for individual file changes
+        
+        The files themselves are not tracked for publishing: a checkout or
+        pull isn't an edit to publish, and the editor's own saves are
+        tracked where they happen.
+        """
+        for event in events:
+            kind, path = event[0], event[-1]
+            if kind == 'renamed':
+                self.remove_content_item(event[1])
+            if kind == 'deleted':
+                self.remove_content_item(path)
+            else:
+                self.upsert_content_item(path)
+        
+        self.post_index.save()
+        self.buffers.invalidate(p for event in events for p in event[1:])
+        
+        # Edits made outside the app keep the _data/ archives and tag counts current too
+        changed_posts = [p for event in events for p in event[1:] if self.core.is_post(p)]
+        if changed_posts:
+            try:
+                self.core.posts_changed(changed_posts)
+            except OSError as e:
+                print(f"⚠ Could not update archives: {e}")
+        
+        if self.search_var.get().strip():
+            self.filter_content()
+        else:
+            self.status_bar.config(text=f"Showing {len(self.visible_content)} items")
+    
+    def remove_content_item(self, path):
+        """Remove a single file from the content model and list"""
+        content_type = 'post' if path.parent == self.posts_dir else 'page'
+        self.post_index.forget(path)
+        self.search_index.remove(str(path))
+        
+        if self.current_file and Path(self.current_file) == path:
+            self.status_bar.config(text=f"{path.name} was removed on disk")
+        
+        if content_type != self.content_type.get().lower()[:-1]:
             return
         
-        if self.unsaved_changes:
-            result = messagebox.askyesnocancel("Unsaved Changes", "Save changes before loading another item?")
-            if result is None:
-                return
-            elif result:
-                self.save_post()
+        index = self.find_content(self.all_content, path.name, content_type)
+        if index is not None:
+            del self.all_content[index]
+        self.content_by_id.pop(str(path), None)
+        
+        if self.search_var.get().strip():
+            return
+        
+        visible_index = self.find_content(self.visible_content, path.name, content_type)
+        if visible_index is not None:
+            del self.visible_content[visible_index]
+            self.content_list.refresh()
+    
+    def upsert_content_item(self, path):
+        """Add or refresh a single file in the content model and list"""
+        content_type = 'post' if path.parent == self.posts_dir else 'page'
+        if not path.exists():
+            return
+        
+        meta = self.post_index.lookup(path)
+        self.index_content_file(path, meta)
+        
+        if content_type != self.content_type.get().lower()[:-1]:
+            return
+        
+        item = {
+            'filename': path.name,
+            'title': meta.title or path.name,
+            'path': path,
+            'type': content_type
+        }
+        
+        index = self.find_content(self.all_content, path.name, content_type)
+        if index is not None:
+            self.all_content[index] = item
+        else:
+            self.all_content.insert(self.content_position(self.all_content, path.name, content_type), item)
+        self.content_by_id[str(path)] = item
         
-        filename = self.content_listbox.get(selection[0]).split(" - ")[0]
-        content_item = next((c for c in self.all_content if c['filename'] == filename), None)
+        if self.search_var.get().strip():
+            return
+        
+        visible_index = self.find_content(self.visible_content, path.name, content_type)
+        if visible_index is not None:
+            self.visible_content[visible_index] = item
+        else:
+            position = self.content_position(self.visible_content, path.name, content_type)
+            self.visible_content.insert(position, item)
+        self.content_list.refresh()
+    
+    def filter_posts(self, *args):
+        """Legacy filter method for compatibility"""
+        self.filter_content(*args)
+    
+    @traced('load.content')
+    def load_selected_content(self, event=None):
+        """Load selected content (post or page)"""
+        content_item = self.content_by_id.get(self.content_list.selected)
         if not content_item:
             return
         
         try:
-            with open(content_item['path'], 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Already open: switch to its tab, unsaved edits and all
+            tab = self.buffers.find(content_item['path'])
+            if tab:
+                self.show_tab(tab)
+                return
             
-            # Clear all fields first
-            self.title_entry.delete(0, tk.END)
-            self.category_entry.delete(0, tk.END)
-            self.tags_entry.delete(0, tk.END)
-            self.date_entry.delete(0, tk.END)
-            self.description_entry.delete(0, tk.END)
-            
-            # Parse frontmatter
-            if content.startswith("---"):
-                parts = content.split("---", 2)
-                if len(parts) >= 3:
-                    frontmatter = parts[1].strip()
-                    body = parts[2].strip()
-                    
-                    # Parse metadata
-                    for line in frontmatter.split('\n'):
-                        line = line.strip()
-                        if line.startswith("title:"):
-                            title = re.sub(r'title:\s*["\']?([^"\'\n]+)["\']?', r'\1', line)
-                            self.title_entry.insert(0, title)
-                        elif line.startswith("categories:"):
-                            cat = line.replace("categories:", "").strip()
-                            self.category_entry.insert(0, cat)
-                        elif line.startswith("tags:"):
-                            tags = line.replace("tags:", "").strip().strip("[]")
-                            tags = re.sub(r'["\']', '', tags)
-                            self.tags_entry.insert(0, tags)
-                        elif line.startswith("date:"):
-                            date = line.replace("date:", "").strip()
-                            self.date_entry.insert(0, date)
-                        elif line.startswith("description:"):
-                            desc = line.replace("description:", "").strip().strip('"')
-                            self.description_entry.insert(0, desc)
-                    
-                    self.editor.delete(1.0, tk.END)
-                    self.editor.insert(1.0, body)
-            else:
-                self.editor.delete(1.0, tk.END)
-                self.editor.insert(1.0, content)
-                
-            self.current_file = content_item['path']
-            self.current_content_type = content_item['type']
-            self.unsaved_changes = False
-            self.update_title()
-            self.refresh_preview()
+            front_matter, body = self.core.read(content_item['path'])
+            tab = EditorTab(content_item['path'], content_item['type'],
+                            self.front_matter_fields(front_matter), front_matter)
+            self.open_tab(tab, body)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load content: {str(e)}")
@@ -508,42 +5092,29 @@ class BlogManager:
         self.load_selected_content(event)
     
     def new_content(self):
-        """Create new content (post or page)"""
-        if self.unsaved_changes:
-            result = messagebox.askyesnocancel("Unsaved Changes", "Save before creating new content?")
-            if result is None:
-                return
-            elif result:
-                self.save_post()
-        
-        self.title_entry.delete(0, tk.END)
-        self.category_entry.delete(0, tk.END)
-        self.tags_entry.delete(0, tk.END)
-        self.description_entry.delete(0, tk.END)
-        self.date_entry.delete(0, tk.END)
-        
+        """Create new content (post or page) in a new tab"""
         if self.content_type.get() == "Posts":
-            self.category_entry.insert(0, "blog")
-            self.date_entry.insert(0, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-            self.editor.delete(1.0, tk.END)
-            self.editor.insert(1.0, "# Your Post Title\n\nWrite your content here...")
+            fields = {'categories': "blog", 'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+            body = "# Your Post Title\n\nWrite your content here..."
         else:
-            self.editor.delete(1.0, tk.END)
-            self.editor.insert(1.0, "# Your Page Title\n\nWrite your page content here...")
+            fields = {}
+            body = "# Your Page Title\n\nWrite your page content here..."
         
-        self.current_file = None
-        self.current_content_type = self.content_type.get().lower()[:-1]  # "Posts" -> "post"
-        self.unsaved_changes = False
-        self.update_title()
-        self.refresh_preview()
+        content_type = self.content_type.get().lower()[:-1]  # "Posts" -> "post"
+        self.open_tab(EditorTab(None, content_type, fields), body)
     
     def new_post(self):
         """Legacy method for compatibility"""
         self.content_type.set("Posts")
         self.new_content()
     
+    @traced('save')
     def save_post(self):
         """Save current content (post or page)"""
+        if self.editor_hook.suspended:
+            messagebox.showinfo("Loading", "Wait for the file to finish loading before saving.")
+            return
+        
         title = self.title_entry.get().strip()
         if not title:
             messagebox.showerror("Error", "Title is required!")
@@ -554,66 +5125,25 @@ class BlogManager:
         if not hasattr(self, 'current_content_type'):
             is_post = self.content_type.get() == "Posts"
         
-        if is_post:
-            # Generate filename for posts
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            slug = self.create_slug(title)
-            filename = f"{date_str}-{slug}.md"
-            filepath = self.current_file if self.current_file else self.posts_dir / filename
-        else:
-            # For pages, use existing filename or create based on title
-            if self.current_file:
-                filepath = self.current_file
-            else:
-                slug = self.create_slug(title)
-                filepath = Path(f"{slug}.md")
-        
-        # Build content
-        content = "---\n"
-        
-        if is_post:
-            content += f'layout: post\n'
-            content += f'title: "{title}"\n'
-            content += f'date: {self.date_entry.get()}\n'
-            content += f'categories: {self.category_entry.get()}\n'
-            
-            description = self.description_entry.get().strip()
-            if description:
-                content += f'description: "{description}"\n'
-
-            tags = self.tags_entry.get().strip()
-            if tags:
-                tags_list = [t.strip() for t in tags.split(",") if t.strip()]
-                content += f'tags: [{", ".join(tags_list)}]\n'
-        else:
-            # Page layout
-            if 'index' in str(filepath):
-                content += f'layout: home\n'
-            else:
-                content += f'layout: page\n'
-            content += f'title: "{title}"\n'
-            
-            # Add permalink for pages
-            if 'about' in str(filepath):
-                content += 'permalink: /about/\n'
-            elif 'posts' in str(filepath):
-                content += 'permalink: /posts/\n'
-            elif 'categories' in str(filepath):
-                content += 'permalink: /categories/\n'
-            elif 'tags' in str(filepath):
-                content += 'permalink: /tags/\n'
-        
-        content += "---\n\n"
-        content += self.editor.get(1.0, tk.END).strip()
-        
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            filepath = self.core.save(
+                title,
+                self.document.text(),
+                is_post=is_post,
+                filepath=self.current_file,
+                date=self.date_entry.get(),
+                categories=self.category_entry.get(),
+                tags=self.tags_entry.get(),
+                description=self.description_entry.get()
+            )
             
             self.current_file = filepath
             self.unsaved_changes = False
+            self.buffers.active.front_matter = self.current_front_matter()
             self.update_title()
-            self.load_content_list()
+            if self.watcher:
+                self.watcher.acknowledge(filepath)
+            self.apply_content_events([('modified', filepath)])
             self.status_bar.config(text=f"Saved: {filepath.name}")
             messagebox.showinfo("Success", f"Content saved: {filepath.name}")
         except Exception as e:
@@ -621,10 +5151,7 @@ class BlogManager:
     
     def create_slug(self, title):
         """Create URL slug from title"""
-        slug = title.lower()
-        slug = re.sub(r'[^\w\s-]', '', slug)
-        slug = re.sub(r'[\s_-]+', '-', slug)
-        return slug.strip('-')
+        return self.core.create_slug(title)
     
     def delete_content(self):
         """Delete current content (post or page)"""
@@ -633,20 +5160,65 @@ class BlogManager:
             return
         
         # Don't allow deletion of important pages
-        important_pages = ['index.md', 'about.md']
-        if self.current_file.name in important_pages:
+        if self.current_file.name in self.core.PROTECTED_PAGES and not self.core.is_post(self.current_file):
             messagebox.showerror("Error", f"Cannot delete {self.current_file.name} - it's an important page!")
             return
         
         if messagebox.askyesno("Delete Content", f"Delete {self.current_file.name}?"):
             try:
-                self.current_file.unlink()
-                self.new_content()
-                self.load_content_list()
+                deleted_file = self.current_file
+                self.core.delete(deleted_file)
+                self.discard_tab(self.buffers.active)
+                if self.watcher:
+                    self.watcher.acknowledge(deleted_file)
+                self.apply_content_events([('deleted', deleted_file)])
                 messagebox.showinfo("Success", "Content deleted")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete: {str(e)}")
     
+    def rename_taxonomy(self, field_name):
+        """Rename, merge or delete a tag or category across every post"""
+        label = "tag" if field_name == 'tags' else "category"
+        old = simpledialog.askstring(f"Rename {label}", f"Existing {label} (comma-separate several to merge):")
+        if not old or not old.strip():
+            return
+        new = simpledialog.askstring(f"Rename {label}", f"New name for '{old}' (leave empty to delete):")
+        if new is None:
+            return
+        
+        operations = [('rename', field_name, name.strip(), new.strip()) if new.strip()
+                      else ('delete', field_name, name.strip())
+                      for name in old.split(",") if name.strip()]
+        
+        try:
+            changes, errors = self.core.bulk_rewrite(operations, dry_run=True)
+            if not changes:
+                messagebox.showinfo("Info", f"No posts use the {label} '{old}'")
+                return
+            if not messagebox.askyesno(f"Rename {label}", f"Update {len(changes)} posts?"):
+                return
+            
+            self.root.config(cursor="watch")
+            self.root.update_idletasks()
+            changes, errors = self.core.bulk_rewrite(operations)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to rewrite posts: {str(e)}")
+            return
+        finally:
+            self.root.config(cursor="")
+        
+        for path, diff in changes:
+            if self.watcher:
+                self.watcher.acknowledge(path)
+        self.apply_content_events([('modified', path) for path, diff in changes])
+        
+        if self.current_file and any(path == Path(self.current_file) for path, diff in changes):
+            self.status_bar.config(text=f"Updated {len(changes)} posts (including the open post - reload it to see the change)")
+        else:
+            self.status_bar.config(text=f"Updated {len(changes)} posts")
+        if errors:
+            messagebox.showwarning("Warning", "\n".join(f"{path}: {error}" for path, error in errors[:10]))
+    
     def delete_post(self):
         """Legacy method for compatibility"""
         self.delete_content()
@@ -663,30 +5235,14 @@ class BlogManager:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
                 
-                if content.startswith("---"):
-                    parts = content.split("---", 2)
-                    if len(parts) >= 3:
-                        frontmatter = parts[1]
-                        body = parts[2].strip()
-                        
-                        title_match = re.search(r'title:\s*["\']?([^"\'\n]+)', frontmatter)
-                        if title_match:
-                            self.title_entry.delete(0, tk.END)
-                            self.title_entry.insert(0, title_match.group(1))
-                        
-                        self.editor.delete(1.0, tk.END)
-                        self.editor.insert(1.0, body)
+                front_matter, body = split_front_matter(content)
+                if front_matter:
+                    fields = self.front_matter_fields(front_matter)
                 else:
-                    title = Path(file_path).stem.replace("-", " ").replace("_", " ").title()
-                    self.title_entry.delete(0, tk.END)
-                    self.title_entry.insert(0, title)
-                    self.editor.delete(1.0, tk.END)
-                    self.editor.insert(1.0, content)
+                    fields = {'title': Path(file_path).stem.replace("-", " ").replace("_", " ").title()}
                 
-                self.current_file = None
-                self.unsaved_changes = True
-                self.update_title()
-                self.refresh_preview()
+                content_type = self.content_type.get().lower()[:-1]
+                self.open_tab(EditorTab(None, content_type, fields, unsaved=True), body)
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to import: {str(e)}")
@@ -745,36 +5301,122 @@ class BlogManager:
         
         text_entry.focus()
     
+    @traced('image.insert')
     def insert_image(self):
-        """Insert image"""
-        file_path = filedialog.askopenfilename(
-            title="Select Image",
+        """Insert images as responsive <picture> markup, encoding in a process pool"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select Images",
             filetypes=[("Images", "*.png *.jpg *.jpeg *.gif *.bmp *.webp"), ("All", "*.*")]
         )
         
-        if file_path:
+        for file_path in file_paths:
             try:
-                filename = Path(file_path).name
-                dest = self.assets_dir / filename
+                pending = {job['digest']: job for job in self.image_jobs}
+                digest, stem, result = self.core.prepare_image(file_path, pending)
                 
-                counter = 1
-                while dest.exists():
-                    name, ext = Path(filename).stem, Path(filename).suffix
-                    filename = f"{name}_{counter}{ext}"
-                    dest = self.assets_dir / filename
-                    counter += 1
+                alt = simpledialog.askstring("Alt Text", "Enter alt text:", initialvalue=Path(file_path).stem)
+                alt = alt or Path(file_path).stem
                 
-                shutil.copy2(file_path, dest)
+                # Identical bytes are already in assets/img
+                if result:
+                    self.editor.insert(tk.INSERT, image_markup(result, alt))
+                    self.on_editor_change()
+                    self.status_bar.config(text=f"Image already stored: {stem}")
+                    continue
                 
-                alt = simpledialog.askstring("Alt Text", "Enter alt text:", initialvalue=Path(filename).stem)
-                alt = alt or Path(filename).stem
+                if digest in pending:
+                    future, stem = pending[digest]['future'], pending[digest]['stem']
+                else:
+                    if self.image_pool is None:
+                        self.image_pool = ProcessPoolExecutor(max_workers=self.IMAGE_WORKERS)
+                    future = self.image_pool.submit(process_image, file_path, self.assets_dir, stem)
                 
-                image_md = f"![{alt}](/assets/img/{filename})\n"
-                self.editor.insert(tk.INSERT, image_md)
-                self.status_bar.config(text=f"Image inserted: {filename}")
+                # Placeholder keeps the image's position while it encodes
+                placeholder = f"<!-- processing image {stem} {len(self.image_jobs)} -->"
+                self.editor.insert(tk.INSERT, placeholder + "\n")
+                self.image_jobs.append({'future': future, 'digest': digest, 'stem': stem,
+                                        'alt': alt, 'placeholder': placeholder,
+                                        'tab': self.buffers.active, 'submitted': time.perf_counter()})
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to insert image: {str(e)}")
+        
+        if self.image_jobs:
+            self.status_bar.config(text=f"Processing {len(self.image_jobs)} image(s)...")
+            if self.image_poll is None:
+                self.image_poll = self.root.after(self.IMAGE_POLL_MS, self.poll_image_jobs)
+    
+    def poll_image_jobs(self):
+        """Replace placeholders with markup for finished image jobs
+        
+        Each job patches the tab it was started in, even if that tab has
+        gone to the background. When its placeholder is gone (the tab was
+        closed or reloaded), the markup is copied to the clipboard instead.
+        """
+        self.image_poll = None
+        pending = []
+        for job in self.image_jobs:
+            # The editor may still be loading the tab's text
+            if not job['future'].done() or (job['tab'] is self.buffers.active and self.editor_hook.suspended):
+                pending.append(job)
+                continue
+            
+            if TRACER.enabled:
+                TRACER.record('image.process', job['submitted'], time.perf_counter() - job['submitted'],
+                              {'stem': job['stem']})
+            try:
+                result = job['future'].result()
+                self.core.record_image(job['digest'], job['stem'], result)
+                markup = image_markup(result, job['alt'])
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to insert image: {str(e)}")
+                markup = ""
+            
+            if self.replace_placeholder(job['tab'], job['placeholder'], markup):
+                if markup:
+                    self.status_bar.config(text=f"Image inserted: {job['stem']}")
+            elif markup:
+                self.root.clipboard_clear()
+                self.root.clipboard_append(markup)
+                self.status_bar.config(text=f"⚠ Placeholder for {job['stem']} is gone - image markup copied to clipboard")
+        
+        self.image_jobs = pending
+        if pending:
+            self.image_poll = self.root.after(self.IMAGE_POLL_MS, self.poll_image_jobs)
+    
+    def replace_placeholder(self, tab, placeholder, markup):
+        """Put markup where an image placeholder is in tab's text; False if it's not there any more"""
+        if tab is not self.buffers.active:
+            if not self.buffers.replace_text(tab, placeholder + "\n", markup):
+                return False
+            self.tab_bar.tab(tab.frame, text=tab.label)
+            return True
+        
+        start = self.editor.search(placeholder, "1.0", stopindex=tk.END)
+        if not start:
+            return False
+        self.editor.delete(start, f"{start}+{len(placeholder) + 1}c")
+        self.editor.insert(start, markup)
+        self.on_editor_change()
+        return True
+    
+    def clean_unused_images(self):
+        """Find images in assets/img that nothing references and offer to delete them"""
+        try:
+            orphans = self.core.find_orphaned_assets()
+            if not orphans:
+                messagebox.showinfo("Unused Images", "Every image in assets/img is referenced.")
+                return
+            
+            listing = "\n".join(orphans[:20])
+            if len(orphans) > 20:
+                listing += f"\n... and {len(orphans) - 20} more"
+            if messagebox.askyesno("Unused Images", f"Delete {len(orphans)} unreferenced file(s)?\n\n{listing}"):
+                self.core.remove_assets(orphans)
+                self.status_bar.config(text=f"Removed {len(orphans)} unused image(s)")
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to clean up images: {str(e)}")
     
     def insert_code_block(self):
         """Insert code block"""
@@ -792,102 +5434,308 @@ class BlogManager:
         """Insert list item"""
         self.editor.insert(tk.INSERT, "- ")
     
+    def preview_range(self):
+        """(start, end) line slice to preview: everything, or the part around the cursor for large files"""
+        if not self.large_file:
+            return 0, len(self.document)
+        
+        line = int(self.editor.index(tk.INSERT).split('.')[0])
+        start = max(0, line - 1 - self.LARGE_PREVIEW_LINES // 4)
+        
+        # Prefer a blank line outside code fences, so the slice renders as it would in full
+        fences = self.highlighter.fences
+        for boundary in range(start, max(0, start - self.LARGE_PREVIEW_LINES // 2), -1):
+            in_fence = boundary + 1 < len(fences) and fences[boundary + 1]
+            if not self.document.lines[boundary - 1].strip() and not in_fence:
+                start = boundary
+                break
+        return start, min(len(self.document), start + self.LARGE_PREVIEW_LINES)
+    
+    def preview_key(self):
+        return (self.document.version, *self.preview_range())
+    
     def refresh_preview(self):
-        """Refresh markdown preview"""
-        try:
-            content = self.editor.get(1.0, tk.END).strip()
-            if content:
-                html = markdown.markdown(content, extensions=['codehilite', 'tables', 'toc'])
-                
-                self.preview_text.config(state=tk.NORMAL)
-                self.preview_text.delete(1.0, tk.END)
-                self.preview_text.insert(1.0, html)
-                self.preview_text.config(state=tk.DISABLED)
-            else:
-                self.preview_text.config(state=tk.NORMAL)
-                self.preview_text.delete(1.0, tk.END)
-                self.preview_text.config(state=tk.DISABLED)
-                
-        except Exception as e:
+        """Refresh markdown preview on the background render thread"""
+        self.last_preview_key = self.preview_key()
+        content = self.document.text(*self.last_preview_key[1:]).strip()
+        self.preview_stale = False
+        self.preview_worker.submit(content)
+        self.push_browser_preview()
+        if self._preview_poll_id is None:
+            self._preview_poll_id = self.root.after(self.PREVIEW_POLL_MS, self.poll_preview_results)
+    
+    def poll_preview_results(self):
+        """Show the newest finished render, dropping stale ones"""
+        self._preview_poll_id = None
+        latest = None
+        while True:
+            try:
+                result = self.preview_worker.results.get_nowait()
+            except queue.Empty:
+                break
+            if result[0] == self.preview_worker.generation:
+                latest = result
+        
+        if latest is None:
+            self._preview_poll_id = self.root.after(self.PREVIEW_POLL_MS, self.poll_preview_results)
+            return
+        
+        generation, html, error, seconds = latest
+        self.preview_debounce.record(seconds * 1000)
+        self.preview_timing_label.config(
+            text=f"Preview: {seconds * 1000:.0f} ms render, {self.preview_debounce.interval_ms} ms delay")
+        
+        if error is not None:
+            self.show_preview(f"Preview error: {str(error)}")
+        else:
+            self.show_preview(html or "")
+            self.shown_preview = (self.last_preview_key, html or "")
+    
+    def show_preview(self, html):
+        with TRACER.span('preview.widget'):
             self.preview_text.config(state=tk.NORMAL)
             self.preview_text.delete(1.0, tk.END)
-            self.preview_text.insert(1.0, f"Preview error: {str(e)}")
+            if html:
+                self.preview_text.insert(1.0, html)
             self.preview_text.config(state=tk.DISABLED)
     
+    def current_front_matter(self):
+        """Front matter for the editor's current fields, keeping unknown keys from disk"""
+        extra = {}
+        layout = ""
+        tab = self.buffers.active
+        if tab and tab.front_matter:
+            layout = tab.front_matter.layout
+            extra = tab.front_matter.extra
+        elif self.current_file and Path(self.current_file).exists():
+            meta = self.post_index.lookup(self.current_file)
+            layout = meta.layout
+            extra = meta.extra
+        return FrontMatter(
+            title=self.title_entry.get().strip(),
+            date=self.date_entry.get().strip(),
+            categories=self.category_entry.get().strip(),
+            tags=[t.strip() for t in self.tags_entry.get().split(",") if t.strip()],
+            description=self.description_entry.get().strip(),
+            layout=layout,
+            extra=extra
+        )
+    
+    def preview_request(self):
+        """(front matter, body, path, is_post) for the page being edited"""
+        content = self.document.text().strip()
+        is_post = self.current_file is None or self.core.is_post(self.current_file)
+        return self.current_front_matter(), content, self.current_file, is_post
+    
     def preview_in_browser(self):
-        """Preview post in browser"""
-        try:
-            content = self.editor.get(1.0, tk.END).strip()
-            html_content = markdown.markdown(content, extensions=['codehilite', 'tables', 'toc'])
-            
-            html_template = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>{self.title_entry.get() or 'Preview'}</title>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; 
-               max-width: 800px; margin: 0 auto; padding: 2rem; line-height: 1.6; }}
-        pre {{ background: #f5f5f5; padding: 1rem; overflow-x: auto; }}
-        code {{ background: #f5f5f5; padding: 0.2rem; }}
-        blockquote {{ border-left: 4px solid #ccc; margin: 1rem 0; padding-left: 1rem; color: #666; }}
-        table {{ border-collapse: collapse; width: 100%; }}
-        th, td {{ border: 1px solid #ddd; padding: 0.5rem; text-align: left; }}
-        th {{ background: #f5f5f5; }}
-    </style>
-</head>
-<body>{html_content}</body>
-</html>"""
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False) as f:
-                f.write(html_template)
-                temp_path = f.name
-            
-            webbrowser.open(f"file://{temp_path}")
+        """Open the live browser preview, rendered through the site's own layouts"""
+        try:
+            if self.preview_server is None:
+                self.preview_server = LivePreviewServer(self.site_preview).start()
+            self.preview_server.render_now(*self.preview_request())
+            
+            # Pages that are already open update themselves
+            if not self.preview_server.clients:
+                webbrowser.open(self.preview_server.url)
+            self.status_bar.config(text=f"Live preview at {self.preview_server.url}")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to preview: {str(e)}")
     
+    def push_browser_preview(self):
+        if self.preview_server and self.preview_server.clients:
+            self.preview_server.update(*self.preview_request())
+    
+    @traced('server.start')
     def serve_locally(self):
-        """Start local Jekyll server and open in browser"""
-        if self.jekyll_process and self.jekyll_process.poll() is None:
-            # Server is already running, just open browser
-            webbrowser.open("http://127.0.0.1:4000/")
-            self.status_bar.config(text="Local server already running - opened in browser")
+        """Start the local Jekyll server and open the browser once it is ready"""
+        if self.jekyll_server and self.jekyll_server.running():
+            if self.jekyll_server.ready:
+                webbrowser.open(self.jekyll_server.url)
+                self.status_bar.config(text="Local server already running - opened in browser")
+            else:
+                self.open_site_when_ready = True
             return
         
         try:
-            # Start Jekyll server
             self.status_bar.config(text="Starting local server...")
-            self.root.update()
-            
-            self.jekyll_process = subprocess.Popen(
-                ["bundle", "exec", "jekyll", "serve"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=os.getcwd()
-            )
+            self.server_log.clear()
+            if self.server_log_text:
+                self.server_log_text.delete(1.0, tk.END)
             
-            # Wait a moment for server to start
-            self.root.after(3000, self.open_local_site)
-            self.status_bar.config(text="Local server starting...")
+            self.jekyll_server = JekyllServer(Path.cwd()).start()
+            self.open_site_when_ready = True
+            self.root.after(self.SERVER_POLL_MS, self.poll_jekyll_server)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start server: {str(e)}")
             self.status_bar.config(text="Failed to start server")
     
-    def open_local_site(self):
-        """Open local site in browser after server starts"""
-        webbrowser.open("http://127.0.0.1:4000/")
-        self.status_bar.config(text="Local server running at http://127.0.0.1:4000/")
+    def poll_jekyll_server(self):
+        """Stream server output to the log panel and react to readiness and rebuilds"""
+        server = self.jekyll_server
+        if server is None:
+            return
+        
+        new_lines = []
+        exited = None
+        try:
+            while True:
+                event = server.events.get_nowait()
+                kind = event[0]
+                if kind == 'log':
+                    new_lines.append(event[1])
+                elif kind == 'ready':
+                    self.status_bar.config(text=f"Local server running at {event[1]}")
+                    if self.open_site_when_ready:
+                        webbrowser.open(event[1])
+                        self.open_site_when_ready = False
+                elif kind == 'regenerating':
+                    self.status_bar.config(text=f"Jekyll: {event[1]}")
+                elif kind == 'build':
+                    self.last_build_seconds = event[1]
+                    state = f"running at {server.url}" if server.ready else "building"
+                    self.status_bar.config(text=f"Local server {state} - last build {event[1]:.2f}s")
+                elif kind == 'exited':
+                    exited = event[1]
+        except queue.Empty:
+            pass
+        
+        if new_lines:
+            self.append_server_log(new_lines)
+        
+        if exited is None:
+            self.root.after(self.SERVER_POLL_MS, self.poll_jekyll_server)
+            return
+        
+        self.jekyll_server = None
+        if exited not in (0, -15):
+            self.status_bar.config(text=f"Local server exited with code {exited} - see server log")
+            self.show_server_log()
+        else:
+            self.status_bar.config(text="Local server stopped")
+    
+    def append_server_log(self, lines):
+        """Add lines to the bounded log history and the panel if it is open"""
+        self.server_log.extend(lines)
+        text = self.server_log_text
+        if not text:
+            return
+        
+        text.insert(tk.END, "\n".join(lines) + "\n")
+        excess = int(text.index('end-1c').split('.')[0]) - self.server_log.maxlen - 1
+        if excess > 0:
+            text.delete(1.0, f"{excess + 1}.0")
+        text.see(tk.END)
+    
+    def show_server_log(self):
+        """Open the Jekyll server log panel"""
+        if self.server_log_window and self.server_log_window.winfo_exists():
+            self.server_log_window.deiconify()
+            self.server_log_window.lift()
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Jekyll Server Log")
+        window.geometry("800x400")
+        
+        text = scrolledtext.ScrolledText(window, wrap=tk.NONE, font=('Consolas', 10))
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert(tk.END, "\n".join(self.server_log) + ("\n" if self.server_log else ""))
+        text.see(tk.END)
+        
+        def close():
+            self.server_log_text = None
+            self.server_log_window = None
+            window.destroy()
+        
+        window.protocol("WM_DELETE_WINDOW", close)
+        self.server_log_window = window
+        self.server_log_text = text
+    
+    def set_tracing(self):
+        TRACER.enabled = self.tracing.get()
+        self.status_bar.config(text="Recording timings" if TRACER.enabled else "Timing recording off")
+    
+    def show_diagnostics(self):
+        """Open the timing panel with rolling p50/p95 per traced operation"""
+        if self.diagnostics_window and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.deiconify()
+            self.diagnostics_window.lift()
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Diagnostics")
+        window.geometry("760x420")
+        
+        controls = ttk.Frame(window)
+        controls.pack(fill=tk.X, padx=10, pady=8)
+        ttk.Checkbutton(controls, text="Record timings", variable=self.tracing,
+                        command=self.set_tracing).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Export Chrome Trace...", command=self.export_trace).pack(side=tk.RIGHT)
+        ttk.Button(controls, text="Reset", command=TRACER.reset).pack(side=tk.RIGHT, padx=5)
+        
+        columns = ('count', 'p50', 'p95', 'max', 'total')
+        tree = ttk.Treeview(window, columns=columns, show='tree headings')
+        tree.heading('#0', text="Operation")
+        tree.column('#0', width=200)
+        for column, label in zip(columns, ("Count", "p50", "p95", "Max", "Total")):
+            tree.heading(column, text=label)
+            tree.column(column, width=100, anchor=tk.E)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        def close():
+            if self._diagnostics_after_id:
+                self.root.after_cancel(self._diagnostics_after_id)
+                self._diagnostics_after_id = None
+            self.diagnostics_window = None
+            self.diagnostics_tree = None
+            window.destroy()
+        
+        window.protocol("WM_DELETE_WINDOW", close)
+        self.diagnostics_window = window
+        self.diagnostics_tree = tree
+        self.refresh_diagnostics()
+    
+    def refresh_diagnostics(self):
+        """Redraw the diagnostics table, slowest total first, while the panel is open"""
+        self._diagnostics_after_id = None
+        if not self.diagnostics_tree:
+            return
+        
+        tree = self.diagnostics_tree
+        tree.delete(*tree.get_children())
+        for name, stats in sorted(TRACER.summary().items(), key=lambda item: -item[1]['total']):
+            tree.insert('', tk.END, text=name, values=(
+                stats['count'],
+                f"{stats['p50'] * 1000:.1f} ms",
+                f"{stats['p95'] * 1000:.1f} ms",
+                f"{stats['max'] * 1000:.1f} ms",
+                f"{stats['total']:.2f} s",
+            ))
+        self._diagnostics_after_id = self.root.after(self.DIAGNOSTICS_REFRESH_MS, self.refresh_diagnostics)
+    
+    def export_trace(self):
+        """Save recorded spans as Chrome trace-event JSON"""
+        path = filedialog.asksaveasfilename(
+            title="Export Chrome Trace",
+            defaultextension=".json",
+            initialfile=f"blog-manager-trace-{datetime.now():%Y%m%d-%H%M%S}.json",
+            filetypes=[("JSON", "*.json"), ("All", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            TRACER.export(path)
+            self.status_bar.config(text=f"Trace exported: {path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export trace: {str(e)}")
     
     def stop_local_server(self):
         """Stop local Jekyll server"""
-        if self.jekyll_process:
+        if self.jekyll_server and self.jekyll_server.running():
             try:
-                self.jekyll_process.terminate()
-                self.jekyll_process = None
+                self.jekyll_server.stop()
                 self.status_bar.config(text="Local server stopped")
                 messagebox.showinfo("Success", "Local server stopped")
             except Exception as e:
@@ -896,67 +5744,462 @@ class BlogManager:
             messagebox.showinfo("Info", "No local server is running")
     
     def publish_to_github(self):
-        """Publish changes to GitHub"""
+        """Commit the files the app changed and push them in the background"""
         if not self.repo:
             messagebox.showerror("Error", "No Git repository found!")
             return
         
+        if self.publish_job and self.publish_job.running():
+            messagebox.showinfo("Info", "A publish is already in progress.")
+            return
+        
         if self.unsaved_changes:
             result = messagebox.askyesno("Unsaved Changes", "Save current post before publishing?")
             if result:
                 self.save_post()
         
-        try:
-            # Check if there are changes to commit
-            if not self.repo.is_dirty():
-                messagebox.showinfo("Info", "No changes to publish!")
-                return
-            
-            # Add all changes
-            self.repo.git.add(A=True)
-            
-            # Commit with message
+        changes = self.core.pending_changes()
+        if not changes and not self.core.unpushed_commits():
+            messagebox.showinfo("Info", "No changes to publish!")
+            return
+        
+        commit_msg = None
+        if changes:
+            summary = self.core.describe_changes(changes).split("\n")[0]
             commit_msg = simpledialog.askstring(
                 "Commit Message", 
-                "Enter commit message:",
-                initialvalue=f"Updated blog post: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                f"Enter commit message for {len(changes)} changed file(s):",
+                initialvalue=summary
             )
             
             if not commit_msg:
                 return
-            
-            self.repo.index.commit(commit_msg)
-            
-            # Push to remote
-            try:
-                origin = self.repo.remotes.origin
-                origin.push()
-                messagebox.showinfo("Success", "Published to GitHub successfully!")
-                self.status_bar.config(text="Published successfully")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to push: {str(e)}")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to publish: {str(e)}")
+            # Keep the generated per-post listing unless the user wrote their own message
+            if commit_msg == summary:
+                commit_msg = None
+        
+        self.start_publish_job(commit_msg)
+    
+    def start_publish_job(self, message=None, auto=False):
+        self.publish_job = PublishJob(self.core, message).start()
+        self.publish_job_auto = auto
+        self.load_progress.config(value=0, maximum=1, mode='indeterminate')
+        self.load_progress.pack(side=tk.RIGHT, padx=5)
+        self.load_progress.start()
+        self.status_bar.config(text="Auto-publishing..." if auto else "Publishing...")
+        self.root.after(self.PUBLISH_POLL_MS, self.poll_publish_job)
+    
+    def poll_publish_queue(self):
+        """Start a batched publish when the auto publish policy says it's due"""
+        if not (self.publish_job and self.publish_job.running()) and self.publish_queue.due():
+            self.start_publish_job(auto=True)
+        self.root.after(self.PUBLISH_QUEUE_TICK_MS, self.poll_publish_queue)
+    
+    def set_publish_policy(self):
+        self.publish_queue.configure(policy=self.publish_policy.get())
+        self.settings['publish_policy'] = self.publish_policy.get()
+        self.core.save_settings(self.settings)
+    
+    def configure_publish_timing(self):
+        """Ask for the auto publish interval and idle delay"""
+        minutes = simpledialog.askinteger(
+            "Auto Publish", "Publish every how many minutes?",
+            initialvalue=self.publish_queue.interval_minutes, minvalue=1
+        )
+        if minutes is None:
+            return
+        seconds = simpledialog.askinteger(
+            "Auto Publish", "Publish after how many idle seconds?",
+            initialvalue=self.publish_queue.idle_seconds, minvalue=10
+        )
+        if seconds is None:
+            return
+        
+        self.publish_queue.configure(interval_minutes=minutes, idle_seconds=seconds)
+        self.settings.update(publish_interval_minutes=minutes, publish_idle_seconds=seconds)
+        self.core.save_settings(self.settings)
+    
+    def cancel_publish(self):
+        if self.publish_job and self.publish_job.running():
+            self.publish_job.cancel()
+            self.status_bar.config(text="Cancelling publish...")
+    
+    def poll_publish_job(self):
+        """Show push progress and report the result of the publish job"""
+        job = self.publish_job
+        finished = None
+        try:
+            while True:
+                event = job.events.get_nowait()
+                if event[0] == 'progress':
+                    _, stage, fraction = event
+                    if fraction is not None:
+                        self.load_progress.stop()
+                        self.load_progress.config(mode='determinate', value=fraction)
+                        self.status_bar.config(text=f"Publishing: {stage} {fraction:.0%}")
+                    else:
+                        self.status_bar.config(text=f"Publishing: {stage}...")
+                else:
+                    finished = event
+        except queue.Empty:
+            pass
+        
+        if finished is None:
+            self.root.after(self.PUBLISH_POLL_MS, self.poll_publish_job)
+            return
+        
+        self.load_progress.stop()
+        self.load_progress.config(mode='determinate')
+        self.load_progress.pack_forget()
+        
+        kind = finished[0]
+        if kind == 'done':
+            paths, pushed = finished[1], finished[2]
+            self.publish_queue.succeeded()
+            if pushed:
+                self.status_bar.config(text=f"Published {len(paths)} file(s) successfully")
+                if not self.publish_job_auto:
+                    messagebox.showinfo("Success", "Published to GitHub successfully!")
+            else:
+                self.status_bar.config(text="No changes to publish")
+        elif kind == 'cancelled':
+            self.status_bar.config(text=finished[1])
+        else:
+            delay = self.publish_queue.failed()
+            self.status_bar.config(text=f"Publish failed; retrying in {delay}s" if delay else "Publish failed")
+            if not self.publish_job_auto:
+                messagebox.showerror("Error", f"Failed to publish: {finished[1]}")
     
     def quit_app(self):
         """Quit application"""
-        if self.unsaved_changes:
-            result = messagebox.askyesnocancel("Unsaved Changes", "Save before exiting?")
+        unsaved = [tab for tab in self.buffers if tab.unsaved]
+        if unsaved:
+            result = messagebox.askyesnocancel("Unsaved Changes", f"Save changes in {len(unsaved)} open tab(s) before exiting?")
             if result is None:
                 return
             elif result:
-                self.save_post()
+                for tab in unsaved:
+                    try:
+                        self.show_tab(tab)
+                    except Exception as e:
+                        messagebox.showerror("Error", f"Failed to load content: {str(e)}")
+                        return
+                    self.save_post()
+                    if self.unsaved_changes:
+                        return
         
+        self.buffers.clear()
+        self.preview_worker.stop()
+        if self.publish_job and self.publish_job.running():
+            self.publish_job.cancel()
+        if self.jekyll_server:
+            self.jekyll_server.stop()
+        if self.preview_server:
+            self.preview_server.stop()
+        if self.image_pool:
+            self.image_pool.shutdown(wait=False)
         self.root.destroy()
 
 
-def main():
-    """Main entry point"""
+def run_gui():
+    """Launch the Tk editor"""
+    if tk is None:
+        sys.exit("tkinter is not available; use the command line interface (see --help)")
     root = tk.Tk()
-    app = BlogManager(root)
+    BlogManager(root)
     root.mainloop()
 
 
+def cli_list(core, args):
+    records = core.list_pages() if args.pages else core.list_posts()
+    
+    if args.query:
+        search_index = SearchIndex()
+        for path, meta in records:
+            search_index.add(str(path), meta, read_post_body(path))
+        by_id = {str(path): (path, meta) for path, meta in records}
+        records = [by_id[doc_id] for doc_id in search_index.search(args.query, by_id)]
+    
+    if args.json:
+        print(json.dumps([dict(meta.to_index(), path=str(path)) for path, meta in records], indent=2))
+    else:
+        for path, meta in records:
+            print(f"{path.name} - {meta.title or path.name}")
+
+
+def cli_path(core, path):
+    """A path argument, taken relative to the site root like --root promises"""
+    path = Path(path)
+    return path if path.is_absolute() else core.root_dir / path
+
+
+def cli_show(core, args):
+    front_matter, body = core.read(cli_path(core, args.path))
+    if front_matter:
+        print(json.dumps(front_matter.to_index(), indent=2, ensure_ascii=False))
+        print()
+    print(body)
+
+
+def cli_save(core, args):
+    if args.body_file == "-":
+        body = sys.stdin.read()
+    elif args.body_file:
+        with open(args.body_file, 'r', encoding='utf-8') as f:
+            body = f.read()
+    else:
+        body = ""
+    
+    filepath = core.save(
+        args.title,
+        body,
+        is_post=not args.page,
+        filepath=args.path and cli_path(core, args.path),
+        date=args.date or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        categories=args.category,
+        tags=args.tags,
+        description=args.description
+    )
+    print(f"Saved: {filepath}")
+
+
+def cli_image(core, args):
+    prepared = []
+    jobs = {}
+    with ProcessPoolExecutor() as pool:
+        for path in args.paths:
+            digest, stem, result = core.prepare_image(path, jobs)
+            if not result and digest not in jobs:
+                jobs[digest] = (stem, pool.submit(process_image, path, core.assets_dir, stem))
+            elif result:
+                print(f"✓ {path} already stored as {stem}", file=sys.stderr)
+            prepared.append((path, digest, result))
+        
+        for digest, (stem, future) in jobs.items():
+            core.record_image(digest, stem, future.result())
+    
+    for path, digest, result in prepared:
+        result = result or core.assets.lookup(digest)
+        print(image_markup(result, args.alt or Path(path).stem).strip() + "\n")
+
+
+def cli_orphans(core, args):
+    orphans = core.find_orphaned_assets()
+    for name in orphans:
+        print(core.assets_dir / name)
+    
+    if args.delete and orphans:
+        core.remove_assets(orphans)
+        print(f"✓ Removed {len(orphans)} unreferenced asset(s)", file=sys.stderr)
+    elif not orphans:
+        print("✓ No unreferenced assets", file=sys.stderr)
+
+
+def cli_render(core, args):
+    path = cli_path(core, args.path)
+    meta, body = core.read(path)
+    preview = SitePreview(core, IncrementalRenderer())
+    html_page = preview.render(meta or FrontMatter(), body, path=path, is_post=core.is_post(path))
+    
+    if args.output:
+        atomic_write(args.output, html_page)
+        print(f"Rendered: {args.output}")
+    else:
+        print(html_page)
+
+
+def cli_archives(core, args):
+    written = core.update_archives()
+    for path in written:
+        print(f"Updated: {path}")
+    if not written:
+        print("✓ Archives are up to date")
+
+
+def cli_delete(core, args):
+    path = cli_path(core, args.path)
+    core.delete(path)
+    print(f"Deleted: {path}")
+
+
+def cli_slug(core, args):
+    print(core.create_slug(args.title))
+
+
+def cli_publish(core, args):
+    job = PublishJob(core, args.message, push=not args.no_push).start()
+    
+    last_stage = None
+    while True:
+        try:
+            event = job.events.get()
+        except KeyboardInterrupt:
+            job.cancel()
+            continue
+        
+        if event[0] == 'progress':
+            if event[1] != last_stage:
+                print(f"{event[1]}...", file=sys.stderr)
+                last_stage = event[1]
+        elif event[0] == 'done' and event[2]:
+            print(f"Published {len(event[1])} file(s) successfully")
+            return
+        elif event[0] == 'done' and event[1]:
+            print(f"Committed {len(event[1])} file(s)")
+            return
+        elif event[0] == 'done':
+            print("No changes to publish!")
+            return
+        else:
+            sys.exit(f"❌ {event[1]}")
+
+
+def parse_rewrite_operations(args):
+    """Turn rewrite command options into bulk operation tuples"""
+    operations = []
+    
+    def pair(text, option):
+        old, sep, new = text.partition("=")
+        if not sep or not old.strip():
+            raise ValueError(f"{option} expects OLD=NEW, got {text!r}")
+        return old.strip(), new.strip()
+    
+    for field_name, label in (('tags', 'tag'), ('categories', 'category')):
+        for text in getattr(args, f"rename_{label}") or []:
+            old, new = pair(text, f"--rename-{label}")
+            for name in old.split(","):
+                operations.append(('rename', field_name, name.strip(), new))
+        for text in getattr(args, f"split_{label}") or []:
+            old, new = pair(text, f"--split-{label}")
+            operations.append(('split', field_name, old, [n.strip() for n in new.split(",") if n.strip()]))
+        for name in getattr(args, f"delete_{label}") or []:
+            operations.append(('delete', field_name, name.strip()))
+    
+    for text in args.set or []:
+        key, value = pair(text, "--set")
+        operations.append(('set', key, value if key in QUOTED_KEYS else parse_yaml_value(value)))
+    for key in args.unset or []:
+        operations.append(('unset', key.strip()))
+    return operations
+
+
+def cli_rewrite(core, args):
+    operations = parse_rewrite_operations(args)
+    if not operations:
+        raise ValueError("No operations given (see rewrite --help)")
+    
+    changes, errors = core.bulk_rewrite(operations, dry_run=args.dry_run, workers=args.workers)
+    if args.dry_run:
+        for path, diff in changes:
+            print(diff, end="")
+    for path, error in errors:
+        print(f"⚠ {path}: {error}", file=sys.stderr)
+    print(f"{'Would update' if args.dry_run else 'Updated'} {len(changes)} posts")
+
+
+def build_parser():
+    """Command line interface; with no command the GUI is started"""
+    parser = argparse.ArgumentParser(prog="blog_manager", description="Jekyll Blog Manager")
+    parser.add_argument("--root", default=".", help="Jekyll site directory (default: current directory)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Record timings, write them as Chrome trace JSON and print a summary on exit")
+    commands = parser.add_subparsers(dest="command")
+    
+    commands.add_parser("gui", help="Start the editor (default)")
+    
+    list_parser = commands.add_parser("list", help="List posts or pages")
+    list_parser.add_argument("--pages", action="store_true", help="List pages instead of posts")
+    list_parser.add_argument("--query", help="Search query (supports tag:, category:, after:, before:, date:)")
+    list_parser.add_argument("--json", action="store_true", help="Print metadata as JSON")
+    list_parser.set_defaults(handler=cli_list)
+    
+    show_parser = commands.add_parser("show", help="Print a post's metadata and body")
+    show_parser.add_argument("path")
+    show_parser.set_defaults(handler=cli_show)
+    
+    save_parser = commands.add_parser("save", help="Create or overwrite a post or page")
+    save_parser.add_argument("title")
+    save_parser.add_argument("--path", help="Existing file to overwrite (default: derived from title)")
+    save_parser.add_argument("--page", action="store_true", help="Save as a page instead of a post")
+    save_parser.add_argument("--date", help="Front matter date (default: now)")
+    save_parser.add_argument("--category", default="blog")
+    save_parser.add_argument("--tags", default="", help="Comma-separated tags")
+    save_parser.add_argument("--description", default="")
+    save_parser.add_argument("--body-file", help="Markdown body file, or - for stdin")
+    save_parser.set_defaults(handler=cli_save)
+    
+    delete_parser = commands.add_parser("delete", help="Delete a post or page")
+    delete_parser.add_argument("path")
+    delete_parser.set_defaults(handler=cli_delete)
+    
+    archives_parser = commands.add_parser("archives", help="Rebuild the tag, category and year archives in _data/")
+    archives_parser.set_defaults(handler=cli_archives)
+    
+    render_parser = commands.add_parser("render", help="Render a post through the site's layouts without Jekyll")
+    render_parser.add_argument("path")
+    render_parser.add_argument("-o", "--output", help="Write the HTML to a file instead of stdout")
+    render_parser.set_defaults(handler=cli_render)
+    
+    image_parser = commands.add_parser("image", help="Add images to assets/img as responsive variants and print markup")
+    image_parser.add_argument("paths", nargs="+")
+    image_parser.add_argument("--alt", help="Alt text (default: file name)")
+    image_parser.set_defaults(handler=cli_image)
+    
+    orphans_parser = commands.add_parser("orphans", help="List files in assets/img that no post or page references")
+    orphans_parser.add_argument("--delete", action="store_true", help="Remove them")
+    orphans_parser.set_defaults(handler=cli_orphans)
+    
+    slug_parser = commands.add_parser("slug", help="Print the URL slug for a title")
+    slug_parser.add_argument("title")
+    slug_parser.set_defaults(handler=cli_slug)
+    
+    rewrite_parser = commands.add_parser("rewrite", help="Bulk edit tags, categories or front matter keys in all posts")
+    for label in ("tag", "category"):
+        rewrite_parser.add_argument(f"--rename-{label}", action="append", metavar="OLD[,OLD...]=NEW",
+                                    help=f"Rename a {label}; several old names merge them")
+        rewrite_parser.add_argument(f"--split-{label}", action="append", metavar="OLD=NEW,NEW...",
+                                    help=f"Replace a {label} with several")
+        rewrite_parser.add_argument(f"--delete-{label}", action="append", metavar="NAME",
+                                    help=f"Remove a {label}")
+    rewrite_parser.add_argument("--set", action="append", metavar="KEY=VALUE", help="Set a front matter key; VALUE is read as YAML (true, 3, [a, b])")
+    rewrite_parser.add_argument("--unset", action="append", metavar="KEY", help="Remove a front matter key")
+    rewrite_parser.add_argument("--dry-run", action="store_true", help="Show a diff without writing")
+    rewrite_parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    rewrite_parser.set_defaults(handler=cli_rewrite)
+    
+    publish_parser = commands.add_parser("publish", help="Commit changed posts, pages and images and push")
+    publish_parser.add_argument("-m", "--message", help="Commit message (default: list the changed posts)")
+    publish_parser.add_argument("--no-push", action="store_true", help="Commit without pushing")
+    publish_parser.set_defaults(handler=cli_publish)
+    
+    return parser
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        TRACER.enabled = True
+        args.trace = os.path.abspath(args.trace)
+    
+    try:
+        if args.command in (None, "gui"):
+            if args.root != ".":
+                os.chdir(args.root)
+            run_gui()
+            return
+        
+        core = BlogCore(args.root)
+        try:
+            args.handler(core, args)
+        except (OSError, ValueError, RuntimeError) as e:
+            sys.exit(f"Error: {e}")
+    finally:
+        if args.trace:
+            TRACER.export(args.trace)
+            print(TRACER.format_summary(), file=sys.stderr)
+            print(f"✓ Trace written to {args.trace}", file=sys.stderr)
+
+
 if __name__ == "__main__":
     main()
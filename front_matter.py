@@ -0,0 +1,143 @@
+"""
+Jekyll front matter: the FrontMatter record and the header-only parser every loader shares
+"""
+
+import re
+import functools
+import importlib
+from dataclasses import dataclass, field
+
+# Returns the yaml module; blog_manager swaps in one that installs PyYAML when missing
+import_yaml = functools.partial(importlib.import_module, 'yaml')
+
+_front_matter_loader = None
+
+
+def front_matter_loader():
+    """Return a YAML loader that keeps dates as written instead of converting them"""
+    global _front_matter_loader
+    if _front_matter_loader is None:
+        yaml = import_yaml()
+        
+        class FrontMatterLoader(yaml.SafeLoader):
+            pass
+        
+        FrontMatterLoader.yaml_implicit_resolvers = {
+            key: [r for r in resolvers if r[0] != 'tag:yaml.org,2002:timestamp']
+            for key, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+        }
+        _front_matter_loader = FrontMatterLoader
+    return _front_matter_loader
+
+
+@dataclass
+class FrontMatter:
+    """Typed Jekyll front matter shared by every loader"""
+    
+    title: str = ""
+    date: str = ""
+    categories: str = ""
+    tags: list = field(default_factory=list)
+    description: str = ""
+    layout: str = ""
+    # Only an explicit `published: false` hides a post; the key also stays in extra
+    published: bool = True
+    extra: dict = field(default_factory=dict)
+    
+    # Fields kept in the metadata index
+    INDEX_FIELDS = ('title', 'date', 'categories', 'tags', 'description', 'layout', 'published')
+    
+    @classmethod
+    def from_mapping(cls, data):
+        """Build a record from parsed YAML, normalising lists and scalars"""
+        data = dict(data or {})
+        
+        def text(value):
+            return "" if value is None else str(value).strip()
+        
+        categories = data.pop('categories', data.pop('category', ""))
+        if isinstance(categories, (list, tuple)):
+            categories = " ".join(text(c) for c in categories if text(c))
+        
+        tags = data.pop('tags', [])
+        if isinstance(tags, str):
+            tags = re.split(r'[,\s]+', tags)
+        elif not isinstance(tags, (list, tuple)):
+            tags = [tags]
+        
+        return cls(
+            title=text(data.pop('title', "")),
+            date=text(data.pop('date', "")),
+            categories=text(categories),
+            tags=[text(t) for t in tags if text(t)],
+            description=text(data.pop('description', "")),
+            layout=text(data.pop('layout', "")),
+            published=data.get('published') is not False,
+            extra=data
+        )
+    
+    def to_index(self):
+        return {name: getattr(self, name) for name in self.INDEX_FIELDS}
+    
+    @classmethod
+    def from_index(cls, data):
+        return cls(**{name: data[name] for name in cls.INDEX_FIELDS if name in data})
+
+
+def parse_front_matter(text):
+    """Parse a YAML header into a FrontMatter, tolerating invalid YAML"""
+    yaml = import_yaml()
+    try:
+        data = yaml.load(text, Loader=front_matter_loader())
+        if isinstance(data, dict):
+            return FrontMatter.from_mapping(data)
+    except yaml.YAMLError:
+        pass
+    
+    # Fall back to simple `key: value` lines for headers YAML can't parse
+    data = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip() and not line.startswith((" ", "\t")):
+            value = value.strip()
+            if value.startswith("[") and value.endswith("]"):
+                value = [v.strip().strip('"\'') for v in value[1:-1].split(",")]
+            else:
+                value = value.strip('"\'')
+            data[key.strip()] = value
+    return FrontMatter.from_mapping(data)
+
+
+FRONT_MATTER_RE = re.compile(r'---[ \t]*\r?\n(.*?)^(?:---|\.\.\.)[ \t]*$\r?\n?', re.DOTALL | re.MULTILINE)
+
+
+def split_front_matter(content):
+    """Split file content into (FrontMatter or None, body)"""
+    if content.startswith("---"):
+        match = FRONT_MATTER_RE.match(content)
+        if match:
+            return parse_front_matter(match.group(1)), content[match.end():].strip()
+    return None, content
+
+
+def read_front_matter(path):
+    """Read only the header of a markdown file, stopping at the closing `---`"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if f.readline().rstrip() != "---":
+            return FrontMatter()
+        
+        lines = []
+        for line in f:
+            if line.rstrip() in ("---", "..."):
+                return parse_front_matter("".join(lines))
+            lines.append(line)
+    
+    # Unterminated header: not front matter
+    return FrontMatter()
+
+
+def read_post_body(path):
+    """Return the markdown body of a file with any frontmatter stripped"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return split_front_matter(content)[1]
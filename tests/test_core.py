@@ -0,0 +1,162 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import blog_manager as bm
+
+
+def make_core(tmp_path):
+    (tmp_path / "_posts").mkdir()
+    return bm.BlogCore(tmp_path)
+
+
+def test_save_dedupes_tag_spellings(tmp_path):
+    core = make_core(tmp_path)
+    
+    path = core.save("Hello", "Body", date="2024-01-01", categories="Notes notes",
+                     tags="Python, python, PYTHON , web")
+    
+    meta = bm.read_front_matter(path)
+    assert meta.tags == ['Python', 'web']
+    assert meta.categories == 'Notes'
+
+
+def test_save_reuses_established_spelling(tmp_path):
+    core = make_core(tmp_path)
+    core.save("First", "Body", date="2024-01-01", tags="python")
+    
+    path = core.save("Second", "Body", date="2024-01-02", tags="Python, PYTHON")
+    
+    assert bm.read_front_matter(path).tags == ['python']
+
+
+def test_content_status_includes_archive_data(tmp_path):
+    git = bm.require('git', 'gitpython')
+    git.Repo.init(tmp_path)
+    core = make_core(tmp_path)
+    (tmp_path / "_data").mkdir()
+    (tmp_path / "_data" / "tag_archive.json").write_text("[]\n", encoding='utf-8')
+    (tmp_path / "_data" / "other.yml").write_text("a: 1\n", encoding='utf-8')
+    
+    core.open_repo()
+    
+    assert core.pending_changes() == ["_data/tag_archive.json"]
+
+
+def write_post(core, name, tags):
+    path = core.posts_dir / name
+    path.write_text(f"---\nlayout: post\ntitle: {name}\ntags: [{', '.join(tags)}]\n---\nBody\n", encoding='utf-8')
+    return path
+
+
+def test_archives_group_tag_spellings(tmp_path):
+    core = make_core(tmp_path)
+    write_post(core, "2024-01-01-a.md", ["python"])
+    write_post(core, "2024-01-02-b.md", ["Python"])
+    write_post(core, "2024-01-03-c.md", ["python", "PYTHON"])
+    
+    core.update_archives()
+    
+    archive = json.loads((tmp_path / "_data" / "tag_archive.json").read_text(encoding='utf-8'))
+    assert [(e['name'], e['slug'], e['count']) for e in archive] == [("python", "python", 3)]
+    
+    write_post(core, "2024-01-01-a.md", ["Python"])
+    core.update_archives([core.posts_dir / "2024-01-01-a.md"])
+    archive = json.loads((tmp_path / "_data" / "tag_archive.json").read_text(encoding='utf-8'))
+    assert [(e['name'], e['count']) for e in archive] == [("Python", 3)]
+
+
+def archive_guard(core, page="tags.md"):
+    """Render the archive page's staleness check against the preview's site.posts"""
+    template = bm.read_post_body(Path(__file__).resolve().parent.parent / page)
+    guard = template[:template.index("\n", template.index("{% if site.data.archive_stats"))]
+    preview = bm.SitePreview(core, bm.IncrementalRenderer())
+    return bm.LiquidTemplate(guard + "DATA{% else %}LOOP{% endif %}").render({'site': preview.site_context()}).strip()
+
+
+def test_archive_pages_use_data_while_post_count_matches(tmp_path):
+    core = make_core(tmp_path)
+    write_post(core, "2024-01-01-a.md", ["python", "web"])
+    write_post(core, "2999-01-01-future.md", ["python"])
+    core.update_archives()
+    
+    for page in ("tags.md", "categories.md", "posts.md"):
+        assert archive_guard(core, page) == "DATA"
+    
+    write_post(core, "2024-01-02-b.md", ["go"])
+    assert archive_guard(core) == "LOOP"
+
+
+def test_archives_skip_unpublished_and_future_posts(tmp_path):
+    core = make_core(tmp_path)
+    write_post(core, "2024-01-01-a.md", ["python"])
+    write_post(core, "2999-01-01-future.md", ["python"])
+    path = write_post(core, "2024-01-02-draft.md", ["python"])
+    path.write_text(path.read_text(encoding='utf-8').replace("layout: post", "published: false"), encoding='utf-8')
+    
+    core.update_archives()
+    
+    stats = json.loads((tmp_path / "_data" / "archive_stats.json").read_text(encoding='utf-8'))
+    assert stats['posts'] == 1
+    
+    (tmp_path / "_config.yml").write_text("future: true\n", encoding='utf-8')
+    core.update_archives()
+    stats = json.loads((tmp_path / "_data" / "archive_stats.json").read_text(encoding='utf-8'))
+    assert stats['posts'] == 2
+
+
+def test_archives_and_taxonomies_build_from_given_posts(tmp_path, monkeypatch):
+    core = make_core(tmp_path)
+    path = write_post(core, "2024-01-01-a.md", ["python"])
+    posts = [(path, core.index.lookup(path))]
+    monkeypatch.setattr(core, 'list_posts', lambda: pytest.fail("posts were scanned again"))
+    monkeypatch.setattr(core.index, 'lookup', lambda *a: pytest.fail("post was statted again"))
+    
+    core.update_archives(posts=posts)
+    core.build_taxonomies(posts)
+    
+    assert core.archives.records[str(path)]['excerpt'] == "Body"
+    assert (tmp_path / "_data" / "archive_stats.json").exists()
+    assert core.taxonomy('tags').suggest("py") == [("python", 1)]
+
+
+def test_cli_delete_resolves_post_paths_against_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path.parent)
+    core = make_core(Path(tmp_path.name))
+    write_post(core, "2024-01-01-a.md", ["python"])
+    write_post(core, "2024-01-02-b.md", ["go"])
+    core.update_archives()
+    
+    assert core.is_post(tmp_path / "_posts" / "2024-01-01-a.md")
+    bm.main(["--root", tmp_path.name, "delete", "_posts/2024-01-01-a.md"])
+    
+    assert not (tmp_path / "_posts" / "2024-01-01-a.md").exists()
+    stats = json.loads((tmp_path / "_data" / "archive_stats.json").read_text(encoding='utf-8'))
+    assert stats['posts'] == 1
+
+
+def test_watcher_seeded_from_snapshot_reports_later_changes(tmp_path):
+    first = tmp_path / "a.md"
+    first.write_text("one", encoding='utf-8')
+    os.utime(tmp_path, ns=(0, 0))
+    snapshot = {str(tmp_path): (os.stat(tmp_path).st_mtime_ns, {first: os.stat(first)})}
+    (tmp_path / "b.md").write_text("two", encoding='utf-8')
+    
+    watcher = bm.ContentWatcher([tmp_path], snapshot=snapshot)
+    
+    assert watcher.poll() == [('added', tmp_path / "b.md")]
+    assert watcher.poll() == []
+
+
+def test_prepare_image_claims_no_stem_for_pending_duplicates(tmp_path):
+    core = make_core(tmp_path)
+    image = tmp_path / "photo.png"
+    image.write_bytes(b"not really a png")
+    
+    digest, stem, result = core.prepare_image(image)
+    assert (stem, result) == ("photo", None)
+    
+    assert core.prepare_image(image, {digest}) == (digest, None, None)
+    assert core.assets.claim_stem(image) == "photo_1"
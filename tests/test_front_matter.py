@@ -0,0 +1,51 @@
+import front_matter
+from front_matter import FrontMatter, parse_front_matter, read_front_matter, split_front_matter
+
+import blog_manager as bm
+
+
+def test_blog_manager_reexports_the_parser():
+    assert bm.FrontMatter is FrontMatter
+    assert bm.parse_front_matter is parse_front_matter
+    assert front_matter.import_yaml() is bm.require('yaml')
+
+
+def test_values_are_normalised():
+    meta = parse_front_matter("title: Hi\ndate: 2024-01-05 10:00:00 +0800\ncategories: [a, b]\ntags: x, y\norder: 3\n")
+    assert meta.title == "Hi"
+    assert meta.date == "2024-01-05 10:00:00 +0800"
+    assert meta.categories == "a b"
+    assert meta.tags == ["x", "y"]
+    assert meta.published
+    assert meta.extra == {'order': 3}
+
+
+def test_published_false_is_kept_in_extra():
+    meta = parse_front_matter("title: Draft\npublished: false\n")
+    assert not meta.published
+    assert meta.extra == {'published': False}
+
+
+def test_invalid_yaml_falls_back_to_key_value_lines():
+    meta = parse_front_matter('title: "Unclosed\ntags: [a, "b"]\n: nothing\n')
+    assert meta.title == "Unclosed"
+    assert meta.tags == ["a", "b"]
+
+
+def test_index_round_trip():
+    meta = FrontMatter(title="T", tags=["a"], published=False, extra={'x': 1})
+    assert FrontMatter.from_index(meta.to_index()) == FrontMatter(title="T", tags=["a"], published=False)
+
+
+def test_split_and_read_header(tmp_path):
+    content = "---\ntitle: Hi\n---\n\nBody text\n"
+    meta, body = split_front_matter(content)
+    assert (meta.title, body) == ("Hi", "Body text")
+    assert split_front_matter("No header") == (None, "No header")
+    
+    path = tmp_path / "post.md"
+    path.write_text(content, encoding='utf-8')
+    assert read_front_matter(path).title == "Hi"
+    
+    path.write_text("---\ntitle: Unterminated\n", encoding='utf-8')
+    assert read_front_matter(path) == FrontMatter()
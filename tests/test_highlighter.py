@@ -0,0 +1,247 @@
+import random
+import re
+
+import pytest
+
+import blog_manager as bm
+
+
+class FakeTk:
+    """Just enough of the Tcl interpreter for TextEditHook's command redirect"""
+    
+    def __init__(self, widget):
+        self.widget = widget
+        self.commands = {}
+    
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        if args[0] == 'rename':
+            return ""
+        name, *rest = args
+        if name == self.widget.orig_name:
+            return self.widget.raw(*rest)
+        return self.commands[name](*rest)
+    
+    def createcommand(self, name, function):
+        self.commands[name] = function
+
+
+class FakeText:
+    """In-memory Text widget: a buffer with per-character tags and Tk-style indices
+    
+    Like Tk, the buffer always ends with a newline. Idle callbacks run when
+    the test calls run_idle(). The viewport is `height` lines from `top`.
+    """
+    
+    _w = '.text'
+    orig_name = '.text_orig'
+    LINE_PIXELS = 10
+    
+    def __init__(self, text=""):
+        self.buffer = text + "\n"
+        self.tags = [set() for _ in self.buffer]
+        self.tk = FakeTk(self)
+        self.top = 1
+        self.height = 50
+        self.idle = []
+    
+    def cget(self, option):
+        return 'TkFixedFont'
+    
+    def configure(self, **options):
+        pass
+    
+    def bind(self, *args, **kwargs):
+        pass
+    
+    def after_idle(self, callback):
+        self.idle.append(callback)
+        return 'idle'
+    
+    def after(self, ms, callback):
+        self.idle.append(callback)
+        return 'after'
+    
+    def winfo_height(self):
+        return self.height * self.LINE_PIXELS
+    
+    def run_idle(self):
+        for _ in range(100000):
+            if not self.idle:
+                return
+            self.idle.pop(0)()
+        raise AssertionError("idle callbacks never settled")
+    
+    def lines(self):
+        return self.buffer[:-1].split('\n')
+    
+    def line_starts(self):
+        return [0] + [i + 1 for i, ch in enumerate(self.buffer) if ch == '\n']
+    
+    def offset(self, index):
+        base, modifiers = re.match(r'(.+?)((?:[+-]\d+c)*)$', index).groups()
+        last = len(self.buffer) - 1
+        if base == 'end':
+            offset = len(self.buffer)
+        elif base.startswith('@'):
+            y = int(base.split(',')[1])
+            offset = self.offset(f"{min(self.top + y // self.LINE_PIXELS, len(self.lines()))}.0")
+        else:
+            line, column = base.split('.')
+            starts = self.line_starts()
+            if int(line) > len(starts) - 1:
+                return last
+            start = starts[int(line) - 1]
+            end = self.buffer.index('\n', start)
+            offset = end if column == 'end' else min(start + int(column), end)
+        for delta in re.findall(r'[+-]\d+', modifiers):
+            offset += int(delta)
+        return max(0, min(offset, last if base != 'end' or modifiers else len(self.buffer)))
+    
+    def index(self, offset):
+        line = self.buffer.count('\n', 0, offset) + 1
+        column = offset - (self.buffer.rfind('\n', 0, offset) + 1)
+        return f"{line}.{column}"
+    
+    def clamp(self, index):
+        return min(self.offset(index), len(self.buffer) - 1)
+    
+    def raw(self, command, *args):
+        """The widget's own command, without TextEditHook's redirect"""
+        if command == 'index':
+            return self.index(len(self.buffer) if args[0] == 'end' else self.clamp(args[0]))
+        if command == 'get':
+            return self.buffer[self.offset(args[0]):self.offset(args[1])]
+        if command == 'insert':
+            at = self.clamp(args[0])
+            self.buffer = self.buffer[:at] + args[1] + self.buffer[at:]
+            self.tags[at:at] = [set() for _ in args[1]]
+            return ""
+        if command == 'delete' and len(args) > 2:
+            for i in range(len(args) - 2, -1, -2):
+                self.raw('delete', args[i], args[i + 1])
+            return ""
+        if command == 'delete':
+            start = self.clamp(args[0])
+            end = min(self.offset(args[1]) if len(args) > 1 else start + 1, len(self.buffer) - 1)
+            self.buffer = self.buffer[:start] + self.buffer[end:]
+            del self.tags[start:end]
+            return ""
+        if command == 'replace':
+            start, end, chars = self.clamp(args[0]), self.clamp(args[1]), args[2]
+            self.buffer = self.buffer[:start] + chars + self.buffer[end:]
+            self.tags[start:end] = [set() for _ in chars]
+            return ""
+        if command == 'tag':
+            operation, tag, *ranges = args
+            for i in range(0, len(ranges), 2):
+                for k in range(self.offset(ranges[i]), min(self.offset(ranges[i + 1]), len(self.buffer))):
+                    if operation == 'add':
+                        self.tags[k].add(tag)
+                    else:
+                        self.tags[k].discard(tag)
+            return ""
+        raise ValueError(command)
+    
+    # Edits a user or the app makes go through the redirected command
+    def insert(self, index, chars):
+        return self.tk.call(self._w, 'insert', index, chars)
+    
+    def delete(self, *indices):
+        return self.tk.call(self._w, 'delete', *indices)
+    
+    def replace(self, start, end, chars):
+        return self.tk.call(self._w, 'replace', start, end, chars)
+
+
+class Highlighter(bm.MarkdownHighlighter):
+    def configure_tags(self):
+        pass
+
+
+def attach(text):
+    hook = bm.TextEditHook(text)
+    document = bm.EditorDocument(hook)
+    return Highlighter(text, hook), document
+
+
+def mismatch(text, highlighter):
+    """First visible line whose tags differ from lexing the whole buffer again, or None"""
+    lines = text.lines()
+    starts = text.line_starts()
+    fence = ""
+    for number, line in enumerate(lines, 1):
+        spans = bm.markdown_line_spans(line, fence)
+        fence = bm.markdown_fence_after(line, fence)
+        if not text.top <= number <= text.top + text.height:
+            continue
+        
+        want = [set() for _ in range(len(line) + 1)]
+        for tag, start, end in spans:
+            full = tag in highlighter.FULL_LINE_TAGS
+            for k in range(len(line) + 1) if full else range(start, end):
+                want[k].add(tag)
+        if number == len(lines):
+            want = want[:len(line)]
+        got = [text.tags[starts[number - 1] + k] & set(highlighter.TAGS) for k in range(len(want))]
+        if got != want:
+            return number, line, spans
+    return None
+
+
+PIECES = ["# H", "text **b** *i*", "```", "~~~~", "code", "- l `c`", "> q", "", "```py", "[a](b)"]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_highlighting_matches_full_relex(seed):
+    rng = random.Random(seed)
+    text = FakeText("\n".join(rng.choice(PIECES) for _ in range(300)))
+    highlighter, document = attach(text)
+    text.run_idle()
+    assert mismatch(text, highlighter) is None
+    
+    for step in range(400):
+        lines = text.lines()
+        line = rng.randint(1, len(lines))
+        column = rng.randint(0, len(lines[line - 1]))
+        choice = rng.random()
+        if choice < 0.5:
+            text.insert(f"{line}.{column}", rng.choice(["x", "`", "\n", "```\n", "\n~~~~\n", "**", "# "]))
+        elif choice < 0.8:
+            text.delete(f"{line}.{column}")
+        elif choice < 0.9:
+            text.delete(f"{line}.0", f"{min(len(lines), line + rng.randint(0, 5))}.0")
+        elif choice < 0.95:
+            end = min(len(lines), line + rng.randint(0, 3))
+            text.replace(f"{line}.0", f"{end}.1", rng.choice(["a\n```\nb", "", "x\ny"]))
+        else:
+            text.delete("1.0", "1.1", "3.0", "4.0")
+        if rng.random() < 0.2:
+            text.top = rng.randint(1, max(1, len(text.lines()) - 10))
+            highlighter.schedule()
+        text.run_idle()
+        
+        assert document.lines == text.lines(), f"step {step}"
+        assert mismatch(text, highlighter) is None, f"step {step}"
+
+
+@pytest.mark.parametrize("line, fence, after", [
+    ("```python", "", "```"),
+    ("~~~~", "", "~~~~"),
+    ("```inline``` code", "", ""),
+    ("code", "```", "```"),
+    ("```", "```", ""),
+    ("````", "```", ""),
+    ("```", "````", "````"),
+    ("~~~", "```", "```"),
+    ("``` trailing", "```", "```"),
+])
+def test_markdown_fence_after(line, fence, after):
+    assert bm.markdown_fence_after(line, fence) == after
+
+
+def test_markdown_line_spans():
+    assert bm.markdown_line_spans("# Title") == [('md_heading', 0, 7)]
+    assert bm.markdown_line_spans("# Title", "```") == [('md_code_block', 0, 7)]
+    assert bm.markdown_line_spans("- see [a](b)") == [('md_list', 0, 1), ('md_link', 6, 9), ('md_url', 9, 12)]
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+import blog_manager as bm
+
+
+def render(source, **context):
+    return bm.LiquidTemplate(source).render(context)
+
+
+@pytest.mark.parametrize("source, context, expected", [
+    ("{{ page.title | upcase }}", {'page': {'title': "hi"}}, "HI"),
+    ("{{ missing.key | default: 'none' }}", {}, "none"),
+    ("{{ page.description }}|", {'page': {'description': None}}, "|"),
+    ("{{ tags | join: ', ' }}", {'tags': ["a", "b"]}, "a, b"),
+    ("{{ d | date: '%B %-d, %Y' }}", {'d': datetime(2024, 3, 5)}, "March 5, 2024"),
+    ("{{ 'Hello World!' | slugify }}", {}, "hello-world"),
+    ("{{ '<p>x</p>' | strip_html | escape }}", {}, "x"),
+    ("{{ posts | sort: 'n' | map: 'n' | join: '' }}", {'posts': [{'n': "b"}, {'n': "a"}]}, "ab"),
+])
+def test_output_and_filters(source, context, expected):
+    assert render(source, **context) == expected
+
+
+def test_conditions_treat_nil_and_false_as_falsy():
+    source = "{% if x %}yes{% elsif y == 2 %}two{% else %}no{% endif %}"
+    assert render(source, x="") == "yes"
+    assert render(source, x=None, y=2) == "two"
+    assert render(source, x=False) == "no"
+    assert render("{% unless x %}hidden{% endunless %}", x=None) == "hidden"
+    assert render("{% if list contains 'b' %}in{% endif %}", list=["a", "b"]) == "in"
+
+
+def test_for_loops():
+    source = "{% for i in items limit: 3 offset: 1 %}{{ forloop.index }}{{ i }}{% unless forloop.last %},{% endunless %}{% endfor %}"
+    assert render(source, items=["a", "b", "c", "d", "e"]) == "1b,2c,3d"
+    assert render("{% for i in items reversed %}{{ i }}{% else %}empty{% endfor %}", items=[1, 2]) == "21"
+    assert render("{% for i in items %}{{ i }}{% else %}empty{% endfor %}", items=[]) == "empty"
+
+
+def test_assign_capture_and_whitespace_control():
+    source = "{%- assign n = 'x' | append: 'y' -%}\n  {%- capture c -%} {{ n }} {%- endcapture -%}\n[{{ c }}]"
+    assert render(source) == "[xy]"
+
+
+def test_case_raw_and_comments():
+    assert render("{% case k %}{% when 'a', 'b' %}ab{% when 'c' %}c{% else %}?{% endcase %}", k="b") == "ab"
+    assert render("{% raw %}{{ not rendered }}{% endraw %}") == "{{ not rendered }}"
+    assert render("a{% comment %}{{ x }}{% endcomment %}b") == "ab"
+
+
+def test_unknown_tags_and_filters_degrade_quietly():
+    assert render("{% seo %}{{ 'x' | no_such_filter }}") == "x"
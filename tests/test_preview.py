@@ -0,0 +1,44 @@
+import blog_manager as bm
+
+
+def make_preview(tmp_path, config=""):
+    (tmp_path / "_posts").mkdir()
+    (tmp_path / "_config.yml").write_text(config, encoding='utf-8')
+    core = bm.BlogCore(tmp_path)
+    return core, bm.SitePreview(core, bm.IncrementalRenderer())
+
+
+def write(path, header, body="Body"):
+    path.write_text(f"---\n{header}---\n{body}\n", encoding='utf-8')
+    return path
+
+
+def test_post_record_missing_keys_are_nil(tmp_path):
+    core, preview = make_preview(tmp_path)
+    path = write(core.posts_dir / "2024-01-01-my-first-post.md", "layout: post\n")
+    
+    record = preview.post_record(path, core.index.lookup(path))
+    
+    assert record['title'] == "My First Post"
+    assert record['description'] is None
+
+
+def test_site_posts_skip_unpublished_and_future(tmp_path):
+    core, preview = make_preview(tmp_path)
+    write(core.posts_dir / "2024-01-01-live.md", "title: Live\n")
+    write(core.posts_dir / "2024-01-02-draft.md", "title: Draft\npublished: false\n")
+    write(core.posts_dir / "2999-01-01-later.md", "title: Later\n")
+    
+    assert [p['title'] for p in preview.site_context()['posts']] == ["Live"]
+    
+    (tmp_path / "_config.yml").write_text("future: true\n", encoding='utf-8')
+    assert [p['title'] for p in preview.site_context()['posts']] == ["Later", "Live"]
+
+
+def test_render_page_without_description(tmp_path):
+    core, preview = make_preview(tmp_path)
+    body = "{% if page.description %}described{% else %}bare{% endif %} {{ page.title }}"
+    
+    html = preview.render(bm.FrontMatter(layout="none"), body, path=core.posts_dir / "2024-01-01-hello-world.md")
+    
+    assert "bare Hello World" in html
@@ -0,0 +1,74 @@
+import subprocess
+
+import blog_manager as bm
+
+
+class StubCore:
+    def __init__(self, pending=()):
+        self.pending = list(pending)
+        self.last_change = 0.0
+    
+    def pending_changes(self):
+        return self.pending
+
+
+def test_manual_policy_never_retries():
+    queue = bm.PublishQueue(StubCore(["_posts/a.md"]), policy='manual')
+    
+    assert queue.failed() is None
+    assert not queue.due(now=queue.last_publish + 10 ** 6)
+
+
+def test_interval_policy_retries_with_backoff():
+    queue = bm.PublishQueue(StubCore(), policy='interval')
+    
+    delay = queue.failed()
+    
+    assert delay == bm.PublishQueue.RETRY_BASE_SECONDS
+    assert not queue.due(now=queue.retry_at - 1)
+    assert queue.due(now=queue.retry_at)
+    assert queue.failed() == 2 * delay
+
+
+def git(cwd, *args):
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=cwd, check=True,
+                   capture_output=True)
+
+
+def test_unpushed_commits_without_remote_branch(tmp_path):
+    git(tmp_path, "init", "-q")
+    for name in ("a", "b"):
+        (tmp_path / name).write_text(name, encoding='utf-8')
+        git(tmp_path, "add", name)
+        git(tmp_path, "commit", "-q", "-m", name)
+    core = bm.BlogCore(tmp_path)
+    core.open_repo()
+    
+    assert core.unpushed_commits() == 2
+    
+    git(tmp_path, "update-ref", f"refs/remotes/origin/{core.repo.active_branch.name}", "HEAD~1")
+    assert core.unpushed_commits() == 1
+
+
+def test_publish_commits_only_tracked_paths(tmp_path):
+    git(tmp_path, "init", "-q")
+    (tmp_path / "_posts").mkdir()
+    old = tmp_path / "_posts" / "2024-01-01-old.md"
+    old.write_text("---\ntitle: Old\n---\n", encoding='utf-8')
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "base")
+    (tmp_path / "notes.txt").write_text("mine", encoding='utf-8')
+    git(tmp_path, "add", "notes.txt")
+    
+    core = bm.BlogCore(tmp_path)
+    new = core.save("New", "Body", date="2024-01-02")
+    old.unlink()
+    core.track(old)
+    
+    staged, pushed = core.publish(push=False)
+    
+    assert {"_posts/2024-01-01-old.md", core.repo_path(new)} <= set(staged)
+    assert "notes.txt" not in staged
+    assert sorted(core.repo.head.commit.stats.files) == sorted(staged)
+    assert core.repo.git.diff("--cached", "--name-only") == "notes.txt"
+    assert not pushed
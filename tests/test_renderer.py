@@ -0,0 +1,46 @@
+import re
+
+import pytest
+
+import blog_manager as bm
+
+
+def full_render(text):
+    md = bm.require('markdown').Markdown(extensions=bm.IncrementalRenderer.EXTENSIONS)
+    return bm.IncrementalRenderer().add_heading_ids(md.convert(text))
+
+
+def normalize(html):
+    # Blocks are joined with one newline; Markdown sometimes uses two
+    return re.sub(r'>\s+<', '><', html).strip()
+
+
+@pytest.mark.parametrize("text", [
+    "<div>\n\nhello\n\n</div>\n\nafter",
+    "para\n\n<!-- a\n\nb -->\n\nafter",
+    "> a\n\n> b\n\nc",
+    "<div>\n<div>\n\nx\n\n</div>\n\ny\n</div>\n\nz",
+    "intro\n<div>\n\nx\n\n</div>",
+    "<hr>\n\nnext\n\n<span>inline</span>\n\nlast",
+    "# Title\n\n- one\n\n- two\n\n      code\n\n```\n<div>\n\n```\n\n## Title",
+    "text [link][ref]\n\n<details>\n<summary>s</summary>\n\nhidden\n\n</details>\n\n[ref]: http://example.com",
+])
+def test_render_matches_full_markdown(text):
+    assert normalize(bm.IncrementalRenderer().render(text)) == normalize(full_render(text))
+
+
+def test_raw_html_and_quotes_stay_one_block():
+    renderer = bm.IncrementalRenderer()
+    assert renderer.split_blocks("<div>\n\nhello\n\n</div>\n\nafter") == ["<div>\n\nhello\n\n</div>", "after"]
+    assert renderer.split_blocks("<!-- a\n\nb -->\n\nafter") == ["<!-- a\n\nb -->", "after"]
+    assert renderer.split_blocks("> a\n\n> b\n\nc") == ["> a\n\n> b", "c"]
+
+
+def test_unchanged_blocks_come_from_cache():
+    renderer = bm.IncrementalRenderer()
+    renderer.render("one\n\n<div>\n\ntwo\n\n</div>\n\nthree")
+    misses = renderer.misses
+    
+    renderer.render("one\n\n<div>\n\ntwo\n\n</div>\n\nthree changed")
+    
+    assert renderer.misses == misses + 1
@@ -0,0 +1,72 @@
+import os
+import stat
+
+import blog_manager as bm
+
+
+def test_atomic_write_keeps_existing_mode(tmp_path):
+    path = tmp_path / "post.md"
+    path.write_text("old", encoding='utf-8')
+    os.chmod(path, 0o644)
+    
+    bm.atomic_write(path, "new")
+    
+    assert path.read_text(encoding='utf-8') == "new"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+
+def test_atomic_write_new_file_uses_umask(tmp_path):
+    path = tmp_path / "new.md"
+    bm.atomic_write(path, "text")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~bm._UMASK
+
+
+POST = """---
+layout: post
+title: "Hello"
+categories: notes
+tags: [python, Web]
+---
+Body
+"""
+
+
+def test_set_writes_booleans_unquoted(tmp_path):
+    path = tmp_path / "2024-01-01-hello.md"
+    path.write_text(POST, encoding='utf-8')
+    args = bm.build_parser().parse_args(['rewrite', '--set', 'published=false', '--set', 'order=3'])
+    
+    _, diff, error = bm.rewrite_front_matter_file(path, bm.parse_rewrite_operations(args))
+    
+    assert not error and diff
+    text = path.read_text(encoding='utf-8')
+    assert "published: false\n" in text
+    assert "order: 3\n" in text
+    assert bm.read_front_matter(path).extra == {'published': False, 'order': 3}
+
+
+def test_set_quotes_strings_yaml_would_misread(tmp_path):
+    path = tmp_path / "2024-01-01-hello.md"
+    path.write_text(POST, encoding='utf-8')
+    
+    bm.rewrite_front_matter_file(path, [('set', 'version', "1.0"), ('set', 'title', "true")])
+    
+    assert bm.read_front_matter(path).extra['version'] == "1.0"
+    assert bm.read_front_matter(path).title == "true"
+
+
+def test_taxonomy_operations_leave_other_fields_alone(tmp_path):
+    path = tmp_path / "2024-01-01-hello.md"
+    text = POST.replace("tags: [python, Web]", "tags: [python, python,  Web]")
+    path.write_text(text, encoding='utf-8')
+    
+    bm.rewrite_front_matter_file(path, [('rename', 'categories', 'notes', 'journal')])
+    
+    assert path.read_text(encoding='utf-8') == text.replace("categories: notes", "categories: journal")
+
+
+def test_taxonomy_operations_without_a_match_change_nothing():
+    values = ['python', 'python', 'Web']
+    assert bm.apply_taxonomy_operations(values, 'tags', [('rename', 'tags', 'go', 'golang')]) == values
+    assert bm.apply_taxonomy_operations(values, 'tags', [('rename', 'categories', 'python', 'py')]) == values
+    assert bm.apply_taxonomy_operations(values, 'tags', [('rename', 'tags', 'Web', 'python')]) == ['python']
@@ -0,0 +1,44 @@
+import blog_manager as bm
+
+
+def build_index():
+    index = bm.SearchIndex()
+    index.add("_posts/2024-01-05-python-tips.md",
+              bm.FrontMatter(title="Python tips", tags=["Python"], categories="code"), "generators and decorators")
+    index.add("_posts/2024-03-01-garden.md",
+              bm.FrontMatter(title="Garden notes", tags=["life"], categories="home"), "tomatoes, python in the shed")
+    index.add("_posts/2023-12-31-review.md",
+              bm.FrontMatter(title="Year review", categories="home"), "a year of writing")
+    return index
+
+
+ALL = ["_posts/2024-03-01-garden.md", "_posts/2024-01-05-python-tips.md", "_posts/2023-12-31-review.md"]
+
+
+def test_title_matches_rank_first():
+    assert build_index().search("python", ALL) == ["_posts/2024-01-05-python-tips.md", "_posts/2024-03-01-garden.md"]
+
+
+def test_terms_match_by_prefix_and_all_must_match():
+    index = build_index()
+    assert index.search("gen", ALL) == ["_posts/2024-01-05-python-tips.md"]
+    assert index.search("python tomato", ALL) == ["_posts/2024-03-01-garden.md"]
+    assert index.search("python nothing", ALL) == []
+
+
+def test_operators_filter_in_candidate_order():
+    index = build_index()
+    assert index.search("tag:python", ALL) == ["_posts/2024-01-05-python-tips.md"]
+    assert index.search("category:home", ALL) == ["_posts/2024-03-01-garden.md", "_posts/2023-12-31-review.md"]
+    assert index.search("after:2024-01-01", ALL) == ["_posts/2024-03-01-garden.md", "_posts/2024-01-05-python-tips.md"]
+    assert index.search("date:2024-01..2024-02", ALL) == ["_posts/2024-01-05-python-tips.md"]
+
+
+def test_reindexing_and_removal_drop_old_terms():
+    index = build_index()
+    index.add("_posts/2024-03-01-garden.md", bm.FrontMatter(title="Garden notes"), "roses")
+    assert index.search("tomatoes", ALL) == []
+    
+    index.remove("_posts/2024-03-01-garden.md")
+    assert index.search("garden", ALL) == []
+    assert "roses" not in index.postings and "roses" not in index.vocabulary
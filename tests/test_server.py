@@ -0,0 +1,65 @@
+import socket
+import sys
+import time
+
+import pytest
+
+import blog_manager as bm
+
+
+# Listens on the port given as argv[1], printing a Jekyll build line only when asked
+FAKE_JEKYLL = """
+import socket, sys, time
+server = socket.socket()
+server.bind(('127.0.0.1', int(sys.argv[1])))
+server.listen()
+if len(sys.argv) > 2:
+    print("                    done in 0.1 seconds.", flush=True)
+time.sleep(30)
+"""
+
+
+class FakeServer(bm.JekyllServer):
+    PROBE_INTERVAL = 0.05
+    
+    def __init__(self, root_dir, port, builds):
+        super().__init__(root_dir, port=port)
+        self.builds = builds
+    
+    def command(self):
+        return [sys.executable, "-c", FAKE_JEKYLL, str(self.port)] + (["build"] if self.builds else [])
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def test_start_refuses_a_port_already_in_use(tmp_path):
+    with socket.socket() as other:
+        other.bind(('127.0.0.1', 0))
+        other.listen()
+        server = FakeServer(tmp_path, other.getsockname()[1], builds=True)
+        
+        with pytest.raises(RuntimeError, match="already in use"):
+            server.start()
+        assert server.process is None
+
+
+@pytest.mark.parametrize("builds", [True, False])
+def test_port_probe_waits_for_a_build(tmp_path, builds):
+    port = free_port()
+    server = FakeServer(tmp_path, port, builds).start()
+    try:
+        assert wait_for(server.port_in_use)
+        assert wait_for(lambda: server.ready, timeout=1) == builds
+    finally:
+        server.stop()
@@ -0,0 +1,71 @@
+import os
+
+import blog_manager as bm
+
+
+def open_tab(buffers, name, lines, unsaved=False, preview="<p>x</p>"):
+    """Add a tab, show it, then send it to the background with its text cached"""
+    tab = bm.EditorTab(name, 'post', {}, unsaved=unsaved)
+    buffers.add(tab)
+    buffers.activate(tab)
+    buffers.deactivate(lines, preview)
+    return tab
+
+
+def test_least_recently_used_tab_is_evicted_first():
+    buffers = bm.TabBuffers(budget=1000)
+    old = open_tab(buffers, "old.md", ["a" * 300])
+    recent = open_tab(buffers, "recent.md", ["b" * 300])
+    buffers.activate(old)
+    buffers.deactivate(["a" * 300], None)
+    
+    open_tab(buffers, "new.md", ["c" * 300])
+    
+    assert recent.lines is None and recent.preview is None
+    assert old.lines == ["a" * 300]
+    assert buffers.evictions == 1
+
+
+def test_activate_hands_back_the_preview_and_releases_the_text():
+    buffers = bm.TabBuffers(budget=10 ** 6)
+    tab = open_tab(buffers, "post.md", ["one", "two"], preview="<p>one</p>")
+    
+    assert buffers.cached_text(tab) == "one\ntwo"
+    assert buffers.activate(tab) == "<p>one</p>"
+    assert tab.lines is None and tab.size == 0
+
+
+def test_unsaved_text_survives_eviction_in_a_swap_file():
+    buffers = bm.TabBuffers(budget=0)
+    tab = open_tab(buffers, "draft.md", ["unsaved", "text"], unsaved=True)
+    
+    swap_path = tab.swap_path
+    assert tab.lines is None and os.path.exists(swap_path)
+    assert buffers.cached_text(tab) == "unsaved\ntext"
+    
+    buffers.activate(tab)
+    assert not os.path.exists(swap_path)
+
+
+def test_invalidate_only_drops_clean_background_tabs():
+    buffers = bm.TabBuffers(budget=10 ** 6)
+    clean = open_tab(buffers, "_posts/a.md", ["a"])
+    dirty = open_tab(buffers, "_posts/b.md", ["b"], unsaved=True)
+    
+    buffers.invalidate(["_posts/a.md", "_posts/b.md"])
+    
+    assert clean.lines is None
+    assert dirty.lines == ["b"]
+
+
+def test_replace_text_patches_background_tabs_even_when_swapped_out():
+    buffers = bm.TabBuffers(budget=0)
+    tab = open_tab(buffers, "draft.md", ["intro <!-- img -->", "after"], unsaved=True, preview=None)
+    assert tab.swap_path
+    
+    assert buffers.replace_text(tab, "<!-- img -->\n", "<picture>\n")
+    assert buffers.cached_text(tab) == "intro <picture>\nafter"
+    assert not buffers.replace_text(tab, "<!-- img -->\n", "<picture>\n")
+    
+    buffers.close(tab)
+    assert not buffers.replace_text(tab, "<picture>", "")
@@ -0,0 +1,53 @@
+import blog_manager as bm
+
+
+def build_index():
+    index = bm.TaxonomyIndex()
+    index.update("a.md", ["python", "web"])
+    index.update("b.md", ["Python ", "pygame"])
+    index.update("c.md", ["python", "PYTHON"])
+    return index
+
+
+def test_spellings_share_one_key_shown_by_most_used():
+    index = build_index()
+    assert index.counts[bm.taxonomy_key(" PYTHON")] == 3
+    assert index.canonical("Python") == "python"
+    assert index.canonical("  New   tag ") == "New tag"
+
+
+def test_suggest_ranks_prefix_matches_by_use():
+    index = build_index()
+    assert index.suggest("py") == [("python", 3), ("pygame", 1)]
+    assert index.suggest("PY", limit=1) == [("python", 3)]
+    assert index.suggest("py", exclude=["Python"]) == [("pygame", 1)]
+    assert index.suggest("x") == []
+
+
+def test_update_replaces_a_posts_names():
+    index = build_index()
+    index.update("b.md", ["web"])
+    assert index.suggest("py") == [("python", 2)]
+    assert index.suggest("we") == [("web", 2)]
+    
+    index.update("a.md", ())
+    index.update("b.md", ())
+    assert index.suggest("we") == []
+    assert index.keys == ["python"]
+
+
+def test_unique_taxonomy_names_keeps_first_spelling():
+    assert bm.unique_taxonomy_names(["Python", "python", " PYTHON ", "", "web"]) == ["Python", "web"]
+
+
+def test_editor_suggests_nothing_until_posts_are_counted(tmp_path):
+    (tmp_path / "_posts").mkdir()
+    (tmp_path / "_posts" / "2024-01-01-a.md").write_text("---\ntags: [python]\n---\n", encoding='utf-8')
+    gui = bm.BlogManager.__new__(bm.BlogManager)
+    gui.core = bm.BlogCore(tmp_path)
+    
+    assert gui.suggest_tags("py") == []
+    assert gui.core.taxonomies is None
+    
+    gui.core.build_taxonomies(gui.core.list_posts())
+    assert gui.suggest_tags("py") == [("python", 1)]